@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Audio Cache
+Pre-rendered speech clips for frequent words and phrases, played directly
+instead of starting live pyttsx3 synthesis.
+
+Usage: python audio_cache.py --prerender   (render COMMON_PHRASES now)
+       python audio_cache.py --stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+CACHE_DIR = "tts_cache"
+INDEX_FILE = "index.json"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Words and phrases worth rendering ahead of time
+COMMON_PHRASES = [
+    "hello", "hi", "yes", "no", "please", "thank you", "thanks", "sorry",
+    "help", "stop", "wait", "okay", "good", "bad", "morning", "night",
+    "i", "you", "we", "they", "he", "she", "it", "me", "my", "your",
+    "what", "where", "when", "who", "why", "how", "is", "are", "am",
+    "the", "a", "and", "to", "of", "in", "for", "on", "with", "can",
+    "do", "go", "come", "want", "need", "like", "love", "eat", "drink",
+    "water", "food", "home", "work", "name", "friend", "family", "doctor",
+    "bathroom", "again", "more", "now", "today", "tomorrow",
+]
+
+
+def normalize(text):
+    """Cache key text: lower case, single spaces"""
+    return " ".join(text.lower().split())
+
+
+class WavPlayback:
+    """Handle for a clip being played; poll is_playing(), stop() interrupts"""
+
+    def __init__(self, process=None, play_obj=None, ends_at=None):
+        self.process = process
+        self.play_obj = play_obj
+        # winsound cannot be polled, so async clips end by their duration
+        self.ends_at = ends_at
+
+    def is_playing(self):
+        if self.process is not None:
+            return self.process.poll() is None
+        if self.play_obj is not None:
+            return self.play_obj.is_playing()
+        if self.ends_at is not None:
+            return time.monotonic() < self.ends_at
+        return False
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        if self.play_obj is not None:
+            self.play_obj.stop()
+        if self.ends_at is not None:
+            import winsound
+            winsound.PlaySound(None, winsound.SND_PURGE)
+            self.ends_at = None
+
+
+def clip_seconds(path):
+    """Duration of a WAV clip (0.0 if unreadable)"""
+    try:
+        with wave.open(path, "rb") as clip:
+            return clip.getnframes() / float(clip.getframerate())
+    except (OSError, EOFError, wave.Error, ZeroDivisionError):
+        return 0.0
+
+
+def play_wav(path):
+    """Start playing a clip; returns a WavPlayback or None if no player works"""
+    if sys.platform == "win32":
+        import winsound
+        duration = clip_seconds(path)
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        return WavPlayback(ends_at=time.monotonic() + duration)
+    try:
+        import simpleaudio
+        return WavPlayback(play_obj=simpleaudio.WaveObject.from_wave_file(path).play())
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Audio playback error: {e}")
+        return None
+    for player in ("afplay", "aplay", "paplay"):
+        exe = shutil.which(player)
+        if exe:
+            args = [exe, "-q", path] if player == "aplay" else [exe, path]
+            return WavPlayback(process=subprocess.Popen(
+                args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    return None
+
+
+class AudioCache:
+    """Indexed on-disk clip cache with least-recently-used eviction by size"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, rate=120, voice_index=0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.voice_tag = f"rate{rate}-voice{voice_index}"
+        self._lock = threading.Lock()
+        self.entries = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.latency = {"cache": [0, 0.0], "live": [0, 0.0]}  # count, total seconds
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    # -- index ------------------------------------------------------------
+
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path()) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        # Drop entries whose clip has gone missing
+        self.entries = {
+            key: entry for key, entry in entries.items()
+            if os.path.exists(os.path.join(self.directory, entry["file"]))
+        }
+
+    def save_index(self):
+        """Write the index atomically"""
+        with self._lock:
+            data = json.dumps(self.entries, indent=1)
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self._index_path())
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.voice_tag}|{normalize(text)}".encode("utf-8")).hexdigest()
+
+    @property
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    # -- lookup and storage -----------------------------------------------
+
+    def lookup(self, text):
+        """Path of the cached clip for text, or None (counts hit/miss)"""
+        key = self.key(text)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            return os.path.join(self.directory, entry["file"])
+
+    def contains(self, text):
+        return self.key(text) in self.entries
+
+    def render(self, engine, text):
+        """Synthesize text to a clip with the given engine and add it
+
+        Returns the clip path, or None if synthesis failed or the clip was
+        too large to keep.
+        """
+        key = self.key(text)
+        filename = key + ".wav"
+        path = os.path.join(self.directory, filename)
+        engine.save_to_file(normalize(text), path)
+        engine.runAndWait()
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size == 0:
+            return None
+        if size > self.max_bytes:
+            os.remove(path)
+            return None
+        with self._lock:
+            self.entries[key] = {
+                "text": normalize(text),
+                "file": filename,
+                "bytes": size,
+                "last_used": time.time(),
+            }
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep=None):
+        """Remove least recently used clips, except keep, until under max_bytes"""
+        total = self.total_bytes
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+            total -= entry["bytes"]
+            del self.entries[key]
+
+    def missing(self, phrases=COMMON_PHRASES):
+        """Phrases that still need rendering"""
+        return [p for p in phrases if not self.contains(p)]
+
+    # -- statistics -------------------------------------------------------
+
+    def record_latency(self, source, seconds):
+        """Record submit-to-audio-start latency for 'cache' or 'live'"""
+        stats = self.latency[source]
+        stats[0] += 1
+        stats[1] += seconds
+
+    def mean_latency(self, source):
+        count, total = self.latency[source]
+        return total / count if count else None
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        """One-line summary of hit rate and latency saved"""
+        line = (f"Audio cache: {len(self.entries)} clips, {self.total_bytes / 1024:.0f} KiB, "
+                f"hit rate {self.hit_rate:.0%} ({self.hits}/{self.hits + self.misses})")
+        cached, live = self.mean_latency("cache"), self.mean_latency("live")
+        if cached is not None and live is not None:
+            saved = live - cached
+            line += (f", start latency {cached * 1000:.0f} ms cached vs {live * 1000:.0f} ms live, "
+                     f"~{saved * self.latency['cache'][0]:.1f} s saved")
+        return line
+
+
+def prerender(cache, phrases=COMMON_PHRASES, engine=None):
+    """Render all missing phrases (install time); returns the count rendered"""
+    if engine is None:
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty("rate", 120)
+        voices = engine.getProperty("voices")
+        if voices:
+            engine.setProperty("voice", voices[0].id)
+    rendered = 0
+    for phrase in cache.missing(phrases):
+        if cache.render(engine, phrase):
+            rendered += 1
+    cache.save_index()
+    return rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the synthesized speech cache")
+    parser.add_argument("--prerender", action="store_true", help="render the common phrases now")
+    parser.add_argument("--stats", action="store_true", help="show cache contents")
+    parser.add_argument("--dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    cache = AudioCache(args.dir)
+    if args.prerender:
+        start = time.perf_counter()
+        count = prerender(cache)
+        print(f"Rendered {count} clips in {time.perf_counter() - start:.1f}s")
+    print(cache.report())
+
+
+if __name__ == "__main__":
+    main()
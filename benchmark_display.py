@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Display benchmark
+Display-only frames per second for the camera (640x480) and skeleton
+(300x300) panels: the old new-PhotoImage-per-frame path vs ImagePanel.
+Needs a display (use xvfb-run on headless machines).
+
+Usage: python benchmark_display.py [--frames 300]
+"""
+
+import argparse
+import time
+import tkinter as tk
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from display import ImagePanel, LabelText
+
+
+def old_show(label, frame, size):
+    """Previous update_camera_display/update_skeleton_display body"""
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame_resized = cv2.resize(frame_rgb, size)
+    photo = ImageTk.PhotoImage(image=Image.fromarray(frame_resized))
+    label.config(image=photo, text="")
+    label.image = photo
+
+
+def run(root, frames, show_camera, show_skeleton, set_text):
+    """Time n iterations of camera + skeleton + status label updates"""
+    start = time.perf_counter()
+    for i in range(len(frames)):
+        show_camera(frames[i])
+        show_skeleton(frames[i][:400, :400])
+        set_text("No Hand Detected")
+        root.update_idletasks()
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 3), np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    root = tk.Tk()
+    camera_label = tk.Label(root)
+    skeleton_label = tk.Label(root)
+    char_label = tk.Label(root, text="")
+    for widget in (camera_label, skeleton_label, char_label):
+        widget.pack()
+
+    old_fps = run(
+        root, frames,
+        lambda f: old_show(camera_label, f, (640, 480)),
+        lambda f: old_show(skeleton_label, f, (300, 300)),
+        lambda t: char_label.config(text=t),
+    )
+
+    camera_panel = ImagePanel(camera_label, (640, 480))
+    skeleton_panel = ImagePanel(skeleton_label, (300, 300))
+    char_text = LabelText(char_label)
+    new_fps = run(root, frames, camera_panel.show, skeleton_panel.show, char_text.set)
+    root.destroy()
+
+    print(f"Display benchmark: {args.frames} frames of {args.width}x{args.height}")
+    print(f"  new PhotoImage per frame: {old_fps:7.1f} fps")
+    print(f"  persistent ImagePanel:    {new_fps:7.1f} fps  ({new_fps / old_fps:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark
+Replays a recorded session (video file or .npz/.lmk landmark recording)
+through the full processing pipeline headlessly and compares
+configurations side by side: frames/sec, sign-to-text latency
+percentiles, CPU time and peak RSS. Each configuration runs in its own
+process so peak RSS is not shared between them.
+
+Usage:
+  python benchmark_e2e.py SESSION [--config "backend=standin" "backend=standin,gate=6" ...]
+                                  [--mode max|realtime|both] [--out e2e_bench.json]
+  python benchmark_e2e.py --make-synthetic session.npz
+
+Config keys: backend (standin|keras|tflite|cached|landmark), model (path), res (WxH),
+gate (pixels, 0 = off), cascade (classifier path), margin (cascade threshold),
+render (cv2 or jit, see geometry_kernels.py)
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from cascade import DEFAULT_MARGIN
+from model_backends import load_backend, warm_up
+
+DEFAULT_CONFIGS = ["backend=standin", "backend=standin,gate=6", "backend=standin,res=320x240"]
+
+
+def parse_config(text):
+    """'backend=keras,res=320x240' -> dict with defaults filled in"""
+    config = {"backend": "standin", "model": "cnn8grps_rad1_model.h5", "res": None, "gate": 0.0,
+              "cascade": None, "margin": DEFAULT_MARGIN, "render": "cv2"}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in config:
+            raise ValueError(f"Unknown config key '{key}'")
+        config[key] = value.strip()
+    if config["res"]:
+        width, height = config["res"].lower().split("x")
+        config["res"] = (int(width), int(height))
+    config["gate"] = float(config["gate"])
+    config["margin"] = float(config["margin"])
+    if config["render"] not in ("cv2", "jit"):
+        raise ValueError(f"Unknown renderer '{config['render']}'")
+    config["name"] = text or "default"
+    return config
+
+
+def make_model(backend, model_path):
+    """Model object with a Keras-style predict() for the given backend"""
+    return load_backend(backend, model_path)
+
+
+def make_app(session, config):
+    """Headless converter set up for config; returns (app, RecordedDetector or None)"""
+    from headless import make_headless_converter
+    from replay import attach_recorded_detector, is_landmark_session
+
+    app = make_headless_converter(model=make_model(config["backend"], config["model"]))
+    # Warm up / compile everything now, as the app does at startup, so it
+    # does not land in the first replayed frame
+    warm_up(app.model)
+    app.gate_px = config["gate"]
+    app.jit_render = config["render"] == "jit"
+    if app.jit_render:
+        app.load_skeleton_rasterizer()
+    if config["cascade"]:
+        app.cascade_path, app.cascade_margin = config["cascade"], config["margin"]
+        app.load_cascade()
+    recorded = None
+    if is_landmark_session(session):
+        recorded = attach_recorded_detector(app)
+    else:
+        from cvzone.HandTrackingModule import HandDetector
+        app.hd = HandDetector(maxHands=1)
+        app.hd2 = HandDetector(maxHands=1)
+    return app, recorded
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, None if unknown"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def run_config(session, config, realtime):
+    """Run one configuration in this process; returns the summary dict"""
+    from replay import open_session, replay
+
+    app, recorded = make_app(session, config)
+    result = replay(app, open_session(session, config["res"]), realtime=realtime, recorded=recorded)
+    latencies = result.pop("latency_ms")
+    frame_ms = result.pop("frame_ms")
+    result.update({
+        "config": config["name"],
+        "mode": "realtime" if realtime else "max",
+        "frame_p50_ms": percentile(frame_ms, 50),
+        "frame_p95_ms": percentile(frame_ms, 95),
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "latency_p99_ms": percentile(latencies, 99),
+        "chars": len(latencies),
+        "cpu_util": result["cpu_s"] / result["wall_s"] if result["wall_s"] else None,
+        "peak_rss_mb": peak_rss_mb(),
+    })
+    return result
+
+
+def run_isolated(session, config_text, realtime):
+    """Run a configuration in a child process"""
+    args = [sys.executable, __file__, session, "--worker", config_text,
+            "--mode", "realtime" if realtime else "max"]
+    completed = subprocess.run(args, capture_output=True, text=True)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"config '{config_text}' failed:\n{completed.stderr}")
+    return json.loads(lines[-1])
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_report(results):
+    header = (f"{'config':34s} {'mode':8s} {'fps':>7s} {'drop':>5s} {'lat p50':>8s} {'lat p95':>8s} "
+              f"{'lat p99':>8s} {'cpu s':>7s} {'cpu%':>5s} {'rss MB':>7s}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['config'][:34]:34s} {r['mode']:8s} {r['fps']:7.1f} {r['dropped']:5d} "
+              f"{_fmt(r['latency_p50_ms'], '8.1f')} {_fmt(r['latency_p95_ms'], '8.1f')} "
+              f"{_fmt(r['latency_p99_ms'], '8.1f')} {r['cpu_s']:7.2f} "
+              f"{_fmt(r['cpu_util'] and r['cpu_util'] * 100, '5.0f')} {_fmt(r['peak_rss_mb'], '7.1f')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end replay benchmark")
+    parser.add_argument("session", nargs="?", help="video file or .npz/.lmk landmark recording")
+    parser.add_argument("--config", nargs="*", default=DEFAULT_CONFIGS)
+    parser.add_argument("--mode", choices=("max", "realtime", "both"), default="both")
+    parser.add_argument("--out", default="e2e_bench.json")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--make-synthetic", metavar="PATH", help="write a synthetic labelled session and exit")
+    args = parser.parse_args()
+
+    if args.make_synthetic:
+        from replay import synthetic_session
+        synthetic_session().save(args.make_synthetic)
+        print(f"Synthetic session written to {args.make_synthetic}")
+        return
+    if not args.session:
+        parser.error("a session file is required")
+
+    if args.worker is not None:
+        result = run_config(args.session, parse_config(args.worker), args.mode == "realtime")
+        print(json.dumps(result))
+        return
+
+    modes = [False, True] if args.mode == "both" else [args.mode == "realtime"]
+    results = []
+    for config_text in args.config:
+        parse_config(config_text)  # fail fast on typos
+        for realtime in modes:
+            results.append(run_isolated(args.session, config_text, realtime))
+
+    print_report(results)
+    with open(args.out, "w") as f:
+        json.dump({"session": args.session, "results": results}, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark regression gate
+Runs the stage microbenchmarks, normalizes them by a calibration loop
+(so build hosts of different speeds are comparable) and compares them
+with the committed baseline. Exits 1 with a diff table when any
+benchmark is slower than its tolerance allows, or when a baseline
+benchmark did not run (renamed, removed or missing a dependency) or ran
+a different implementation than the baseline (e.g. the NumPy fallback
+instead of Numba) unless --allow-missing is given. Such rows are never
+compared: their numbers measure different code.
+
+Usage:
+  python benchmark_gate.py                 # compare with benchmark_baseline.json
+  python benchmark_gate.py --update        # record a new baseline on this host
+  python benchmark_gate.py --tolerance 0.3 --only infer
+  python benchmark_gate.py --allow-missing # e.g. on a host without TensorFlow
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import benchmark_stages
+
+BASELINE_FILE = "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+METRIC = "median_us"
+
+
+def calibration_work():
+    """Fixed mix of interpreter-bound and numpy-bound work"""
+    total = 0
+    for i in range(200000):
+        total += (i * i) % 7
+    canvas = np.arange(400 * 400 * 3, dtype=np.float32)
+    for _ in range(10):
+        (canvas / 255.0).sum()
+    return total
+
+
+def calibrate(rounds=7):
+    """Best-of-n seconds for calibration_work on this machine"""
+    calibration_work()
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        calibration_work()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def normalized(report, calibration_s):
+    """Benchmark metric in calibration units (metric / calibration time)"""
+    return {name: r[METRIC] / calibration_s for name, r in report["results"].items()}
+
+
+def implementations(report):
+    """Benchmark name -> implementation, for benchmarks that report one"""
+    return {name: r["implementation"] for name, r in report["results"].items() if "implementation" in r}
+
+
+def compare(current, baseline, default_tolerance, tolerances, current_impl=None, baseline_impl=None):
+    """Rows of (name, baseline, current, ratio, tolerance, status)
+
+    current_impl / baseline_impl map benchmark names to the implementation
+    that ran; rows whose implementations differ are 'incomparable'.
+    """
+    current_impl, baseline_impl = current_impl or {}, baseline_impl or {}
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        tolerance = tolerances.get(name, default_tolerance)
+        if name not in baseline:
+            rows.append((name, None, current[name], None, tolerance, "new"))
+        elif name not in current:
+            rows.append((name, baseline[name], None, None, tolerance, "missing"))
+        elif current_impl.get(name) != baseline_impl.get(name):
+            status = f"incomparable ({current_impl.get(name)} vs {baseline_impl.get(name)})"
+            rows.append((name, baseline[name], current[name], None, tolerance, status))
+        else:
+            ratio = current[name] / baseline[name] if baseline[name] else float("inf")
+            if ratio > 1.0 + tolerance:
+                status = "REGRESSION"
+            elif ratio < 1.0 - tolerance:
+                status = "faster"
+            else:
+                status = "ok"
+            rows.append((name, baseline[name], current[name], ratio, tolerance, status))
+    return rows
+
+
+def print_table(rows):
+    print(f"{'benchmark':28s} {'baseline':>10s} {'current':>10s} {'ratio':>7s} {'limit':>7s}  status")
+    for name, base, cur, ratio, tolerance, status in rows:
+        base_s = "-" if base is None else f"{base:10.1f}"
+        cur_s = "-" if cur is None else f"{cur:10.1f}"
+        ratio_s = "-" if ratio is None else f"{ratio:7.2f}"
+        print(f"{name:28s} {base_s:>10s} {cur_s:>10s} {ratio_s:>7s} {1 + tolerance:7.2f}  {status}")
+    print(f"(values are {METRIC} divided by calibration seconds)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail on benchmark regressions")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="write the current results as the baseline")
+    parser.add_argument("--tolerance", type=float, help="override the default tolerance (0.25 = 25%% slower)")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--only", nargs="*")
+    parser.add_argument("--report", help="also write the current results as JSON here")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="do not fail when baseline benchmarks did not run or ran "
+                             "a different implementation")
+    args = parser.parse_args()
+
+    calibration_s = calibrate()
+    report = benchmark_stages.run(args.only, args.min_time)
+    current = normalized(report, calibration_s)
+    print(f"Calibration: {calibration_s * 1000:.1f} ms")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"calibration_s": calibration_s, "normalized": current, "raw": report}, f, indent=2)
+
+    if args.update:
+        tolerances = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                tolerances = json.load(f).get("tolerances", {})
+        baseline = {
+            "metric": METRIC,
+            "calibration_s": calibration_s,
+            "default_tolerance": args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE,
+            "tolerances": tolerances,
+            "environment": report["environment"],
+            "normalized": current,
+            "implementations": implementations(report),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --update")
+        return 2
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    default_tolerance = args.tolerance if args.tolerance is not None else baseline.get(
+        "default_tolerance", DEFAULT_TOLERANCE)
+    expected = baseline["normalized"]
+    if args.only:
+        expected = {k: v for k, v in expected.items() if any(p in k for p in args.only)}
+    rows = compare(current, expected, default_tolerance, baseline.get("tolerances", {}),
+                   implementations(report), baseline.get("implementations", {}))
+    print_table(rows)
+
+    failed = False
+    regressions = [row[0] for row in rows if row[5] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        failed = True
+    missing = [row[0] for row in rows if row[5] == "missing"]
+    if missing and not args.allow_missing:
+        print(f"\n{len(missing)} baseline benchmark(s) did not run: {', '.join(missing)}"
+              f"\n(pass --allow-missing if expected, or --update after renaming)")
+        failed = True
+    incomparable = [row[0] for row in rows if row[5].startswith("incomparable")]
+    if incomparable and not args.allow_missing:
+        print(f"\n{len(incomparable)} benchmark(s) ran a different implementation than the baseline: "
+              f"{', '.join(incomparable)}\n(install the baseline's dependencies, pass --allow-missing, "
+              f"or --update)")
+        failed = True
+    if failed:
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark
+Replays a session repeatedly with per-stage allocation profiling
+(tracemalloc) and checks that RSS reaches a steady state. Exits 1 if
+RSS keeps growing faster than --max-growth MiB per 1000 frames over
+the second half of the run.
+
+Usage:
+  python benchmark_memory.py SESSION [--loops 20] [--display] [--no-tracemalloc]
+  python benchmark_memory.py --synthetic
+
+--display also pushes every frame and skeleton through the Tk
+ImagePanels (needs a display) to catch PhotoImage leaks.
+--no-tracemalloc measures RSS only, without the tracing overhead.
+"""
+
+import argparse
+import json
+import sys
+
+from instrumentation import metrics
+from memory_profile import MemoryProfiler, current_rss_mb, rss_slope
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage allocations and RSS steady-state check")
+    parser.add_argument("session", nargs="?", help="video file or .npz/.lmk landmark recording")
+    parser.add_argument("--synthetic", action="store_true", help="use a generated landmark session")
+    parser.add_argument("--loops", type=int, default=20)
+    parser.add_argument("--max-growth", type=float, default=1.0,
+                        help="allowed RSS growth in MiB per 1000 frames after warm-up")
+    parser.add_argument("--display", action="store_true", help="also exercise the Tk image panels")
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--out", default="memory_bench.json")
+    args = parser.parse_args()
+    if not args.session and not args.synthetic:
+        parser.error("a session file or --synthetic is required")
+
+    from headless import make_headless_converter
+    from replay import attach_recorded_detector, is_landmark_session, open_session, replay, synthetic_session
+
+    app = make_headless_converter()
+    recorded = None
+    if args.synthetic or is_landmark_session(args.session):
+        recorded = attach_recorded_detector(app)
+    else:
+        from cvzone.HandTrackingModule import HandDetector
+        app.hd = HandDetector(maxHands=1)
+        app.hd2 = HandDetector(maxHands=1)
+    session = synthetic_session() if args.synthetic else None
+
+    on_frame = None
+    if args.display:
+        import tkinter as tk
+        from display import ImagePanel
+        root = tk.Tk()
+        camera_label, skeleton_label = tk.Label(root), tk.Label(root)
+        camera_label.pack()
+        skeleton_label.pack()
+        app.camera_panel = ImagePanel(camera_label, (640, 480))
+        app.skeleton_panel = ImagePanel(skeleton_label, (300, 300))
+
+        def on_frame(frame, elapsed):
+            app.update_camera_display(frame.image)
+            if app.latest_skeleton is not None:
+                app.update_skeleton_display(app.latest_skeleton)
+            root.update_idletasks()
+
+    if not args.no_tracemalloc:
+        metrics.enable_memory_profiling(MemoryProfiler())
+    else:
+        metrics.enable(True)
+
+    samples = []
+    frames = 0
+    for loop in range(args.loops):
+        frames_in = session.frames() if session is not None else open_session(args.session)
+        result = replay(app, frames_in, recorded=recorded, on_frame=on_frame)
+        frames += result["processed"]
+        # Clear the transcript so its growth is not mistaken for a leak
+        app.transcript.clear()
+        rss = current_rss_mb()
+        if rss is not None:
+            samples.append((frames, rss))
+        print(f"loop {loop + 1:3d}: {frames:7d} frames, RSS {rss if rss is not None else float('nan'):8.1f} MiB")
+
+    steady = samples[len(samples) // 2:]
+    growth = rss_slope(steady) * 1000 if steady else 0.0
+    print(f"\nRSS growth after warm-up: {growth:+.3f} MiB per 1000 frames (limit {args.max_growth})")
+
+    report = {"frames": frames, "rss_samples": samples, "growth_mb_per_1000_frames": growth}
+    if metrics.memory is not None:
+        print("\nPer-stage allocations (tracemalloc):")
+        print(metrics.memory.report())
+        print("\nLargest live allocation sites:")
+        for site, kib in metrics.memory.top_sites():
+            print(f"  {kib:10.1f} KiB  {site}")
+        report["stages"] = metrics.memory.snapshot()
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if growth > args.max_growth:
+        print("FAIL: RSS did not reach a steady state")
+        return 1
+    print("OK: RSS steady")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Stage microbenchmarks
+Times each pipeline stage in isolation on synthetic landmark sets and a
+stand-in model, so it runs without a camera or cnn8grps_rad1_model.h5.
+Results are printed as a table and written as JSON. Inference rows
+cover every backend the registry can swap in (landmark MLP, Keras, float
+and int8 TFLite, on a tiny CNN); rows whose dependency is missing are
+skipped.
+
+Usage: python benchmark_stages.py [--out stage_bench.json] [--min-time 0.5]
+                                  [--only NAME ...] [--dictionary enchant]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+import geometry_kernels
+from headless import StandInModel, SyntheticDetector, WordListDictionary, make_headless_converter
+from landmarks import as_array, finger_curl, joint_angles, new_hand, normalize, pairwise_distances
+from skeleton import draw_skeleton
+
+
+def measure(fn, min_time=0.5, min_rounds=20, max_rounds=100000):
+    """Call fn repeatedly; per-call timings in microseconds"""
+    fn()  # warm caches and lazy initialisation
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_rounds and (len(samples) < min_rounds or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    n = len(samples)
+    mean = sum(samples) / n
+    return {
+        "rounds": n,
+        "mean_us": round(mean, 3),
+        "median_us": round(samples[n // 2], 3),
+        "p95_us": round(samples[min(n - 1, int(n * 0.95))], 3),
+        "min_us": round(samples[0], 3),
+        "ops_per_s": round(1e6 / mean, 1) if mean else None,
+    }
+
+
+def tiny_keras_model(classes=8):
+    """Small Keras CNN with the production input shape, or None without TF"""
+    try:
+        from keras import layers, models
+    except ImportError:
+        return None
+    model = models.Sequential([
+        layers.Input((400, 400, 3)),
+        layers.Conv2D(4, 5, strides=4, activation="relu"),
+        layers.MaxPooling2D(4),
+        layers.Flatten(),
+        layers.Dense(classes, activation="softmax"),
+    ])
+    return model
+
+
+def tiny_converted_models(keras_model, image, directory):
+    """{'tflite': ..., 'int8': ...} conversions of the tiny CNN (as the
+    model cache and quantize.py produce them); empty without a converter"""
+    from model_backends import TFLiteModel
+    try:
+        from quantize import quantize
+        import tensorflow as tf
+    except ImportError:
+        return {}
+    models = {}
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    conversions = {"tflite": converter.convert, "int8": lambda: quantize(keras_model, [image])}
+    for name, convert in conversions.items():
+        path = os.path.join(directory, f"tiny-{name}.tflite")
+        try:
+            with open(path, "wb") as f:
+                f.write(convert())
+            models[name] = TFLiteModel(path)
+        except Exception as e:
+            print(f"Skipping infer[{name}-tiny]: {e}", file=sys.stderr)
+    return models
+
+
+def random_landmark_model(directory, classes=8, hidden=(32,), seed=0):
+    """Landmark-MLP student with random weights, loaded like a registry version"""
+    from landmark_classifier import FEATURE_SIZE, LandmarkClassifier
+    from model_backends import LandmarkModel
+    rng = np.random.default_rng(seed)
+    sizes = [FEATURE_SIZE, *hidden, classes]
+    weights = [rng.standard_normal((a, b)) * np.sqrt(2.0 / a) for a, b in zip(sizes[:-1], sizes[1:])]
+    biases = [np.zeros(b) for b in sizes[1:]]
+    path = os.path.join(directory, "landmark.npz")
+    LandmarkClassifier(weights, biases, np.zeros(FEATURE_SIZE), np.ones(FEATURE_SIZE),
+                       [str(i) for i in range(classes)]).save(path)
+    return LandmarkModel(path)
+
+
+def build_benchmarks(dictionary="stub"):
+    """name -> zero-argument callable"""
+    detector = SyntheticDetector()
+    app = make_headless_converter(
+        model=StandInModel(),
+        detector=detector,
+        dictionary=WordListDictionary() if dictionary == "stub" else None,
+    )
+    hand_region = np.full((258, 238, 3), 128, np.uint8)
+    white = np.full((400, 400, 3), 255, np.uint8)
+    pts = detector.hands[0]
+    skeleton = app.create_skeleton(hand_region, detector.width, detector.height)
+    batch = np.ascontiguousarray(cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB).reshape(1, 400, 400, 3)
+                                 .astype("float32") / 255.0)
+
+    def distance_all_pairs():
+        for a in pts:
+            for b in pts:
+                app.distance(a, b)
+
+    hand = as_array(pts, new_hand())
+
+    def landmarks_as_array():
+        as_array(pts, hand)
+
+    def pairwise_distances_batched():
+        pairwise_distances(hand)
+
+    def hand_geometry():
+        normalize(hand)
+        joint_angles(hand)
+        finger_curl(hand)
+
+    # Compiled kernels; the implementation (Numba or the NumPy fallback) is
+    # reported beside the result so the name stays stable for the gate
+    kernels = "numba" if geometry_kernels.HAVE_NUMBA else "numpy-fallback"
+
+    def pairwise_distances_kernel():
+        geometry_kernels.pairwise_distances(hand)
+
+    def hand_geometry_kernel():
+        geometry_kernels.normalize(hand)
+        geometry_kernels.joint_angles(hand)
+        geometry_kernels.finger_curl(hand)
+
+    def draw_skeleton_lines():
+        canvas = white.copy()
+        app.draw_skeleton_lines(canvas, pts, 95, 85)
+
+    def draw_skeleton_cv2():
+        canvas = white.copy()
+        draw_skeleton(canvas, hand, 95, 85)
+
+    canvas_xy = hand[:, :2] + (95, 85)
+
+    def rasterize_skeleton_kernel():
+        canvas = white.copy()
+        geometry_kernels.rasterize_skeleton(canvas, canvas_xy)
+
+    def create_skeleton():
+        app.create_skeleton(hand_region, detector.width, detector.height)
+
+    def preprocess():
+        skeleton_rgb = cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB)
+        skeleton_rgb.reshape(1, 400, 400, 3).astype('float32') / 255.0
+
+    letters = "HELLOWORLD"
+    state = {"i": 0}
+
+    def update_character_tracking():
+        i = state["i"] = state["i"] + 1
+        app.update_character_tracking('Space' if i % 6 == 0 else letters[i % len(letters)])
+
+    suggest_app = make_headless_converter(
+        model=StandInModel(), detector=detector,
+        dictionary=WordListDictionary() if dictionary == "stub" else None,
+    )
+    for char in "THX":
+        suggest_app.transcript.append_char(char)
+
+    def update_word_suggestions():
+        suggest_app.update_word_suggestions()
+
+    benchmarks = {
+        "distance[21x21]": distance_all_pairs,
+        "landmarks_as_array": landmarks_as_array,
+        "pairwise_distances[batched]": pairwise_distances_batched,
+        "hand_geometry[normalize+angles+curl]": hand_geometry,
+        "pairwise_distances[kernel]": pairwise_distances_kernel,
+        "hand_geometry[kernel]": hand_geometry_kernel,
+        "draw_skeleton_lines": draw_skeleton_lines,
+        "draw_skeleton[cv2]": draw_skeleton_cv2,
+        "rasterize_skeleton[kernel]": rasterize_skeleton_kernel,
+        "create_skeleton": create_skeleton,
+        "predict_preprocess": preprocess,
+        "update_character_tracking": update_character_tracking,
+        "update_word_suggestions": update_word_suggestions,
+    }
+
+    standin = StandInModel()
+    benchmarks["infer[standin]"] = lambda: standin.predict(batch)
+    # Converted models are written here; TFLite maps the files while in use
+    directory = tempfile.mkdtemp(prefix="stage_bench-")
+    landmark_model = random_landmark_model(directory)
+    landmark_batch = hand[np.newaxis]
+    benchmarks["infer[landmark]"] = lambda: landmark_model.predict(landmark_batch)
+    keras_model = tiny_keras_model()
+    if keras_model is not None:
+        benchmarks["infer[keras-tiny]"] = lambda: keras_model.predict(batch, verbose=0)
+        benchmarks["infer[keras-tiny-call]"] = lambda: keras_model(batch, training=False)
+        pixels = cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB)
+        converted = tiny_converted_models(keras_model, pixels, directory)
+        if "tflite" in converted:
+            benchmarks["infer[tflite-tiny]"] = lambda: converted["tflite"].predict(batch)
+        if "int8" in converted:
+            # uint8 pixels straight in, as gesture_scores feeds int8 models
+            pixel_batch = pixels[np.newaxis]
+            benchmarks["infer[int8-tiny]"] = lambda: converted["int8"].predict(pixel_batch)
+    for fn in (pairwise_distances_kernel, hand_geometry_kernel, rasterize_skeleton_kernel):
+        fn.implementation = kernels
+    return benchmarks
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+    }
+
+
+def run(only=None, min_time=0.5, dictionary="stub"):
+    """Run the suite; returns the JSON-ready result dict"""
+    results = {}
+    for name, fn in build_benchmarks(dictionary).items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = measure(fn, min_time=min_time)
+        if hasattr(fn, "implementation"):
+            results[name]["implementation"] = fn.implementation
+    return {"suite": "stages", "created": time.time(), "environment": environment(), "results": results}
+
+
+def print_table(report, stream=sys.stdout):
+    print(f"{'benchmark':28s} {'rounds':>8s} {'median us':>11s} {'p95 us':>11s} {'ops/s':>11s}", file=stream)
+    for name, r in report["results"].items():
+        implementation = f"  ({r['implementation']})" if "implementation" in r else ""
+        print(f"{name:28s} {r['rounds']:8d} {r['median_us']:11.1f} {r['p95_us']:11.1f} {r['ops_per_s']:11.1f}"
+              f"{implementation}", file=stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage microbenchmarks")
+    parser.add_argument("--out", default="stage_bench.json", help="JSON results path ('-' for stdout)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    parser.add_argument("--only", nargs="*", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--dictionary", choices=("stub", "enchant"), default="stub",
+                        help="word list stand-in (default) or the real enchant dictionary")
+    args = parser.parse_args()
+
+    report = run(args.only, args.min_time, args.dictionary)
+    print_table(report, sys.stderr if args.out == "-" else sys.stdout)
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
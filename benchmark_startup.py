@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+Measures cold start in fresh processes:
+  - import time of sign_language_converter and of the heavy libraries
+    it now loads lazily (keras, cvzone, enchant)
+  - time until the window is shown and until everything is loaded,
+    using the app's --startup-benchmark mode (needs a display)
+
+Usage: python benchmark_startup.py [--runs 3] [--imports-only] [--out startup_bench.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+LAZY_MODULES = ["sign_language_converter", "keras", "cvzone.HandTrackingModule", "enchant", "pyttsx3"]
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] if ordered else None
+
+
+def time_import(module):
+    """Seconds to import module in a fresh interpreter, None if it fails"""
+    completed = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def time_app_startup():
+    """Run the app until it is ready; returns its STARTUP report plus process wall time"""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "sign_language_converter.py", "--startup-benchmark"],
+                               capture_output=True, text=True, timeout=300)
+    wall = time.perf_counter() - start
+    for line in completed.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            report = json.loads(line[len("STARTUP "):])
+            report["process_ms"] = round(wall * 1000, 1)
+            return report
+    raise RuntimeError(f"App did not report startup:\n{completed.stdout}\n{completed.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--imports-only", action="store_true", help="skip launching the GUI")
+    parser.add_argument("--out", default="startup_bench.json")
+    args = parser.parse_args()
+
+    results = {"imports_ms": {}, "app": []}
+    print("Import time (fresh interpreter, median of runs):")
+    for module in LAZY_MODULES:
+        samples = [t for t in (time_import(module) for _ in range(args.runs)) if t is not None]
+        value = median(samples)
+        results["imports_ms"][module] = round(value * 1000, 1) if value is not None else None
+        print(f"  {module:28s} {'unavailable' if value is None else f'{value * 1000:8.1f} ms'}")
+
+    if not args.imports_only:
+        print("\nApplication startup:")
+        for run in range(args.runs):
+            report = time_app_startup()
+            results["app"].append(report)
+            tasks = ", ".join(f"{k} {v:.0f}" for k, v in report["tasks_ms"].items() if v is not None)
+            print(f"  run {run + 1}: window {report['window_ms']:7.0f} ms, ready {report['ready_ms']:7.0f} ms, "
+                  f"process {report['process_ms']:7.0f} ms  ({tasks})")
+        if results["app"]:
+            print(f"  median: window {median([r['window_ms'] for r in results['app']]):.0f} ms, "
+                  f"ready {median([r['ready_ms'] for r in results['app']]):.0f} ms")
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Transcript benchmark
+Compares the old string-rebuild sentence handling with TranscriptBuffer
+on long synthetic transcripts (default 100k characters).
+
+Usage: python benchmark_transcript.py [--chars 100000] [--tk]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from transcript_buffer import TranscriptBuffer, TextWidgetSink
+
+
+def make_keystrokes(n_chars, seed=0):
+    """Random letters with a space roughly every 3-8 characters"""
+    rng = random.Random(seed)
+    keys = []
+    while len(keys) < n_chars:
+        keys.extend(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 8)))
+        keys.append('Space')
+    return keys[:n_chars]
+
+
+def run_naive(keys, widget=None):
+    """Old behaviour: += on a str, re-split, rewrite the whole widget"""
+    text = ""
+    written = 0
+    start = time.perf_counter()
+    for key in keys:
+        if key == 'Space':
+            if not text.endswith(' '):
+                text += ' '
+        else:
+            text += key
+        words = text.strip().split()
+        if words:
+            words[-1].lower()
+        if widget is not None:
+            widget.delete("1.0", "end")
+            widget.insert("end", text)
+        written += len(text)
+    return time.perf_counter() - start, written
+
+
+def run_buffer(keys, widget=None):
+    """TranscriptBuffer with incremental edits"""
+    buffer = TranscriptBuffer()
+    sink = TextWidgetSink(widget) if widget is not None else None
+    written = 0
+    start = time.perf_counter()
+    for key in keys:
+        if key == 'Space':
+            edit = buffer.append_space()
+        else:
+            edit = buffer.append_char(key)
+        buffer.last_word.lower()
+        if edit is not None:
+            if sink is not None:
+                sink.apply(edit)
+            written += len(edit[1])
+    return time.perf_counter() - start, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chars", type=int, default=100000)
+    parser.add_argument("--tk", action="store_true", help="apply edits to a real tk.Text widget")
+    args = parser.parse_args()
+
+    keys = make_keystrokes(args.chars)
+    widget = None
+    if args.tk:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        widget = tk.Text(root, wrap=tk.WORD)
+
+    print(f"Transcript benchmark: {len(keys)} keystrokes, widget={'tk.Text' if widget else 'none'}")
+    for name, runner in (("naive", run_naive), ("buffer", run_buffer)):
+        if widget is not None:
+            widget.delete("1.0", "end")
+        elapsed, written = runner(keys, widget)
+        print(f"  {name:7s} total {elapsed:8.3f}s  "
+              f"{elapsed / len(keys) * 1e6:9.2f} us/keystroke  "
+              f"{written:>14,d} chars written to widget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Cascaded Inference
+Runs the cheap landmark classifier on every frame and only renders the
+skeleton and runs the full CNN when the classifier is unsure: its top-1
+margin is below a threshold, or its top group is one the CNN itself is
+needed to tell apart (the classifier's "confusable" set, measured when
+it is fitted).
+
+Usage:
+  python cascade.py --fit SESSION.npz [...] --out cascade_model.npz [--backend keras]
+  python cascade.py --evaluate SESSION.npz [...] --classifier cascade_model.npz [--margin 0.3]
+
+--fit labels every recorded hand with the CNN (rendered exactly as the
+app does) and trains the classifier on those labels. --evaluate replays
+the recordings through both paths and reports the escalation fraction,
+agreement with the CNN-only path and, for labelled recordings, accuracy.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from instrumentation import metrics
+from landmark_classifier import LandmarkClassifier, landmark_features
+
+DEFAULT_MARGIN = 0.3
+CLASSIFIER_PATH = "cascade_model.npz"
+
+
+class Cascade:
+    """Decides per frame whether the cheap classifier's answer is good enough"""
+
+    def __init__(self, classifier, margin=DEFAULT_MARGIN, confusable=None):
+        self.classifier = classifier
+        self.margin = margin
+        self.confusable = classifier.confusable if confusable is None else set(confusable)
+        # Top-1 probability of the last decide(), accepted or not
+        self.last_confidence = 0.0
+
+    @classmethod
+    def load(cls, path=CLASSIFIER_PATH, margin=DEFAULT_MARGIN):
+        return cls(LandmarkClassifier.load(path), margin)
+
+    def decide(self, landmarks):
+        """(ch1, ch2) from the cheap classifier, or None to escalate to the CNN"""
+        with metrics.stage("cheap_infer"):
+            prob = self.classifier.predict_landmarks(landmarks)
+        ch2, ch1 = np.argsort(prob)[-2:]
+        self.last_confidence = float(prob[ch1])
+        if prob[ch1] - prob[ch2] < self.margin or int(ch1) in self.confusable:
+            metrics.count("cascade_escalated")
+            return None
+        metrics.count("cascade_accepted")
+        return int(ch1), int(ch2)
+
+
+def teacher_samples(app, recordings):
+    """(features, CNN probabilities, recorded labels) for every hand in the recordings"""
+    from replay import attach_recorded_detector
+
+    recorded = attach_recorded_detector(app)
+    features, targets, labels = [], [], []
+    for recording in recordings:
+        for frame in recording.frames():
+            if frame.hand is None:
+                continue
+            recorded.hand = frame.hand
+            prob = cnn_scores(app, frame)
+            if prob is None:
+                continue
+            features.append(landmark_features(frame.hand[0]))
+            targets.append(prob)
+            labels.append(frame.label)
+    return np.array(features, np.float32), np.array(targets, np.float32), labels
+
+
+def cnn_scores(app, frame):
+    """CNN probabilities for a replayed frame, rendered as process_frame does"""
+    from replay import render_skeleton
+
+    skeleton = render_skeleton(app, frame)
+    if skeleton is None:
+        return None
+    return app.gesture_scores(skeleton)
+
+
+def find_confusable(classifier, features, targets, min_agreement=0.9):
+    """Classes whose cheap predictions agree with the CNN less than min_agreement"""
+    predicted = np.argmax(classifier.predict_proba(features), axis=1)
+    confusable = []
+    for c in range(len(classifier.labels)):
+        mask = predicted == c
+        if mask.any() and (targets[mask] == c).mean() < min_agreement:
+            confusable.append(c)
+    return confusable
+
+
+def fit(app, recordings, hidden=(32,), holdout=0.2, seed=0):
+    """Train the cheap classifier on CNN labels and measure its confusable classes"""
+    features, probs, _ = teacher_samples(app, recordings)
+    targets = np.argmax(probs, axis=1)
+    if len(features) == 0:
+        raise ValueError("No hands in the recordings to learn from")
+    order = np.random.default_rng(seed).permutation(len(features))
+    split = max(1, int(len(order) * (1 - holdout)))
+    train, test = order[:split], order[split:]
+    if len(test) == 0:
+        test = train
+    classifier = LandmarkClassifier.fit(features[train], targets[train], app.gesture_labels, hidden=hidden)
+    classifier.confusable = set(find_confusable(classifier, features[test], targets[test]))
+    agreement = float((np.argmax(classifier.predict_proba(features[test]), axis=1) == targets[test]).mean())
+    return classifier, {"samples": len(features), "holdout_agreement": agreement,
+                        "confusable": [classifier.labels[c] for c in sorted(classifier.confusable)]}
+
+
+def evaluate(app, recordings, cascade):
+    """Per-frame comparison of the cascade against the CNN-only path"""
+    from replay import attach_recorded_detector
+
+    recorded = attach_recorded_detector(app)
+    frames = escalated = agree = 0
+    correct = {"cnn": 0, "cascade": 0}
+    labelled = 0
+    seconds = {"cnn": 0.0, "cascade": 0.0}
+    for recording in recordings:
+        for frame in recording.frames():
+            if frame.hand is None:
+                continue
+            recorded.hand = frame.hand
+
+            t0 = time.perf_counter()
+            prob = cnn_scores(app, frame)
+            seconds["cnn"] += time.perf_counter() - t0
+            if prob is None:
+                continue
+            cnn_char = app.classify_gesture(*np.argsort(prob)[-2:][::-1], None)
+
+            t0 = time.perf_counter()
+            decision = cascade.decide(frame.hand[0])
+            if decision is None:
+                escalated += 1
+                decision = tuple(np.argsort(cnn_scores(app, frame))[-2:][::-1])
+            seconds["cascade"] += time.perf_counter() - t0
+            cascade_char = app.classify_gesture(decision[0], decision[1], None)
+
+            frames += 1
+            agree += cascade_char == cnn_char
+            if frame.label is not None and frame.label.strip():
+                labelled += 1
+                correct["cnn"] += cnn_char == frame.label
+                correct["cascade"] += cascade_char == frame.label
+
+    report = {
+        "frames": frames,
+        "margin": cascade.margin,
+        "confusable": [cascade.classifier.labels[c] for c in sorted(cascade.confusable)],
+        "escalation_fraction": escalated / frames if frames else 0.0,
+        "agreement_with_cnn": agree / frames if frames else 0.0,
+        "ms_per_frame": {k: v * 1000 / frames if frames else 0.0 for k, v in seconds.items()},
+    }
+    if labelled:
+        report["accuracy"] = {k: v / labelled for k, v in correct.items()}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheap-classifier-first inference cascade")
+    parser.add_argument("sessions", nargs="*", help=".npz/.lmk landmark recordings")
+    parser.add_argument("--fit", action="store_true", help="train the cheap classifier on CNN labels")
+    parser.add_argument("--evaluate", action="store_true", help="compare the cascade with CNN-only")
+    parser.add_argument("--classifier", default=CLASSIFIER_PATH)
+    parser.add_argument("--out", default=CLASSIFIER_PATH, help="where --fit writes the classifier")
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    parser.add_argument("--backend", default="cached", help="CNN backend (keras|tflite|cached|standin)")
+    parser.add_argument("--model", default="cnn8grps_rad1_model.h5")
+    parser.add_argument("--synthetic", action="store_true", help="use a generated session")
+    args = parser.parse_args()
+    if not args.fit and not args.evaluate:
+        parser.error("choose --fit and/or --evaluate")
+
+    from headless import make_headless_converter
+    from model_backends import load_backend
+    from replay import load_recording, synthetic_session
+
+    recordings = [load_recording(path) for path in args.sessions]
+    if args.synthetic:
+        recordings.append(synthetic_session())
+    if not recordings:
+        parser.error("give at least one recording or --synthetic")
+    app = make_headless_converter(model=load_backend(args.backend, args.model))
+
+    if args.fit:
+        classifier, info = fit(app, recordings)
+        classifier.save(args.out)
+        print(f"Trained on {info['samples']} hands: {info['holdout_agreement']:.1%} agreement with the CNN "
+              f"on held-out frames; confusable: {', '.join(info['confusable']) or 'none'}")
+        print(f"Classifier written to {args.out}")
+        args.classifier = args.out
+    if args.evaluate:
+        report = evaluate(app, recordings, Cascade.load(args.classifier, args.margin))
+        print(json.dumps(report, indent=2))
+        ms = report["ms_per_frame"]
+        print(f"Escalated {report['escalation_fraction']:.1%} of frames; "
+              f"{ms['cnn']:.2f} ms/frame CNN-only vs {ms['cascade']:.2f} ms/frame cascade")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
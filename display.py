@@ -0,0 +1,62 @@
+"""
+Display Layer
+Persistent Tk image panels and change-only label updates for the GUI
+"""
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class ImagePanel:
+    """Shows BGR frames in a tk.Label through one reused PhotoImage
+
+    The frame is resized first (so color conversion touches the smaller
+    image), converted into a preallocated RGB buffer and pasted into the
+    existing PhotoImage. The label is configured only once.
+    """
+
+    def __init__(self, label, size):
+        self.label = label
+        self.size = size  # (width, height)
+        width, height = size
+        self._resized = np.empty((height, width, 3), np.uint8)
+        self._rgb = np.empty((height, width, 3), np.uint8)
+        self.photo = None
+        self.frames = 0
+        # Text lines drawn over the image (e.g. the performance HUD)
+        self.overlay = []
+
+    def show(self, frame):
+        """Display a BGR frame"""
+        height, width = frame.shape[:2]
+        if (width, height) != self.size:
+            cv2.resize(frame, self.size, dst=self._resized, interpolation=cv2.INTER_AREA)
+            frame = self._resized
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        for i, line in enumerate(self.overlay):
+            origin = (8, 20 + 20 * i)
+            cv2.putText(self._rgb, line, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(self._rgb, line, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1, cv2.LINE_AA)
+
+        # fromarray shares memory with self._rgb where PIL allows it
+        image = Image.fromarray(self._rgb)
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image=image)
+            self.label.config(image=self.photo, text="")
+        else:
+            self.photo.paste(image)
+        self.frames += 1
+
+
+class LabelText:
+    """Sets a widget's text only when it actually changes"""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.value = widget.cget("text")
+
+    def set(self, text):
+        if text != self.value:
+            self.widget.config(text=text)
+            self.value = text
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Knowledge Distillation
+Trains a compact landmark-MLP student to reproduce cnn8grps_rad1_model.
+The teacher sees exactly what the app feeds it: every recorded hand is
+rendered with create_skeleton and run through the CNN. The student
+learns the teacher's temperature-softened probabilities (plus the
+recorded labels when present) from landmark features alone, so at run
+time it needs neither the 400x400 render nor the CNN.
+
+CPU-only: the student is trained with NumPy, and the teacher only runs
+inference (set CUDA_VISIBLE_DEVICES= to keep TensorFlow off the GPU).
+
+Usage:
+  python distill.py SESSION.npz [...] [--hidden 64,32] [--temperature 2] [--register]
+  python distill.py --synthetic --backend standin     (pipeline smoke run)
+
+--register adds the student to the model registry (backend "landmark"),
+so the app can load it with --models or hot-swap to it with F5.
+"""
+
+import os
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from landmark_classifier import LandmarkClassifier
+
+STUDENT_PATH = "student_model.npz"
+
+
+def soften(probs, temperature):
+    """Teacher probabilities at a higher temperature (softmax(log p / T))"""
+    logits = np.log(np.clip(probs, 1e-8, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def distillation_targets(teacher_probs, labels, label_names, temperature=2.0, alpha=0.7):
+    """alpha * softened teacher + (1 - alpha) * one-hot recorded label
+
+    Frames without a usable label (none, blank, or not a model class)
+    use the teacher alone.
+    """
+    soft = soften(teacher_probs, temperature)
+    index = {name: i for i, name in enumerate(label_names)}
+    targets = soft.copy()
+    for row, label in enumerate(labels):
+        if label in index:
+            hard = np.zeros(len(label_names), np.float32)
+            hard[index[label]] = 1.0
+            targets[row] = alpha * soft[row] + (1 - alpha) * hard
+    return targets
+
+
+def time_per_call(fn, repeats=50):
+    """Median seconds per call"""
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return sorted(samples)[len(samples) // 2]
+
+
+def compare(app, student, recordings, features, teacher_probs, labels, test):
+    """Accuracy/latency report for teacher vs student on held-out frames"""
+    from cascade import cnn_scores
+    from replay import attach_recorded_detector
+
+    teacher_top = np.argmax(teacher_probs[test], axis=1)
+    student_top = np.argmax(student.predict_proba(features[test]), axis=1)
+    report = {
+        "train_frames": int(len(features) - len(test)),
+        "test_frames": int(len(test)),
+        "top1_agreement": float((teacher_top == student_top).mean()),
+        "student_params": int(sum(w.size + b.size for w, b in zip(student.weights, student.biases))),
+    }
+
+    test_labels = [labels[i] for i in test]
+    names = student.labels
+    scored = [i for i, label in enumerate(test_labels) if label in names]
+    if scored:
+        truth = np.array([names.index(test_labels[i]) for i in scored])
+        report["accuracy"] = {"teacher": float((teacher_top[scored] == truth).mean()),
+                              "student": float((student_top[scored] == truth).mean())}
+
+    # Latency of the full per-frame path each model needs
+    recorded = attach_recorded_detector(app)
+    frame = next(f for r in recordings for f in r.frames() if f.hand is not None)
+    recorded.hand = frame.hand
+    report["ms_per_frame"] = {
+        "teacher": time_per_call(lambda: cnn_scores(app, frame)) * 1000,
+        "student": time_per_call(lambda: student.predict_landmarks(frame.hand[0])) * 1000,
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distil the CNN into a landmark-MLP student")
+    parser.add_argument("sessions", nargs="*", help=".npz/.lmk landmark recordings")
+    parser.add_argument("--synthetic", action="store_true", help="add a generated session")
+    parser.add_argument("--backend", default="cached", help="teacher backend (keras|tflite|cached|standin)")
+    parser.add_argument("--model", default="cnn8grps_rad1_model.h5")
+    parser.add_argument("--hidden", default="64,32", help="hidden layer sizes")
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.7, help="weight of the teacher vs recorded labels")
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--out", default=STUDENT_PATH)
+    parser.add_argument("--register", action="store_true", help="add the student to the model registry")
+    parser.add_argument("--models", default="models", help="registry directory for --register")
+    parser.add_argument("--report", default="distill_report.json")
+    args = parser.parse_args()
+
+    from cascade import teacher_samples
+    from headless import make_headless_converter
+    from model_backends import load_backend
+    from replay import load_recording, synthetic_session
+
+    recordings = [load_recording(path) for path in args.sessions]
+    if args.synthetic:
+        recordings.append(synthetic_session())
+    if not recordings:
+        parser.error("give at least one recording or --synthetic")
+    app = make_headless_converter(model=load_backend(args.backend, args.model))
+
+    print("Labelling recorded hands with the teacher...")
+    t0 = time.perf_counter()
+    features, teacher_probs, labels = teacher_samples(app, recordings)
+    if len(features) == 0:
+        print("No hands found in the recordings")
+        return 1
+    print(f"  {len(features)} frames in {time.perf_counter() - t0:.1f}s")
+
+    order = np.random.default_rng(0).permutation(len(features))
+    split = max(1, int(len(order) * (1 - args.holdout)))
+    train, test = order[:split], order[split:]
+    if len(test) == 0:
+        test = train
+
+    hidden = tuple(int(h) for h in args.hidden.split(",") if h)
+    targets = distillation_targets(teacher_probs[train], [labels[i] for i in train],
+                                   app.gesture_labels, args.temperature, args.alpha)
+    print(f"Training student {features.shape[1]}-{'-'.join(map(str, hidden))}-{len(app.gesture_labels)}...")
+    t0 = time.perf_counter()
+    student = LandmarkClassifier.fit(features[train], targets, app.gesture_labels,
+                                     hidden=hidden, epochs=args.epochs)
+    print(f"  trained in {time.perf_counter() - t0:.1f}s")
+    student.save(args.out)
+
+    report = compare(app, student, recordings, features, teacher_probs, labels, test)
+    report.update({"teacher": f"{args.backend}:{args.model}", "temperature": args.temperature,
+                   "alpha": args.alpha, "hidden": list(hidden)})
+    print(json.dumps(report, indent=2))
+    ms = report["ms_per_frame"]
+    print(f"Student agrees with the teacher on {report['top1_agreement']:.1%} of held-out frames, "
+          f"{ms['teacher']:.2f} ms -> {ms['student']:.3f} ms per frame")
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.register:
+        from model_registry import ModelRegistry
+        entry = ModelRegistry(args.models).register(
+            args.out, backend="landmark", labels=app.gesture_labels, input_size=(21, 3),
+            notes=f"distilled from {os.path.basename(args.model)}", extra={"distillation": report})
+        print(f"Registered student as v{entry.version} in {entry.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Evaluation harness
+Replays labelled recordings through the app's own recognition path
+(process_frame -> cascade / predict_gesture -> classify_gesture ->
+update_character_tracking) for each configuration and reports accuracy
+and speed side by side:
+
+  - per-letter confusion matrix over frames with a hand
+  - frame accuracy (frames skipped by the motion gate are excluded)
+  - character error rate of the final transcript against the label
+    sequence (each run of a label is one character, " " a space)
+  - frames/sec and per-frame ms
+
+Usage:
+  python evaluate.py SESSION.lmk [...] [--config "backend=cached" "backend=cached,cascade=cascade_model.npz" ...]
+                     [--out evaluation.json] [--confusion]
+
+Configurations use the benchmark_e2e keys (backend, model, res, gate,
+cascade, margin, render), so every performance option can be measured against
+the same recordings.
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+
+from benchmark_e2e import make_app, parse_config, percentile
+
+DEFAULT_CONFIGS = ["backend=cached"]
+NO_PREDICTION = "-"
+
+
+def reference_transcript(labels):
+    """Label sequence -> expected transcript: one character per run of a label"""
+    text = []
+    previous = None
+    for label in labels:
+        if label != previous and label:
+            text.append(" " if label in (" ", "Space") else label)
+        previous = label
+    return "".join(text).strip()
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(hypothesis, reference):
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return edit_distance(hypothesis, reference) / len(reference)
+
+
+def evaluate_recording(path, config):
+    """Replay one recording with one configuration"""
+    from replay import load_recording, replay
+
+    app, recorded = make_app(path, config)
+    recording = load_recording(path)
+
+    # Capture the character decided for each frame without changing the path
+    decided = []
+    classify = app.classify_gesture
+
+    def capture(ch1, ch2, skeleton):
+        char = classify(ch1, ch2, skeleton)
+        decided.append(char)
+        return char
+
+    app.classify_gesture = capture
+    confusion = defaultdict(Counter)
+    scored = correct = gated = 0
+
+    def on_frame(frame, elapsed):
+        nonlocal scored, correct, gated
+        char = decided[-1] if decided else None
+        decided.clear()
+        if frame.hand is None or not frame.label or not frame.label.strip():
+            return
+        if char is None:
+            gated += 1
+            char = NO_PREDICTION
+        else:
+            scored += 1
+            correct += char == frame.label
+        confusion[frame.label][char] += 1
+
+    result = replay(app, recording.frames(config["res"]), recorded=recorded, on_frame=on_frame)
+    labels = [] if recording.labels is None else [str(label) for label in recording.labels]
+    reference = reference_transcript(labels)
+    hypothesis = result["transcript"].strip()
+    return {
+        "recording": path,
+        "frames": result["processed"],
+        "fps": result["fps"],
+        "frame_p50_ms": percentile(result["frame_ms"], 50),
+        "frame_p95_ms": percentile(result["frame_ms"], 95),
+        "scored_frames": scored,
+        "no_prediction_frames": gated,
+        "frame_accuracy": correct / scored if scored else None,
+        "reference": reference,
+        "transcript": hypothesis,
+        "cer": character_error_rate(hypothesis, reference),
+        "confusion": {label: dict(row) for label, row in confusion.items()},
+    }
+
+
+def evaluate_config(paths, config):
+    """All recordings under one configuration, with pooled totals"""
+    runs = [evaluate_recording(path, config) for path in paths]
+    confusion = defaultdict(Counter)
+    for run in runs:
+        for label, row in run["confusion"].items():
+            confusion[label].update(row)
+    scored = sum(r["scored_frames"] for r in runs)
+    correct = sum(r["frame_accuracy"] * r["scored_frames"] for r in runs if r["frame_accuracy"] is not None)
+    ref_chars = sum(len(r["reference"]) for r in runs)
+    errors = sum(edit_distance(r["transcript"], r["reference"]) for r in runs)
+    frames = sum(r["frames"] for r in runs)
+    seconds = sum(r["frames"] / r["fps"] for r in runs if r["fps"])
+    return {
+        "config": config["name"],
+        "frames": frames,
+        "fps": frames / seconds if seconds else 0.0,
+        "frame_accuracy": correct / scored if scored else None,
+        "cer": errors / ref_chars if ref_chars else None,
+        "confusion": {label: dict(row) for label, row in confusion.items()},
+        "recordings": runs,
+    }
+
+
+def print_confusion(confusion):
+    """Rows: true label, columns: predicted character"""
+    predicted = sorted({p for row in confusion.values() for p in row})
+    labels = sorted(confusion)
+    print("      " + " ".join(f"{p[:5]:>5s}" for p in predicted) + "   acc")
+    for label in labels:
+        row = confusion[label]
+        total = sum(row.values())
+        cells = " ".join(f"{row.get(p, 0):5d}" for p in predicted)
+        print(f"{label[:5]:>5s} {cells} {row.get(label, 0) / total if total else 0:5.0%}")
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and throughput on labelled recordings")
+    parser.add_argument("sessions", nargs="*", help="labelled .lmk/.npz landmark recordings")
+    parser.add_argument("--config", nargs="+", default=DEFAULT_CONFIGS)
+    parser.add_argument("--synthetic", action="store_true", help="evaluate on a generated session")
+    parser.add_argument("--confusion", action="store_true", help="print the confusion matrix per config")
+    parser.add_argument("--out", default="evaluation.json")
+    args = parser.parse_args()
+
+    paths = list(args.sessions)
+    if args.synthetic:
+        from replay import synthetic_session
+        synthetic_session().save("synthetic_session.npz")
+        paths.append("synthetic_session.npz")
+    if not paths:
+        parser.error("give at least one labelled recording or --synthetic")
+
+    configs = [parse_config(text) for text in args.config]
+    results = []
+    for config in configs:
+        print(f"Evaluating {config['name']}...")
+        results.append(evaluate_config(paths, config))
+
+    header = f"{'config':40s} {'frames':>7s} {'fps':>7s} {'frame acc':>9s} {'CER':>6s}"
+    print()
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        accuracy = "-" if r["frame_accuracy"] is None else f"{r['frame_accuracy']:.1%}"
+        print(f"{r['config'][:40]:40s} {r['frames']:7d} {r['fps']:7.1f} {accuracy:>9s} {_fmt(r['cer'], '6.3f')}")
+    if args.confusion:
+        for r in results:
+            print(f"\n{r['config']}:")
+            print_confusion(r["confusion"])
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Geometry Kernels
+Numba-compiled versions of the per-frame landmark geometry and skeleton
+rasterization. Kernels are compiled on first use and cached to disk
+(cache=True), so later launches skip compilation. Without Numba every
+function falls back to the vectorized NumPy code in landmarks.py (and a
+NumPy rasterizer). The kernels return the same shapes and float32
+dtypes, but compute in float64, so values can differ from landmarks.py
+in the last float32 digits; both rasterizers draw the same pixels.
+
+The rasterizer draws anti-alias-free lines and discs straight into the
+uint8 canvas. It is close to, but not pixel-identical with, cv2.line /
+cv2.circle (about 5% of skeleton pixels differ), so the app only uses
+it with --jit-render; check accuracy with evaluate.py before relying on
+it with a CNN trained on cv2 output.
+
+Importing this module imports Numba, so callers import it lazily:
+landmark_classifier on its first single-hand features (the cascade and
+landmark-student path), the app's skeleton rendering only with
+--jit-render.
+"""
+
+import math
+
+import numpy as np
+
+import landmarks
+from skeleton import FINGER_SEGMENTS, PALM_SEGMENTS
+
+try:
+    import numba
+    HAVE_NUMBA = True
+except ImportError:
+    numba = None
+    HAVE_NUMBA = False
+
+SEGMENTS = np.array(FINGER_SEGMENTS + PALM_SEGMENTS, np.int64)
+BONE_COLOR = np.array((0, 255, 0), np.uint8)
+JOINT_COLOR = np.array((0, 0, 255), np.uint8)
+# Closest match to cv2.line with thickness 2
+BONE_HALF_WIDTH = 1.4
+JOINT_RADIUS = 3
+
+
+def _jit(fn):
+    return numba.njit(cache=True, nogil=True)(fn) if HAVE_NUMBA else fn
+
+
+@_jit
+def _pairwise_kernel(pts, pairs, out):
+    for k in range(pairs.shape[0]):
+        a, b = pairs[k, 0], pairs[k, 1]
+        dx = float(pts[a, 0]) - float(pts[b, 0])
+        dy = float(pts[a, 1]) - float(pts[b, 1])
+        out[k] = math.sqrt(dx * dx + dy * dy)
+    return out
+
+
+@_jit
+def _normalize_kernel(pts, out):
+    wx, wy = float(pts[0, 0]), float(pts[0, 1])
+    sx, sy = float(pts[9, 0]) - wx, float(pts[9, 1]) - wy
+    scale = math.sqrt(sx * sx + sy * sy)
+    if scale <= 1e-6:
+        scale = 1.0
+    for i in range(pts.shape[0]):
+        out[i, 0] = (float(pts[i, 0]) - wx) / scale
+        out[i, 1] = (float(pts[i, 1]) - wy) / scale
+    return out
+
+
+@_jit
+def _angles_kernel(pts, joints, out):
+    for k in range(joints.shape[0]):
+        p, j, n = joints[k, 0], joints[k, 1], joints[k, 2]
+        ax, ay = float(pts[p, 0]) - float(pts[j, 0]), float(pts[p, 1]) - float(pts[j, 1])
+        bx, by = float(pts[n, 0]) - float(pts[j, 0]), float(pts[n, 1]) - float(pts[j, 1])
+        norms = math.sqrt((ax * ax + ay * ay) * (bx * bx + by * by))
+        cosine = (ax * bx + ay * by) / max(norms, 1e-6)
+        out[k] = math.acos(min(1.0, max(-1.0, cosine)))
+    return out
+
+
+@_jit
+def _rasterize_kernel(canvas, xy, segments, half_width, radius, bone_color, joint_color):
+    height, width = canvas.shape[0], canvas.shape[1]
+    reach = int(math.ceil(half_width))
+    limit = half_width * half_width
+    for s in range(segments.shape[0]):
+        x0, y0 = xy[segments[s, 0], 0], xy[segments[s, 0], 1]
+        x1, y1 = xy[segments[s, 1], 0], xy[segments[s, 1], 1]
+        dx, dy = float(x1 - x0), float(y1 - y0)
+        length2 = dx * dx + dy * dy
+        for y in range(max(min(y0, y1) - reach, 0), min(max(y0, y1) + reach, height - 1) + 1):
+            for x in range(max(min(x0, x1) - reach, 0), min(max(x0, x1) + reach, width - 1) + 1):
+                t = 0.0
+                if length2 > 0:
+                    t = min(1.0, max(0.0, ((x - x0) * dx + (y - y0) * dy) / length2))
+                px = x0 + t * dx - x
+                py = y0 + t * dy - y
+                if px * px + py * py <= limit:
+                    canvas[y, x, 0] = bone_color[0]
+                    canvas[y, x, 1] = bone_color[1]
+                    canvas[y, x, 2] = bone_color[2]
+    r2 = radius * radius
+    for i in range(xy.shape[0]):
+        cx, cy = xy[i, 0], xy[i, 1]
+        for y in range(max(cy - radius, 0), min(cy + radius, height - 1) + 1):
+            for x in range(max(cx - radius, 0), min(cx + radius, width - 1) + 1):
+                if (x - cx) * (x - cx) + (y - cy) * (y - cy) <= r2:
+                    canvas[y, x, 0] = joint_color[0]
+                    canvas[y, x, 1] = joint_color[1]
+                    canvas[y, x, 2] = joint_color[2]
+    return canvas
+
+
+def _rasterize_numpy(canvas, xy, segments, half_width, radius, bone_color, joint_color):
+    """Same drawing as _rasterize_kernel, vectorized per segment"""
+    height, width = canvas.shape[:2]
+    reach = int(math.ceil(half_width))
+    xy = np.asarray(xy, np.int64)
+    for a, b in segments:
+        (x0, y0), (x1, y1) = xy[a], xy[b]
+        xs = np.arange(max(min(x0, x1) - reach, 0), min(max(x0, x1) + reach, width - 1) + 1)
+        ys = np.arange(max(min(y0, y1) - reach, 0), min(max(y0, y1) + reach, height - 1) + 1)
+        if not len(xs) or not len(ys):
+            continue
+        gx, gy = np.meshgrid(xs, ys)
+        dx, dy = float(x1 - x0), float(y1 - y0)
+        length2 = dx * dx + dy * dy
+        t = np.clip(((gx - x0) * dx + (gy - y0) * dy) / length2, 0.0, 1.0) if length2 > 0 else 0.0
+        mask = (x0 + t * dx - gx) ** 2 + (y0 + t * dy - gy) ** 2 <= half_width * half_width
+        canvas[gy[mask], gx[mask]] = bone_color
+    for cx, cy in xy:
+        xs = np.arange(max(cx - radius, 0), min(cx + radius, width - 1) + 1)
+        ys = np.arange(max(cy - radius, 0), min(cy + radius, height - 1) + 1)
+        if not len(xs) or not len(ys):
+            continue
+        gx, gy = np.meshgrid(xs, ys)
+        mask = (gx - cx) ** 2 + (gy - cy) ** 2 <= radius * radius
+        canvas[gy[mask], gx[mask]] = joint_color
+    return canvas
+
+
+def pairwise_distances(pts, pairs=None):
+    """landmarks.pairwise_distances, compiled for single hands"""
+    if not HAVE_NUMBA or np.ndim(pts) != 2:
+        return landmarks.pairwise_distances(pts, pairs)
+    if pairs is None:
+        pairs = ALL_PAIRS
+    pairs = np.asarray(pairs, np.int64)
+    return _pairwise_kernel(np.asarray(pts), pairs, np.empty(len(pairs), np.float32))
+
+
+def normalize(pts):
+    """landmarks.normalize, compiled for single hands"""
+    if not HAVE_NUMBA or np.ndim(pts) != 2:
+        return landmarks.normalize(pts)
+    pts = np.asarray(pts)
+    return _normalize_kernel(pts, np.empty((pts.shape[0], 2), np.float32))
+
+
+def joint_angles(pts):
+    """landmarks.joint_angles, compiled for single hands"""
+    if not HAVE_NUMBA or np.ndim(pts) != 2:
+        return landmarks.joint_angles(pts)
+    return _angles_kernel(np.asarray(pts), JOINTS, np.empty(len(JOINTS), np.float32))
+
+
+def finger_curl(pts):
+    """landmarks.finger_curl, compiled for single hands"""
+    if not HAVE_NUMBA or np.ndim(pts) != 2:
+        return landmarks.finger_curl(pts)
+    return (np.pi - joint_angles(pts)).reshape(5, 3).sum(axis=1)
+
+
+def rasterize_skeleton(canvas, xy):
+    """Draw bones and joints at canvas positions xy ((21, 2) ints) into canvas"""
+    xy = np.ascontiguousarray(xy, np.int64)
+    draw = _rasterize_kernel if HAVE_NUMBA else _rasterize_numpy
+    return draw(canvas, xy, SEGMENTS, BONE_HALF_WIDTH, JOINT_RADIUS, BONE_COLOR, JOINT_COLOR)
+
+
+def warm_up():
+    """Compile (or load cached) kernels before the first frame needs them"""
+    pts = np.zeros((21, 3), np.int32)
+    pts[9] = (10, 10, 0)
+    pairwise_distances(pts)
+    pairwise_distances(normalize(pts))
+    finger_curl(pts)
+    rasterize_skeleton(np.zeros((40, 40, 3), np.uint8), pts[:, :2])
+    return HAVE_NUMBA
+
+
+ALL_PAIRS = np.array(np.triu_indices(landmarks.NUM_LANDMARKS, 1)).T.astype(np.int64)
+JOINTS = landmarks.JOINTS.astype(np.int64)
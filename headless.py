@@ -0,0 +1,152 @@
+"""
+Headless Pipeline
+Builds a SignLanguageConverter without a window, camera, model file or
+microphone so benchmarks, replays and evaluation can drive the real
+processing methods with synthetic or recorded inputs.
+"""
+
+import math
+
+import numpy as np
+
+from sign_language_converter import SignLanguageConverter
+
+# Landmark layout used by MediaPipe/cvzone: wrist, then 4 joints per finger
+FINGER_BASES = (1, 5, 9, 13, 17)
+
+
+class NullWidget:
+    """Accepts the widget calls the pipeline makes and ignores them"""
+
+    def __init__(self, value=False):
+        self.value = value
+
+    def config(self, **kwargs):
+        pass
+
+    configure = config
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def apply(self, edit):
+        pass
+
+
+class WordListDictionary:
+    """Tiny stand-in for enchant.Dict with deterministic suggestions"""
+
+    WORDS = ("hello", "help", "held", "helmet", "yes", "you", "your", "thank",
+             "thanks", "that", "the", "there", "water", "want", "what", "when")
+
+    def __init__(self, words=WORDS):
+        self.words = set(words)
+        self.sorted = sorted(words)
+
+    def check(self, word):
+        return word in self.words
+
+    def suggest(self, word):
+        return [w for w in self.sorted if w.startswith(word[:2])][:8]
+
+
+class StandInModel:
+    """Cheap Keras-like model: pooled colour features -> softmax over classes"""
+
+    def __init__(self, classes=8, seed=0):
+        rng = np.random.default_rng(seed)
+        self.weights = rng.standard_normal((3, classes)).astype(np.float32)
+
+    def predict(self, batch, verbose=0):
+        pooled = batch.reshape(batch.shape[0], -1, 3).mean(axis=1)
+        logits = pooled @ self.weights
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def synthetic_hand(rng, width=180, height=200, margin=29):
+    """21 plausible [x, y, z] landmarks inside a width x height box"""
+    wrist = np.array([margin + width * 0.5, margin + height * 0.95])
+    points = [wrist]
+    for finger in range(len(FINGER_BASES)):
+        jitter = rng.uniform(-0.05, 0.05)
+        curl = rng.uniform(0.0, 1.2)
+        if finger == 0:
+            # Thumb starts low on the side of the palm
+            angle = -math.pi / 2 - 0.8 + jitter
+            start = wrist + np.array([-width * 0.25, -height * 0.2])
+        else:
+            angle = -math.pi / 2 + (finger - 2.5) * 0.2 + jitter
+            start = wrist + np.array([math.cos(angle), math.sin(angle)]) * height * 0.45
+        segment = height * 0.12
+        joint = start
+        points.append(joint)
+        for _ in range(3):
+            angle += curl * 0.5
+            joint = joint + np.array([math.cos(angle), math.sin(angle)]) * segment
+            points.append(joint)
+    pts = np.rint(np.array(points)).astype(int)
+    pts[:, 0] = np.clip(pts[:, 0], 0, width + 2 * margin - 1)
+    pts[:, 1] = np.clip(pts[:, 1], 0, height + 2 * margin - 1)
+    return [[int(x), int(y), int(rng.integers(-40, 40))] for x, y in pts]
+
+
+class SyntheticDetector:
+    """Replays landmark sets in place of cvzone's HandDetector"""
+
+    def __init__(self, hands=None, count=64, width=180, height=200, seed=0):
+        if hands is None:
+            rng = np.random.default_rng(seed)
+            hands = [synthetic_hand(rng, width, height) for _ in range(count)]
+        self.hands = hands
+        self.width = width
+        self.height = height
+        self.index = 0
+
+    def next_hand(self):
+        pts = self.hands[self.index % len(self.hands)]
+        self.index += 1
+        return pts
+
+    def findHands(self, img, draw=False, flipType=True):
+        pts = self.next_hand()
+        return [{"lmList": pts, "bbox": (100, 100, self.width, self.height),
+                 "center": (100 + self.width // 2, 100 + self.height // 2), "type": "Right"}]
+
+
+def make_headless_converter(model=None, detector=None, dictionary=None):
+    """SignLanguageConverter wired to stand-ins instead of the GUI"""
+    app = SignLanguageConverter.__new__(SignLanguageConverter)
+    app.offset = 29
+    app.model = model if model is not None else StandInModel()
+    app.hd = app.hd2 = detector if detector is not None else SyntheticDetector()
+    # Constructor options, at their defaults (benchmarks override them)
+    app.gate_px = 0
+    app.jit_render = False
+    app.skeleton_rasterizer = None
+    app.setup_variables()
+    app.dictionary = dictionary if dictionary is not None else app.load_dictionary()
+    app.create_white_background()
+
+    # Widgets the processing path touches
+    app.char_text = NullWidget()
+    app.sentence_sink = NullWidget()
+    app.suggestion_buttons = [NullWidget() for _ in range(4)]
+    app.stream_speech = NullWidget(False)
+    app.status_var = NullWidget()
+    app.skeleton_panel = None
+
+    # Frame bookkeeping normally set up with the camera
+    app.current_image = None
+    app.frame_id = 0
+    app.processed_frame_id = 0
+    app.processed_frames = 0
+    app.dropped_frames = 0
+    app.latest_skeleton = None
+    app.latest_skeleton_frame = 0
+    app.skeleton_dirty = False
+    return app
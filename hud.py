@@ -0,0 +1,62 @@
+"""
+Performance HUD
+Turns pipeline counters and stage histograms into a few short lines for
+the status bar and the camera preview.
+"""
+
+import time
+
+
+class PerformanceHud:
+    """Computes rates and recent stage means between successive samples"""
+
+    STAGES = (("infer", "infer"), ("detect", "detect"))
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._last_time = None
+        self._last_frames = (0, 0)
+        self._last_stage = {}
+        self.lines = []
+
+    def reset(self):
+        """Start a fresh window (e.g. when the HUD is switched on)"""
+        self._last_time = None
+        self.lines = []
+
+    def _stage_mean(self, name):
+        """Mean ms of a stage since the previous sample"""
+        histogram = self.metrics.histograms.get(name)
+        if histogram is None:
+            return None
+        count, total = histogram.count, histogram.total
+        last_count, last_total = self._last_stage.get(name, (0, 0.0))
+        self._last_stage[name] = (count, total)
+        if count <= last_count:
+            return None
+        return (total - last_total) / (count - last_count)
+
+    def sample(self, frames_captured, frames_processed, frames_dropped, queues):
+        """Update self.lines; queues maps a short name to its depth"""
+        now = time.perf_counter()
+        if self._last_time is None:
+            self._last_time = now
+            self._last_frames = (frames_captured, frames_processed)
+            for name, _ in self.STAGES:
+                self._stage_mean(name)
+            return self.lines
+
+        elapsed = max(now - self._last_time, 1e-6)
+        capture_fps = (frames_captured - self._last_frames[0]) / elapsed
+        process_fps = (frames_processed - self._last_frames[1]) / elapsed
+        self._last_time = now
+        self._last_frames = (frames_captured, frames_processed)
+
+        parts = [f"cap {capture_fps:4.1f} fps", f"proc {process_fps:4.1f} fps"]
+        for name, label in self.STAGES:
+            mean = self._stage_mean(name)
+            parts.append(f"{label} {mean:5.1f} ms" if mean is not None else f"{label}   -- ms")
+        stats = [f"dropped {frames_dropped}"]
+        stats.extend(f"{name} q {depth}" for name, depth in queues.items())
+        self.lines = [" | ".join(parts), " | ".join(stats)]
+        return self.lines
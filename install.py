@@ -86,6 +86,15 @@ def main():
     except ImportError:
         print("⚠️  OpenCV not available for camera test")
 
+    # Pre-render common phrases so short utterances skip live synthesis
+    print("\nPre-rendering common speech phrases...")
+    try:
+        from audio_cache import AudioCache, prerender
+        count = prerender(AudioCache())
+        print(f"✓ {count} phrases added to the speech cache")
+    except Exception as e:
+        print(f"⚠️  Speech cache skipped ({e}) - phrases will be rendered while the app is idle")
+
     print("\n" + "=" * 60)
     print("Installation complete!")
     print("Run the application with: python sign_language_converter.py")
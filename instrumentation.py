@@ -0,0 +1,236 @@
+"""
+Instrumentation
+Per-stage latency histograms, counters and error tallies for the pipeline.
+
+Stages are timed with monotonic perf_counter and recorded into fixed
+millisecond buckets, so recording never allocates. When disabled,
+stage() hands back a shared no-op context manager.
+"""
+
+import json
+import math
+import threading
+import time
+
+# Upper bucket bounds in milliseconds; the last bucket catches everything
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75,
+              100, 150, 250, 500, 1000, 2500, math.inf)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, ms):
+        i = 0
+        bounds = self.bounds
+        while ms > bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Approximate percentile (0-100), interpolated inside the bucket"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.bounds, self.counts):
+            if n and seen + n >= rank:
+                upper = min(bound, self.max)
+                lower = max(lower, self.min)
+                return lower + (upper - lower) * max(0.0, rank - seen) / n
+            seen += n
+            lower = bound
+        return self.max
+
+    def reset(self):
+        self.__init__(self.bounds)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean, 3),
+            "min_ms": round(self.min, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+        }
+
+
+class _NullStage:
+    """Shared no-op stage used while instrumentation is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    """Reusable timer for one stage (stages are not re-entered)"""
+
+    __slots__ = ("owner", "name", "histogram", "start")
+
+    def __init__(self, owner, name, histogram):
+        self.owner = owner
+        self.name = name
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.histogram.observe((end - self.start) * 1000.0)
+        self.owner.on_stage(self.name, self.start, end)
+        return False
+
+
+class _MemoryStageTimer(_StageTimer):
+    """Stage timer that also attributes allocations (memory profiling mode)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        self.owner.memory.enter(self.name)
+        return _StageTimer.__enter__(self)
+
+    def __exit__(self, exc_type, exc, tb):
+        _StageTimer.__exit__(self, exc_type, exc, tb)
+        self.owner.memory.exit(self.name, self.owner.frame_id)
+        return False
+
+
+class Instrumentation:
+    """Registry of stage histograms and counters"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.errors = {}
+        self.info = {}
+        self.started_at = time.time()
+
+        # Optional TraceRecorder, and the frame the current stages belong to
+        self.tracer = None
+        self.frame_id = 0
+
+        # Optional memory_profile.MemoryProfiler
+        self.memory = None
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def stage(self, name):
+        """Context manager timing one pipeline stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        timer = self._timers.get(name)
+        if timer is None:
+            timer_class = _StageTimer if self.memory is None else _MemoryStageTimer
+            timer = self._timers[name] = timer_class(self, name, self.histogram(name))
+        return timer
+
+    def enable_memory_profiling(self, profiler):
+        """Attribute allocations to stages with a MemoryProfiler"""
+        self.memory = profiler
+        self._timers.clear()
+        self.enabled = True
+
+    def on_stage(self, name, start, end):
+        """Called after each timed stage; forwards the span to the tracer"""
+        if self.tracer is not None:
+            self.tracer.record(name, start, end, self.frame_id)
+
+    def observe(self, name, ms):
+        """Record a latency measured elsewhere (e.g. on another thread)"""
+        if self.enabled:
+            self.histogram(name).observe(ms)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_info(self, key, value):
+        """Static facts about the running pipeline (e.g. inference backend)"""
+        self.info[key] = str(value)
+
+    def error(self, stage, exc):
+        """Tally an error for a stage and report it on the console"""
+        with self._lock:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+        print(f"{stage} error: {exc}")
+
+    def percentiles(self, name):
+        """p50/p95/p99 for a stage in milliseconds"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        return {p: histogram.summary()[p] for p in ("p50_ms", "p95_ms", "p99_ms")}
+
+    def snapshot(self):
+        """Everything recorded so far as plain data"""
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+            errors = dict(self.errors)
+        return {
+            "started_at": self.started_at,
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "info": dict(self.info),
+            "stages": {name: h.summary() for name, h in sorted(histograms.items())},
+            "counters": counters,
+            "errors": errors,
+            "memory": self.memory.snapshot() if self.memory is not None else None,
+        }
+
+    def dump_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def report(self):
+        """Text table of stage percentiles"""
+        lines = [f"{'stage':22s} {'count':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}"]
+        for name, s in self.snapshot()["stages"].items():
+            lines.append(f"{name:22s} {s['count']:8d} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f}")
+        return "\n".join(lines)
+
+
+# Process-wide instance shared by the app and its workers
+metrics = Instrumentation()
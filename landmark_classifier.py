@@ -0,0 +1,143 @@
+"""
+Landmark Classifier
+A small NumPy classifier over hand-landmark features. It needs no
+rendered skeleton image, so it is cheap enough to run on every frame
+(the first stage of the inference cascade). It is trained against the
+CNN's own predictions, so it agrees with the CNN rather than with an
+independent labelling.
+"""
+
+import numpy as np
+
+from landmarks import normalize, pairwise_distances
+
+# Wrist plus fingertips: distances between these carry most of the shape
+KEYPOINTS = (0, 4, 8, 12, 16, 20)
+_PAIRS = np.array([(a, b) for i, a in enumerate(KEYPOINTS) for b in KEYPOINTS[i + 1:]])
+FEATURE_SIZE = 21 * 2 + len(_PAIRS)
+
+_kernels = None
+
+
+def _geometry_kernels():
+    """geometry_kernels, imported on the first single-hand call so that
+    importing this module does not load Numba"""
+    global _kernels
+    if _kernels is None:
+        import geometry_kernels
+        _kernels = geometry_kernels
+    return _kernels
+
+
+def landmark_features(landmarks):
+    """Translation/scale-invariant features for (21, 3) or (N, 21, 3) landmarks
+
+    Single hands (the per-frame path) go through the compiled kernels,
+    which fall back to landmarks.py without Numba; batches stay vectorized.
+    """
+    landmarks = np.asarray(landmarks)
+    if landmarks.ndim == 3 and len(landmarks) == 1:
+        return landmark_features(landmarks[0])[np.newaxis]
+    if landmarks.ndim == 2:
+        kernels = _geometry_kernels()
+        xy = kernels.normalize(landmarks)
+        return np.concatenate([xy.reshape(-1), kernels.pairwise_distances(xy, _PAIRS)])
+    xy = normalize(landmarks)
+    distances = pairwise_distances(xy, _PAIRS)
+    return np.concatenate([xy.reshape(xy.shape[:-2] + (-1,)), distances], axis=-1)
+
+
+def warm_up():
+    """Import and compile the single-hand feature kernels before the first frame"""
+    landmark_features(np.zeros((21, 3), np.int32))
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class LandmarkClassifier:
+    """Feature standardization + dense layers (ReLU hidden, softmax output)"""
+
+    def __init__(self, weights, biases, mean, std, labels, confusable=()):
+        self.weights = [np.asarray(w, np.float32) for w in weights]
+        self.biases = [np.asarray(b, np.float32) for b in biases]
+        self.mean = np.asarray(mean, np.float32)
+        self.std = np.asarray(std, np.float32)
+        self.labels = list(labels)
+        self.confusable = set(int(c) for c in confusable)
+
+    def predict_proba(self, features):
+        """Class probabilities for a (N, FEATURE_SIZE) feature batch"""
+        x = (np.asarray(features, np.float32) - self.mean) / self.std
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0.0)
+        return _softmax(x @ self.weights[-1] + self.biases[-1])
+
+    def predict_landmarks(self, landmarks):
+        """Probabilities for one hand's (21, 3) landmarks"""
+        return self.predict_proba(landmark_features(landmarks)[np.newaxis])[0]
+
+    @classmethod
+    def fit(cls, features, targets, labels, hidden=(), epochs=300, lr=0.05, l2=1e-4, seed=0):
+        """Train with full-batch gradient descent (Adam) on cross-entropy
+
+        targets are class indices (N,) or soft probabilities (N, classes).
+        """
+        features = np.asarray(features, np.float32)
+        classes = len(labels)
+        targets = np.asarray(targets)
+        if targets.ndim == 1:
+            targets = np.eye(classes, dtype=np.float32)[targets.astype(int)]
+        targets = targets.astype(np.float32)
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-6
+        x0 = (features - mean) / std
+
+        rng = np.random.default_rng(seed)
+        sizes = [features.shape[1], *hidden, classes]
+        weights = [rng.standard_normal((a, b)).astype(np.float32) * np.sqrt(2.0 / a)
+                   for a, b in zip(sizes[:-1], sizes[1:])]
+        biases = [np.zeros(b, np.float32) for b in sizes[1:]]
+        params = weights + biases
+        m = [np.zeros_like(p) for p in params]
+        v = [np.zeros_like(p) for p in params]
+
+        n = len(x0)
+        for step in range(1, epochs + 1):
+            activations = [x0]
+            for w, b in zip(weights[:-1], biases[:-1]):
+                activations.append(np.maximum(activations[-1] @ w + b, 0.0))
+            probs = _softmax(activations[-1] @ weights[-1] + biases[-1])
+
+            delta = (probs - targets) / n
+            grads_w, grads_b = [], []
+            for layer in range(len(weights) - 1, -1, -1):
+                grads_w.insert(0, activations[layer].T @ delta + l2 * weights[layer])
+                grads_b.insert(0, delta.sum(axis=0))
+                if layer:
+                    delta = (delta @ weights[layer].T) * (activations[layer] > 0)
+
+            for i, (p, g) in enumerate(zip(params, grads_w + grads_b)):
+                m[i] = 0.9 * m[i] + 0.1 * g
+                v[i] = 0.999 * v[i] + 0.001 * g * g
+                p -= lr * (m[i] / (1 - 0.9 ** step)) / (np.sqrt(v[i] / (1 - 0.999 ** step)) + 1e-8)
+        return cls(weights, biases, mean, std, labels)
+
+    def save(self, path):
+        arrays = {"mean": self.mean, "std": self.std, "labels": np.array(self.labels),
+                  "confusable": np.array(sorted(self.confusable), np.int32),
+                  "layers": np.array(len(self.weights))}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            layers = int(data["layers"])
+            return cls([data[f"w{i}"] for i in range(layers)], [data[f"b{i}"] for i in range(layers)],
+                       data["mean"], data["std"], [str(l) for l in data["labels"]], data["confusable"])
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Landmark Store
+Compact binary recording of what the hand detector saw: per-frame
+landmarks, bbox, timestamp, prediction and optional label, without any
+video. Files (.lmk) are chunked, fixed-size records:
+
+  header   magic "LMKREC01", record size, frame width/height (32 bytes)
+  chunk    "CHNK", record count, first timestamp, then count records
+  ...
+  index    (offset, count, first timestamp) per chunk
+  footer   "LMKINDEX", index offset
+
+Each record is RECORD_DTYPE (149 bytes: int16 landmarks and bbox,
+float32 confidence, float64 timestamp). Chunks are memory-mapped, so
+reading a session is a handful of mmap views, not a parse. A file whose
+recorder crashed before writing the index is still readable: the chunk
+headers are scanned instead.
+
+Usage:
+  python landmark_store.py --info SESSION.lmk
+  python landmark_store.py --convert SESSION.npz SESSION.lmk
+"""
+
+import argparse
+import os
+import struct
+from string import ascii_uppercase
+
+import numpy as np
+
+MAGIC = b"LMKREC01"
+CHUNK_MAGIC = b"CHNK"
+INDEX_MAGIC = b"LMKINDEX"
+HEADER = struct.Struct("<8sIII12x")
+CHUNK_HEADER = struct.Struct("<4sId")
+INDEX_ENTRY = struct.Struct("<QId")
+FOOTER = struct.Struct("<8sQ")
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("landmarks", "<i2", (21, 3)),
+    ("bbox", "<i2", (4,)),
+    ("has_hand", "u1"),
+    ("prediction", "u1"),
+    ("label", "u1"),
+    ("confidence", "<f4"),
+])
+
+# Label/prediction codes; anything else is stored as OTHER
+VOCAB = list(ascii_uppercase) + ["Space", " ", "Unknown", "No Hand Detected"]
+CODES = {name: i for i, name in enumerate(VOCAB)}
+OTHER = 254
+NONE = 255
+
+
+def encode(text):
+    # Blank labels are how unlabelled rows appear in .npz sessions; a
+    # single " " is the space gesture and keeps its code
+    if text is None or not text.strip() and text != " ":
+        return NONE
+    return CODES.get(text, OTHER)
+
+
+def decode(code):
+    if code == NONE:
+        return None
+    return VOCAB[code] if code < len(VOCAB) else "?"
+
+
+class LandmarkRecorder:
+    """Appends frames to a .lmk file, one chunk per chunk_frames records"""
+
+    def __init__(self, path, frame_size, chunk_frames=256):
+        self.path = path
+        self.chunk = np.zeros(chunk_frames, RECORD_DTYPE)
+        self.filled = 0
+        self.index = []
+        self.frames = 0
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, RECORD_DTYPE.itemsize, int(frame_size[0]), int(frame_size[1])))
+
+    def write(self, timestamp, landmarks=None, bbox=None, prediction=None, confidence=0.0, label=None):
+        """Record one frame; landmarks=None means no hand was detected"""
+        record = self.chunk[self.filled]
+        record["timestamp"] = timestamp
+        if landmarks is not None:
+            record["landmarks"] = landmarks
+            record["bbox"] = bbox
+            record["has_hand"] = 1
+        else:
+            record["landmarks"] = 0
+            record["bbox"] = 0
+            record["has_hand"] = 0
+        record["prediction"] = encode(prediction)
+        record["confidence"] = confidence
+        record["label"] = encode(label)
+        self.filled += 1
+        self.frames += 1
+        if self.filled == len(self.chunk):
+            self.flush()
+
+    def flush(self):
+        if not self.filled:
+            return
+        records = self.chunk[:self.filled]
+        offset = self.file.tell()
+        self.file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, self.filled, float(records[0]["timestamp"])))
+        self.file.write(records.tobytes())
+        self.file.flush()
+        self.index.append((offset, self.filled, float(records[0]["timestamp"])))
+        self.filled = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(INDEX_MAGIC, index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkStore:
+    """Read-only, memory-mapped view of a .lmk file
+
+    Offers the same interface as replay.LandmarkRecording (landmarks,
+    bbox, timestamps, labels, frame_size, frames()).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, record_size, width, height = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a landmark store")
+        if record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path} has {record_size}-byte records, expected {RECORD_DTYPE.itemsize}")
+        self.frame_size = (width, height)
+        self.index = self._read_index()
+        self.chunks = [np.memmap(path, RECORD_DTYPE, mode="r", offset=offset + CHUNK_HEADER.size, shape=(count,))
+                       for offset, count, _ in self.index if count]
+        self._records = None
+
+    def _read_index(self):
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f:
+            if size >= HEADER.size + FOOTER.size:
+                f.seek(size - FOOTER.size)
+                magic, index_offset = FOOTER.unpack(f.read(FOOTER.size))
+                if magic == INDEX_MAGIC:
+                    f.seek(index_offset)
+                    raw = f.read(size - FOOTER.size - index_offset)
+                    return [INDEX_ENTRY.unpack_from(raw, i) for i in range(0, len(raw), INDEX_ENTRY.size)]
+            # No index (recorder did not close): walk the chunk headers
+            index = []
+            offset = HEADER.size
+            while offset + CHUNK_HEADER.size <= size:
+                f.seek(offset)
+                magic, count, first = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+                end = offset + CHUNK_HEADER.size + count * RECORD_DTYPE.itemsize
+                if magic != CHUNK_MAGIC or end > size:
+                    break
+                index.append((offset, count, first))
+                offset = end
+            return index
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+    @property
+    def records(self):
+        """All records; a view for single-chunk files, one concatenation otherwise"""
+        if self._records is None:
+            if len(self.chunks) == 1:
+                self._records = self.chunks[0]
+            elif self.chunks:
+                self._records = np.concatenate(self.chunks)
+            else:
+                self._records = np.zeros(0, RECORD_DTYPE)
+        return self._records
+
+    @property
+    def landmarks(self):
+        return self.records["landmarks"]
+
+    @property
+    def bbox(self):
+        # Rows without a hand are zeroed by the recorder, as in .npz sessions
+        return self.records["bbox"]
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    @property
+    def labels(self):
+        codes = self.records["label"]
+        if len(codes) == 0 or (codes == NONE).all():
+            return None
+        return np.array([decode(c) or "" for c in codes])
+
+    @property
+    def predictions(self):
+        return [decode(c) for c in self.records["prediction"]]
+
+    def frames(self, size=None):
+        """ReplayFrames straight from the memory-mapped chunks"""
+        from replay import ReplayFrame
+
+        width, height = self.frame_size
+        scale = 1.0
+        if size is not None and tuple(size) != (width, height):
+            scale = size[0] / width
+            width, height = size
+        image = np.zeros((height, width, 3), np.uint8)
+        index = 0
+        for chunk in self.chunks:
+            for record in chunk:
+                hand = None
+                if record["has_hand"]:
+                    landmarks, bbox = record["landmarks"], record["bbox"]
+                    if scale != 1.0:
+                        landmarks = np.rint(landmarks * [scale, scale, 1]).astype(int)
+                        bbox = np.rint(bbox * scale).astype(int)
+                    hand = (landmarks, bbox)
+                yield ReplayFrame(index, float(record["timestamp"]), image, hand, decode(record["label"]))
+                index += 1
+
+
+def convert_recording(recording, path, chunk_frames=256):
+    """Write a LandmarkRecording (.npz) out as a .lmk store"""
+    with LandmarkRecorder(path, recording.frame_size, chunk_frames) as recorder:
+        for i in range(len(recording)):
+            has_hand = recording.bbox[i][2] > 0
+            label = None if recording.labels is None else str(recording.labels[i])
+            recorder.write(recording.timestamps[i],
+                           recording.landmarks[i] if has_hand else None,
+                           recording.bbox[i] if has_hand else None, label=label)
+        return recorder.frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary landmark recordings")
+    parser.add_argument("--info", metavar="LMK")
+    parser.add_argument("--convert", nargs=2, metavar=("NPZ", "LMK"))
+    args = parser.parse_args()
+
+    if args.convert:
+        from replay import LandmarkRecording
+        source, target = args.convert
+        recording = LandmarkRecording.load(source)
+        frames = convert_recording(recording, target)
+        print(f"{frames} frames: {os.path.getsize(source)} bytes (.npz) -> {os.path.getsize(target)} bytes")
+    if args.info:
+        store = LandmarkStore(args.info)
+        hands = int(store.records["has_hand"].sum())
+        duration = float(store.timestamps[-1] - store.timestamps[0]) if len(store) else 0.0
+        print(f"{args.info}: {len(store)} frames in {len(store.chunks)} chunks, {hands} with a hand, "
+              f"{duration:.1f}s, frame size {store.frame_size[0]}x{store.frame_size[1]}, "
+              f"labels {'yes' if store.labels is not None else 'no'}")
+    if not args.info and not args.convert:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Landmarks
+Hand landmarks as NumPy arrays instead of cvzone's nested lists. A hand
+is one (21, 3) int32 array (x, y, z per landmark); a batch is
+(N, 21, 3). The geometry below works on single hands and batches alike,
+replacing per-element Python indexing and scalar math.sqrt calls.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Landmark chains from knuckle to tip, thumb first
+FINGERS = ((1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16), (17, 18, 19, 20))
+# (previous, joint, next) for the angle at each finger joint
+JOINTS = np.array([(WRIST if i == 0 else finger[i - 1], finger[i], finger[i + 1])
+                   for finger in FINGERS for i in range(3)])
+
+
+def new_hand():
+    """Preallocated landmark buffer for one hand"""
+    return np.zeros((NUM_LANDMARKS, 3), np.int32)
+
+
+def as_array(lm_list, out=None):
+    """Copy cvzone's lmList into a (21, 3) int32 array (reusing out if given)"""
+    if out is None:
+        return np.array(lm_list, np.int32)
+    out[...] = lm_list
+    return out
+
+
+def normalize(pts):
+    """Wrist-relative (x, y), scaled so wrist -> middle knuckle has length 1
+
+    Translation and scale invariant; (…, 21, 3) -> (…, 21, 2) float32.
+    """
+    xy = np.asarray(pts, np.float32)[..., :2]
+    xy = xy - xy[..., WRIST:WRIST + 1, :]
+    scale = np.linalg.norm(xy[..., MIDDLE_MCP, :], axis=-1)
+    scale = np.where(scale > 1e-6, scale, 1.0)
+    return xy / scale[..., np.newaxis, np.newaxis]
+
+
+def pairwise_distances(pts, pairs=None):
+    """Euclidean (x, y) distances between landmark pairs
+
+    pairs is a (P, 2) index array; None means every pair i < j (210).
+    (…, 21, ≥2) -> (…, P).
+    """
+    if pairs is None:
+        pairs = np.array(np.triu_indices(NUM_LANDMARKS, 1)).T
+    pairs = np.asarray(pairs)
+    xy = np.asarray(pts, np.float32)[..., :2]
+    diffs = xy[..., pairs[:, 0], :] - xy[..., pairs[:, 1], :]
+    return np.sqrt((diffs * diffs).sum(axis=-1))
+
+
+def joint_angles(pts):
+    """Angle in radians at each finger joint (π = straight), (…, 15)"""
+    xy = np.asarray(pts, np.float32)[..., :2]
+    a = xy[..., JOINTS[:, 0], :] - xy[..., JOINTS[:, 1], :]
+    b = xy[..., JOINTS[:, 2], :] - xy[..., JOINTS[:, 1], :]
+    dot = (a * b).sum(axis=-1)
+    norms = np.sqrt((a * a).sum(axis=-1) * (b * b).sum(axis=-1))
+    return np.arccos(np.clip(dot / np.maximum(norms, 1e-6), -1.0, 1.0))
+
+
+def finger_curl(pts):
+    """Per-finger curl: 0 for a straight finger, larger when bent, (…, 5)"""
+    bend = np.pi - joint_angles(pts)
+    return bend.reshape(bend.shape[:-1] + (5, 3)).sum(axis=-1)
+
+
+def mean_motion(pts, previous):
+    """Mean absolute per-coordinate (x, y) movement between two hands"""
+    return float(np.abs(np.asarray(pts)[:, :2] - np.asarray(previous)[:, :2]).mean())
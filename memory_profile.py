@@ -0,0 +1,133 @@
+"""
+Memory Profiling
+tracemalloc-based attribution of allocations to pipeline stages, plus
+RSS sampling helpers for steady-state (leak) checks.
+
+For every timed stage the profiler records the transient high-water
+mark above the stage's starting usage ("allocated") and what was still
+held when it ended ("retained"). Nested stages fold their peak into the
+enclosing stage, so process_frame includes detect, render, infer, etc.
+"""
+
+import collections
+import os
+import sys
+import tracemalloc
+
+
+class StageMemory:
+    """Running allocation totals for one stage"""
+
+    __slots__ = ("calls", "allocated", "retained", "max_allocated")
+
+    def __init__(self):
+        self.calls = 0
+        self.allocated = 0
+        self.retained = 0
+        self.max_allocated = 0
+
+    def summary(self):
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "mean_alloc_kb": round(self.allocated / calls / 1024, 2),
+            "max_alloc_kb": round(self.max_allocated / 1024, 2),
+            "retained_kb": round(self.retained / 1024, 2),
+        }
+
+
+class MemoryProfiler:
+    """Tracks tracemalloc usage across nested stages"""
+
+    def __init__(self, frames=1, history=300):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.stages = {}
+        self._stack = []
+        # Per-frame allocation breakdown for the most recent frames
+        self.frames = collections.OrderedDict()
+        self.history = history
+
+    def enter(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            outer = self._stack[-1]
+            outer[2] = max(outer[2], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([name, current, current])
+
+    def exit(self, name, frame_id):
+        current, peak = tracemalloc.get_traced_memory()
+        _, start, seen_peak = self._stack.pop()
+        peak = max(peak, seen_peak)
+        allocated = peak - start
+        retained = current - start
+        if self._stack:
+            outer = self._stack[-1]
+            outer[2] = max(outer[2], peak)
+        tracemalloc.reset_peak()
+
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageMemory()
+        stats.calls += 1
+        stats.allocated += allocated
+        stats.retained += retained
+        if allocated > stats.max_allocated:
+            stats.max_allocated = allocated
+
+        frame = self.frames.get(frame_id)
+        if frame is None:
+            frame = self.frames[frame_id] = {}
+            if len(self.frames) > self.history:
+                self.frames.popitem(last=False)
+        frame[name] = frame.get(name, 0) + allocated
+
+    def snapshot(self):
+        return {
+            "traced_kb": round(tracemalloc.get_traced_memory()[0] / 1024, 2),
+            "stages": {name: s.summary() for name, s in sorted(self.stages.items())},
+            "recent_frames": {str(k): v for k, v in list(self.frames.items())[-10:]},
+        }
+
+    def top_sites(self, limit=10):
+        """Largest live allocation sites (file:line, KiB)"""
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        return [(str(s.traceback), round(s.size / 1024, 1)) for s in stats[:limit]]
+
+    def report(self):
+        lines = [f"{'stage':22s} {'calls':>7s} {'mean KiB':>10s} {'max KiB':>10s} {'retained KiB':>13s}"]
+        for name, s in self.snapshot()["stages"].items():
+            lines.append(f"{name:22s} {s['calls']:7d} {s['mean_alloc_kb']:10.1f} "
+                         f"{s['max_alloc_kb']:10.1f} {s['retained_kb']:13.1f}")
+        return "\n".join(lines)
+
+    def stop(self):
+        tracemalloc.stop()
+
+
+def current_rss_mb():
+    """Current resident set size in MiB, None if it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    return None
+
+
+def rss_slope(samples):
+    """Least-squares slope of (x, rss_mb) samples, MiB per unit x"""
+    n = len(samples)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var = sum((x - mean_x) ** 2 for x, _ in samples)
+    if not var:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / var
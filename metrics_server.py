@@ -0,0 +1,136 @@
+"""
+Metrics Server
+Optional Prometheus text-format endpoint for fleet monitoring.
+
+Runs stdlib http.server on a daemon thread (localhost by default). The
+exposition text is built only when /metrics is scraped, so the video
+loop pays nothing between scrapes.
+"""
+
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "signconv"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def render_metrics(metrics, collectors=()):
+    """Prometheus exposition text for an Instrumentation registry
+
+    collectors are callables returning (name, type, help, samples) tuples,
+    where samples is a list of (labels_dict, value).
+    """
+    out = []
+
+    def family(name, kind, help_text):
+        out.append(f"# HELP {PREFIX}_{name} {help_text}")
+        out.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    snapshot_counters = dict(metrics.counters)
+    errors = dict(metrics.errors)
+    histograms = dict(metrics.histograms)
+
+    family("up", "gauge", "Whether the pipeline is running")
+    out.append(f"{PREFIX}_up 1")
+
+    if metrics.info:
+        family("build_info", "gauge", "Pipeline configuration (inference backend etc.)")
+        out.append(f"{PREFIX}_build_info{_labels(metrics.info)} 1")
+
+    for name, value in sorted(snapshot_counters.items()):
+        family(f"{name}_total", "counter", f"Pipeline counter {name}")
+        out.append(f"{PREFIX}_{name}_total {_number(value)}")
+
+    family("stage_errors_total", "counter", "Errors raised per pipeline stage")
+    for stage, value in sorted(errors.items()):
+        out.append(f"{PREFIX}_stage_errors_total{_labels({'stage': stage})} {_number(value)}")
+
+    family("stage_latency_seconds", "histogram", "Latency per pipeline stage")
+    for stage, histogram in sorted(histograms.items()):
+        counts = list(histogram.counts)
+        cumulative = 0
+        for bound, n in zip(histogram.bounds, counts):
+            cumulative += n
+            le = "+Inf" if bound == math.inf else repr(bound / 1000.0)
+            out.append(f"{PREFIX}_stage_latency_seconds_bucket"
+                       f"{_labels({'stage': stage, 'le': le})} {cumulative}")
+        out.append(f"{PREFIX}_stage_latency_seconds_sum{_labels({'stage': stage})} "
+                   f"{_number(histogram.total / 1000.0)}")
+        out.append(f"{PREFIX}_stage_latency_seconds_count{_labels({'stage': stage})} {cumulative}")
+
+    for collector in collectors:
+        try:
+            samples_by_family = collector()
+        except Exception as e:
+            print(f"Metrics collector error: {e}")
+            continue
+        for name, kind, help_text, samples in samples_by_family:
+            family(name, kind, help_text)
+            for labels, value in samples:
+                out.append(f"{PREFIX}_{name}{_labels(labels)} {_number(value)}")
+
+    return "\n".join(out) + "\n"
+
+
+class MetricsServer:
+    """Serves /metrics from a background thread"""
+
+    def __init__(self, metrics, host="127.0.0.1", port=9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.collectors = []
+        self._server = None
+        self._thread = None
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = render_metrics(server.metrics, server.collectors).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,138 @@
+"""
+Model Backends
+Uniform predict() wrappers for the ways the gesture model can be run:
+Keras (.h5), TensorFlow Lite (.tflite), the landmark-MLP student (.npz)
+and the headless stand-in.
+"""
+
+import os
+
+import numpy as np
+
+
+def _tflite_interpreter(path, num_threads=None):
+    """TFLite interpreter, preferring the small tflite_runtime package"""
+    num_threads = num_threads or os.cpu_count()
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteModel:
+    """Keras-style predict() over a TFLite interpreter
+
+    Handles float and full-integer models: inputs are quantized with the
+    model's scale/zero point, and uint8 batches are passed straight
+    through to uint8 models.
+    """
+
+    backend = "tflite"
+
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        self.interpreter = _tflite_interpreter(path, num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.input_dtype = self.input["dtype"]
+        self.input_shape = tuple(self.input["shape"])
+
+    @property
+    def quantized(self):
+        return self.input_dtype in (np.uint8, np.int8)
+
+    @property
+    def accepts_pixels(self):
+        """True if raw uint8 pixels are already correctly quantized inputs
+
+        Holds for models quantized from [0, 1] float inputs with a uint8
+        input type (scale 1/255, zero point 0), as quantize.py produces.
+        """
+        if self.input_dtype != np.uint8:
+            return False
+        scale, zero_point = self.input["quantization"]
+        return zero_point == 0 and abs(scale * 255.0 - 1.0) < 1e-3
+
+    def _prepare(self, batch):
+        if batch.dtype == np.uint8 and self.accepts_pixels:
+            return batch
+        if batch.dtype == self.input_dtype and not self.quantized:
+            return batch
+        if self.quantized:
+            scale, zero_point = self.input["quantization"]
+            if batch.dtype == np.uint8:
+                batch = batch.astype(np.float32) / 255.0
+            info = np.iinfo(self.input_dtype)
+            return np.clip(np.rint(batch / scale + zero_point), info.min, info.max).astype(self.input_dtype)
+        if batch.dtype == np.uint8:
+            return batch.astype(self.input_dtype) / 255.0
+        return batch.astype(self.input_dtype)
+
+    def predict(self, batch, verbose=0):
+        """Run a batch one sample at a time (TFLite models have batch 1)"""
+        outputs = []
+        for sample in batch:
+            self.interpreter.set_tensor(self.input["index"], self._prepare(sample[np.newaxis]))
+            self.interpreter.invoke()
+            result = self.interpreter.get_tensor(self.output["index"])
+            if self.output["dtype"] != np.float32:
+                scale, zero_point = self.output["quantization"]
+                result = (result.astype(np.float32) - zero_point) * scale
+            outputs.append(result[0])
+        return np.stack(outputs)
+
+
+class KerasModel:
+    """Thin wrapper so Keras models report their backend"""
+
+    backend = "keras"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, batch, verbose=0):
+        return self.model.predict(batch, verbose=verbose)
+
+
+class LandmarkModel:
+    """Landmark-MLP student: predict() takes (N, 21, 3) landmarks, not images"""
+
+    backend = "landmark"
+    uses_landmarks = True
+
+    def __init__(self, path):
+        from landmark_classifier import LandmarkClassifier
+        self.path = path
+        self.classifier = LandmarkClassifier.load(path)
+
+    def predict(self, batch, verbose=0):
+        from landmark_classifier import landmark_features
+        return self.classifier.predict_proba(landmark_features(batch))
+
+
+def load_backend(backend, path=None):
+    """Model with a predict() method for the named backend"""
+    if backend == "standin":
+        from headless import StandInModel
+        return StandInModel()
+    if backend == "keras":
+        from keras.models import load_model
+        return KerasModel(load_model(path))
+    if backend == "tflite":
+        return TFLiteModel(path)
+    if backend == "landmark":
+        return LandmarkModel(path)
+    if backend == "cached":
+        from model_cache import load_cached_model
+        return load_cached_model(path)[0]
+    raise ValueError(f"Unknown backend '{backend}'")
+
+
+def warm_up(model, input_shape=(1, 400, 400, 3)):
+    """Run one prediction so graph tracing/allocation happens before real frames"""
+    if getattr(model, "uses_landmarks", False):
+        input_shape = (1, 21, 3)
+    model.predict(np.zeros(input_shape, np.float32), verbose=0)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Model Artifact Cache
+Converts cnn8grps_rad1_model.h5 to TensorFlow Lite once and reuses the
+converted file on later starts, skipping the HDF5 parse, Keras graph
+build and first-predict tracing. Artifacts are keyed by the source
+file's SHA-256 and the TensorFlow version, so a retrained model or a
+runtime upgrade produces a fresh conversion.
+
+Usage: python model_cache.py --benchmark   (cold vs warm model-ready times)
+       python model_cache.py --build | --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from model_backends import KerasModel, TFLiteModel, warm_up
+
+CACHE_DIR = "model_cache"
+DEFAULT_MODEL = "cnn8grps_rad1_model.h5"
+# A build lock older than this belongs to a converter that died
+BUILD_LOCK_STALE_S = 15 * 60
+# After a failed conversion, launches wait this long before retrying
+RETRY_FAILED_S = 24 * 60 * 60
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def runtime_version():
+    """Installed TensorFlow version, looked up without importing it"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return "unknown"
+    for package in ("tensorflow", "tensorflow-cpu", "tensorflow-macos"):
+        try:
+            return version(package)
+        except PackageNotFoundError:
+            continue
+    return "unknown"
+
+
+def artifact_path(model_path, cache_dir=CACHE_DIR):
+    """Where the converted artifact for model_path lives"""
+    key = f"{file_sha256(model_path)[:16]}-tf{runtime_version()}"
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{key}.tflite")
+
+
+def _write_atomic(path, data):
+    """Write bytes through a temporary file unique to this writer"""
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def convert(keras_model, target):
+    """Write a float TFLite conversion of a Keras model atomically"""
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    data = converter.convert()
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    _write_atomic(target, data)
+    info = {"created": time.time(), "runtime": runtime_version(), "bytes": len(data)}
+    _write_atomic(target + ".json", json.dumps(info).encode("utf-8"))
+    return target
+
+
+def load_cached_model(model_path=DEFAULT_MODEL, cache_dir=CACHE_DIR):
+    """(model, source, artifact) where source is 'cache' or 'keras'
+
+    On a cache miss the Keras model is returned; call build_artifact()
+    (or build_in_background() from a running app) to create the
+    artifact for next time.
+    """
+    target = artifact_path(model_path, cache_dir)
+    if os.path.exists(target):
+        try:
+            return TFLiteModel(target), "cache", target
+        except Exception as e:
+            print(f"Model cache unusable ({e}); falling back to {model_path}")
+    from keras.models import load_model
+    return KerasModel(load_model(model_path)), "keras", target
+
+
+def build_artifact(keras_model, target):
+    """Convert and store; failures only disable the cache
+
+    A failure leaves a target.failed marker so background builds are not
+    retried on every launch (see RETRY_FAILED_S).
+    """
+    failed = target + ".failed"
+    try:
+        convert(keras_model.model if isinstance(keras_model, KerasModel) else keras_model, target)
+        print(f"Model cache written to {target}")
+        if os.path.exists(failed):
+            os.remove(failed)
+        return True
+    except Exception as e:
+        print(f"Model cache conversion failed: {e}")
+        _mark_failed(target, e)
+        return False
+
+
+def _mark_failed(target, error):
+    try:
+        with open(target + ".failed", "w") as f:
+            f.write(str(error))
+    except OSError:
+        pass
+
+
+def _age(path):
+    """Seconds since path was modified, None if it does not exist"""
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class BackgroundBuild:
+    """A converter subprocess plus the lock file that keeps others from starting"""
+
+    def __init__(self, process, lock):
+        self.process = process
+        self.lock = lock
+
+    def reap(self, timeout=5.0):
+        """Collect the converter (stopping it if still running) and release the lock"""
+        if self.process.poll() is None:
+            self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        try:
+            os.remove(self.lock)
+        except OSError:
+            pass
+
+
+def build_in_background(model_path, target):
+    """Convert in a separate low-priority process; returns a BackgroundBuild
+    or None when a conversion is already running or recently failed
+
+    The conversion loads its own copy of the model from model_path, so
+    it never touches the model the app is predicting with, and runs at
+    reduced priority so it does not slow down the first frames.
+    """
+    failed_age = _age(target + ".failed")
+    if failed_age is not None and failed_age < RETRY_FAILED_S:
+        print(f"Model cache conversion failed {failed_age / 3600:.1f} h ago; not retrying yet")
+        return None
+    lock = target + ".lock"
+    lock_age = _age(lock)
+    if lock_age is not None:
+        if lock_age < BUILD_LOCK_STALE_S:
+            return None
+        os.remove(lock)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    with os.fdopen(fd, "w") as f:
+        f.write(str(os.getpid()))
+
+    args = [sys.executable, os.path.abspath(__file__), "--build", "--model", model_path,
+            "--cache-dir", os.path.dirname(target) or "."]
+    try:
+        if sys.platform == "win32":
+            process = subprocess.Popen(args, creationflags=subprocess.BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            process = subprocess.Popen(args, preexec_fn=lambda: os.nice(10))
+    except OSError:
+        os.remove(lock)
+        raise
+    return BackgroundBuild(process, lock)
+
+
+def _measure_ready(model_path, cache_dir):
+    """Seconds to a warmed-up model in this process (for --benchmark)"""
+    start = time.perf_counter()
+    model, source, target = load_cached_model(model_path, cache_dir)
+    warm_up(model)
+    ready = time.perf_counter() - start
+    print(json.dumps({"source": source, "ready_s": ready}))
+    if source == "keras":
+        build_artifact(model, target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompiled model artifact cache")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--build", action="store_true", help="convert now if not cached")
+    parser.add_argument("--clear", action="store_true", help="delete cached artifacts")
+    parser.add_argument("--benchmark", action="store_true", help="compare cold and warm model-ready time")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure_ready(args.model, args.cache_dir)
+        return
+    if args.clear or args.benchmark:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+    if args.build:
+        target = artifact_path(args.model, args.cache_dir)
+        try:
+            model, source, target = load_cached_model(args.model, args.cache_dir)
+        except Exception as e:
+            print(f"Cannot load {args.model}: {e}")
+            _mark_failed(target, e)
+            sys.exit(1)
+        if source == "keras":
+            if not build_artifact(model, target):
+                sys.exit(1)
+        else:
+            print(f"Already cached: {target}")
+    if args.benchmark:
+        # Each start runs in a fresh interpreter, like a real launch
+        results = []
+        for label in ("cold", "warm", "warm"):
+            completed = subprocess.run([sys.executable, __file__, "--measure", "--model", args.model,
+                                        "--cache-dir", args.cache_dir], capture_output=True, text=True)
+            lines = [l for l in completed.stdout.splitlines() if l.startswith("{")]
+            if not lines:
+                print(completed.stdout, completed.stderr)
+                return
+            result = json.loads(lines[-1])
+            results.append(result)
+            print(f"{label:5s} start: model ready in {result['ready_s']:.2f}s (from {result['source']})")
+        cold, warm = results[0]["ready_s"], min(r["ready_s"] for r in results[1:])
+        print(f"Warm start is {cold / warm:.1f}x faster ({(cold - warm) * 1000:.0f} ms saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Model Registry
+A directory of versioned models, each with a metadata.json describing
+how to run it:
+
+  models/
+    v0001/
+      metadata.json   {"version": 1, "backend": "keras", "file": "model.h5",
+                       "input_size": [400, 400, 3], "labels": ["A", ..., "H"], ...}
+      model.h5
+
+New versions are staged in a temporary directory and renamed into
+place, so a running app watching the registry never sees a half-copied
+model.
+
+Usage:
+  python model_registry.py --list
+  python model_registry.py --register retrained.h5 [--backend keras] [--notes "..."]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from model_backends import load_backend
+
+REGISTRY_DIR = "models"
+DEFAULT_INPUT_SIZE = (400, 400, 3)
+# Backends that take something other than a skeleton image
+INPUT_SIZE_BY_BACKEND = {"landmark": (21, 3)}
+DEFAULT_LABELS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+BACKEND_BY_SUFFIX = {".h5": "keras", ".keras": "keras", ".tflite": "tflite", ".npz": "landmark"}
+VERSION_DIR = re.compile(r"^v(\d+)$")
+
+
+class ModelEntry:
+    """One registered model version"""
+
+    def __init__(self, directory, metadata):
+        self.directory = directory
+        self.metadata = metadata
+
+    @property
+    def version(self):
+        return self.metadata["version"]
+
+    @property
+    def backend(self):
+        return self.metadata["backend"]
+
+    @property
+    def file(self):
+        return os.path.join(self.directory, self.metadata["file"])
+
+    @property
+    def input_size(self):
+        return tuple(self.metadata.get("input_size", DEFAULT_INPUT_SIZE))
+
+    @property
+    def labels(self):
+        return list(self.metadata.get("labels", DEFAULT_LABELS))
+
+    def __repr__(self):
+        return f"ModelEntry(v{self.version}, {self.backend}, {self.metadata['file']})"
+
+
+class ModelRegistry:
+    """Versioned models on disk"""
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def entries(self):
+        """All valid versions, oldest first"""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for name in os.listdir(self.root):
+            if not VERSION_DIR.match(name):
+                continue
+            directory = os.path.join(self.root, name)
+            try:
+                with open(os.path.join(directory, "metadata.json")) as f:
+                    found.append(ModelEntry(directory, json.load(f)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return sorted(found, key=lambda entry: entry.version)
+
+    def latest(self):
+        entries = self.entries()
+        return entries[-1] if entries else None
+
+    def get(self, version):
+        for entry in self.entries():
+            if entry.version == version:
+                return entry
+        raise KeyError(f"No model version {version} in {self.root}")
+
+    def register(self, model_file, backend=None, labels=None, input_size=None, notes="",
+                 extra=None):
+        """Copy model_file in as the next version and return its entry
+
+        input_size defaults to what the backend takes ((21, 3) landmarks
+        for "landmark", a 400x400 image otherwise). extra holds additional
+        metadata fields (e.g. an evaluation report).
+        """
+        suffix = os.path.splitext(model_file)[1].lower()
+        backend = backend or BACKEND_BY_SUFFIX.get(suffix)
+        if backend is None:
+            raise ValueError(f"Cannot infer backend for '{model_file}'; pass backend=")
+        if input_size is None:
+            input_size = INPUT_SIZE_BY_BACKEND.get(backend, DEFAULT_INPUT_SIZE)
+        latest = self.latest()
+        version = latest.version + 1 if latest else 1
+        metadata = {
+            "version": version,
+            "backend": backend,
+            "file": "model" + suffix,
+            "input_size": list(input_size),
+            "labels": list(labels or DEFAULT_LABELS),
+            "source": os.path.basename(model_file),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "notes": notes,
+        }
+        metadata.update(extra or {})
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.root)
+        try:
+            shutil.copy2(model_file, os.path.join(staging, metadata["file"]))
+            with open(os.path.join(staging, "metadata.json"), "w") as f:
+                json.dump(metadata, f, indent=2)
+            target = os.path.join(self.root, f"v{version:04d}")
+            os.rename(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return ModelEntry(target, metadata)
+
+    def load(self, entry):
+        """Load and warm up a model, checking it matches its metadata
+
+        Safe to call from a background thread; returns the model without
+        touching the running app.
+        """
+        model = load_backend(entry.backend, entry.file)
+        # Doubles as the warm-up prediction; landmark models take landmarks
+        # whatever an older entry's metadata says
+        input_size = entry.input_size
+        if getattr(model, "uses_landmarks", False):
+            input_size = INPUT_SIZE_BY_BACKEND["landmark"]
+        out = model.predict(np.zeros((1,) + input_size, np.float32), verbose=0)
+        if out.shape[-1] != len(entry.labels):
+            raise ValueError(f"v{entry.version} outputs {out.shape[-1]} classes "
+                             f"but metadata lists {len(entry.labels)} labels")
+        return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned model registry")
+    parser.add_argument("--root", default=REGISTRY_DIR)
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--register", metavar="MODEL_FILE")
+    parser.add_argument("--backend", choices=["keras", "tflite", "landmark"])
+    parser.add_argument("--labels", help="comma-separated label map (default A..H)")
+    parser.add_argument("--notes", default="")
+    parser.add_argument("--check", action="store_true", help="load and warm up the registered model")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.register:
+        labels = args.labels.split(",") if args.labels else None
+        entry = registry.register(args.register, backend=args.backend, labels=labels, notes=args.notes)
+        print(f"Registered {args.register} as v{entry.version} in {entry.directory}")
+        if args.check:
+            registry.load(entry)
+            print("Model loads and matches its metadata")
+    if args.list or not args.register:
+        entries = registry.entries()
+        if not entries:
+            print(f"No models registered in {args.root}")
+        for entry in entries:
+            meta = entry.metadata
+            print(f"v{entry.version:<4d} {entry.backend:7s} {meta.get('created', ''):20s} "
+                  f"{meta.get('source', '')}  {meta.get('notes', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Post-training int8 Quantization
+Converts cnn8grps_rad1_model.h5 to a full-integer TFLite model. The
+representative dataset is built from recorded sessions rendered through
+create_skeleton, so calibration sees the same white-background skeleton
+images the app produces.
+
+The model's input is quantized uint8 with scale 1/255 and zero point 0,
+which is exactly the raw pixel value: predict_gesture feeds the uint8
+skeleton straight in and skips astype('float32') / 255.0.
+
+An accuracy gate compares top-1 predictions with the float model on
+held-out frames (not used for calibration) and exits 1 below
+--min-agreement, so a bad quantization never reaches the registry.
+
+Usage:
+  python quantize.py SESSION.npz [...] [--out cnn8grps_int8.tflite] [--min-agreement 0.98] [--register]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+DEFAULT_OUT = "cnn8grps_int8.tflite"
+
+
+def rendered_skeletons(app, recordings, limit=None):
+    """RGB uint8 skeletons for every recorded hand (as the model sees them)"""
+    import cv2
+    from replay import attach_recorded_detector, render_skeleton
+
+    recorded = attach_recorded_detector(app)
+    skeletons = []
+    for recording in recordings:
+        for frame in recording.frames():
+            if frame.hand is None:
+                continue
+            recorded.hand = frame.hand
+            skeleton = render_skeleton(app, frame)
+            if skeleton is not None:
+                skeletons.append(cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB))
+            if limit is not None and len(skeletons) >= limit:
+                return skeletons
+    return skeletons
+
+
+def split_frames(skeletons, calibration):
+    """Spread calibration samples across the sessions; the rest is the test set"""
+    if len(skeletons) < 2:
+        raise ValueError("Need at least two rendered frames")
+    step = max(2, len(skeletons) // calibration)
+    calib = skeletons[::step][:calibration]
+    test = [s for i, s in enumerate(skeletons) if i % step != 0]
+    return calib, test
+
+
+def quantize(keras_model, calibration_images):
+    """Full-integer TFLite model bytes with uint8 input and output"""
+    import tensorflow as tf
+
+    def representative_dataset():
+        for image in calibration_images:
+            yield [image[np.newaxis].astype(np.float32) / 255.0]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+    return converter.convert()
+
+
+def agreement(float_model, int8_model, images):
+    """Top-1 agreement and mean latency of both models over images"""
+    same = 0
+    seconds = {"float": 0.0, "int8": 0.0}
+    for image in images:
+        t0 = time.perf_counter()
+        expected = float_model.predict(image[np.newaxis].astype(np.float32) / 255.0, verbose=0)[0]
+        t1 = time.perf_counter()
+        got = int8_model.predict(image[np.newaxis], verbose=0)[0]
+        t2 = time.perf_counter()
+        seconds["float"] += t1 - t0
+        seconds["int8"] += t2 - t1
+        same += int(np.argmax(expected) == np.argmax(got))
+    n = max(len(images), 1)
+    return same / n, {k: v * 1000 / n for k, v in seconds.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 post-training quantization with an accuracy gate")
+    parser.add_argument("sessions", nargs="*", help=".npz/.lmk landmark recordings")
+    parser.add_argument("--synthetic", action="store_true", help="add a generated session")
+    parser.add_argument("--model", default="cnn8grps_rad1_model.h5")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--calibration", type=int, default=300, help="representative samples")
+    parser.add_argument("--min-agreement", type=float, default=0.98,
+                        help="required top-1 agreement with the float model")
+    parser.add_argument("--register", action="store_true", help="add the model to the registry if it passes")
+    parser.add_argument("--models", default="models")
+    args = parser.parse_args()
+
+    from keras.models import load_model
+    from headless import make_headless_converter
+    from model_backends import KerasModel, TFLiteModel
+    from replay import load_recording, synthetic_session
+
+    recordings = [load_recording(path) for path in args.sessions]
+    if args.synthetic:
+        recordings.append(synthetic_session())
+    if not recordings:
+        parser.error("give at least one recording or --synthetic")
+
+    keras_model = load_model(args.model)
+    app = make_headless_converter(model=KerasModel(keras_model))
+    skeletons = rendered_skeletons(app, recordings)
+    calib, test = split_frames(skeletons, args.calibration)
+    print(f"Rendered {len(skeletons)} skeletons: {len(calib)} for calibration, {len(test)} held out")
+
+    t0 = time.perf_counter()
+    data = quantize(keras_model, calib)
+    with open(args.out, "wb") as f:
+        f.write(data)
+    print(f"Wrote {args.out} ({len(data) / 1e6:.1f} MB) in {time.perf_counter() - t0:.1f}s")
+
+    int8_model = TFLiteModel(args.out)
+    if not int8_model.accepts_pixels:
+        print("Warning: input quantization is not 1/255; the app will rescale inputs")
+    top1, ms = agreement(app.model, int8_model, test)
+    report = {"top1_agreement": top1, "test_frames": len(test), "calibration_frames": len(calib),
+              "ms_per_frame": ms, "min_agreement": args.min_agreement}
+    print(json.dumps(report, indent=2))
+    print(f"Top-1 agreement with the float model: {top1:.2%} (gate {args.min_agreement:.2%}); "
+          f"{ms['float']:.1f} ms -> {ms['int8']:.1f} ms per frame")
+    if top1 < args.min_agreement:
+        print("FAIL: int8 model disagrees with the float model too often")
+        return 1
+
+    if args.register:
+        from model_registry import ModelRegistry
+        entry = ModelRegistry(args.models).register(
+            args.out, backend="tflite", notes=f"int8 PTQ of {args.model}", extra={"quantization": report})
+        print(f"Registered as v{entry.version} in {entry.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Session Replay
+Feeds recorded video or landmark sessions through a (headless)
+SignLanguageConverter, either as fast as possible or paced like a live
+camera, and measures throughput and sign-to-text latency.
+
+Landmark recordings are .npz files (or .lmk stores, see landmark_store.py) with:
+    landmarks  (N, 21, 3) int  - full-frame landmark coordinates
+    bbox       (N, 4) int      - x, y, w, h (rows with w == 0 have no hand)
+    timestamps (N,) float      - seconds from the start of the session
+    frame_size (2,) int        - width, height of the source frames
+    labels     (N,) str        - optional ground-truth letter per frame
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from instrumentation import metrics
+
+
+class ReplayFrame:
+    """One frame of a session"""
+
+    __slots__ = ("index", "timestamp", "image", "hand", "label")
+
+    def __init__(self, index, timestamp, image, hand=None, label=None):
+        self.index = index
+        self.timestamp = timestamp
+        self.image = image
+        self.hand = hand      # (landmarks, bbox) for landmark sessions
+        self.label = label
+
+
+class LandmarkRecording:
+    """Landmark session loaded from .npz"""
+
+    def __init__(self, landmarks, bbox, timestamps, frame_size, labels=None):
+        self.landmarks = np.asarray(landmarks)
+        self.bbox = np.asarray(bbox)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.frame_size = tuple(int(v) for v in frame_size)
+        self.labels = None if labels is None else np.asarray(labels)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            labels = data["labels"] if "labels" in data.files else None
+            return cls(data["landmarks"], data["bbox"], data["timestamps"], data["frame_size"], labels)
+
+    def save(self, path):
+        arrays = dict(landmarks=self.landmarks, bbox=self.bbox,
+                      timestamps=self.timestamps, frame_size=np.array(self.frame_size))
+        if self.labels is not None:
+            arrays["labels"] = self.labels
+        np.savez_compressed(path, **arrays)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frames(self, size=None):
+        """ReplayFrames with a shared blank image, rescaled to size if given"""
+        width, height = self.frame_size
+        scale = 1.0
+        if size is not None and tuple(size) != (width, height):
+            scale = size[0] / width
+            width, height = size
+        image = np.zeros((height, width, 3), np.uint8)
+        for i in range(len(self)):
+            hand = None
+            if self.bbox[i][2] > 0:
+                landmarks = self.landmarks[i]
+                bbox = self.bbox[i]
+                if scale != 1.0:
+                    landmarks = np.rint(landmarks * [scale, scale, 1]).astype(int)
+                    bbox = np.rint(bbox * scale).astype(int)
+                hand = (landmarks, bbox)
+            label = None if self.labels is None else str(self.labels[i])
+            yield ReplayFrame(i, float(self.timestamps[i]), image, hand, label)
+
+
+def video_frames(path, size=None, labels=None):
+    """ReplayFrames decoded from a video file (mirrored like the camera)"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video {path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    index = 0
+    try:
+        while True:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            if size is not None and (frame.shape[1], frame.shape[0]) != tuple(size):
+                frame = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+            label = labels[index] if labels is not None and index < len(labels) else None
+            yield ReplayFrame(index, index / fps, frame, None, label)
+            index += 1
+    finally:
+        capture.release()
+
+
+def is_landmark_session(path):
+    return str(path).endswith((".npz", ".lmk"))
+
+
+def load_recording(path):
+    """LandmarkRecording (.npz) or memory-mapped LandmarkStore (.lmk)"""
+    if str(path).endswith(".lmk"):
+        from landmark_store import LandmarkStore
+        return LandmarkStore(path)
+    return LandmarkRecording.load(path)
+
+
+def open_session(path, size=None):
+    """ReplayFrames for a .npz/.lmk landmark recording or a video file"""
+    if is_landmark_session(path):
+        return load_recording(path).frames(size)
+    return video_frames(path, size)
+
+
+class RecordedDetector:
+    """Stands in for both HandDetectors while replaying landmarks
+
+    The app calls hd.findHands on the full frame and hd2.findHands on the
+    crop around the bbox; the crop role returns landmarks relative to it.
+    """
+
+    def __init__(self, offset=29):
+        self.offset = offset
+        self.hand = None
+
+    def for_frame(self):
+        return _RecordedRole(self, crop=False)
+
+    def for_crop(self):
+        return _RecordedRole(self, crop=True)
+
+
+class _RecordedRole:
+    def __init__(self, source, crop):
+        self.source = source
+        self.crop = crop
+
+    def findHands(self, img, draw=False, flipType=True):
+        if self.source.hand is None:
+            return []
+        landmarks, bbox = self.source.hand
+        x, y, w, h = (int(v) for v in bbox)
+        if self.crop:
+            origin = (x - self.source.offset, y - self.source.offset)
+            lm_list = [[int(p[0]) - origin[0], int(p[1]) - origin[1], int(p[2])] for p in landmarks]
+            bbox = (self.source.offset, self.source.offset, w, h)
+        else:
+            lm_list = [[int(p[0]), int(p[1]), int(p[2])] for p in landmarks]
+            bbox = (x, y, w, h)
+        return [{"lmList": lm_list, "bbox": bbox, "center": (bbox[0] + w // 2, bbox[1] + h // 2),
+                 "type": "Right"}]
+
+
+def render_skeleton(app, frame):
+    """Skeleton image for a replayed frame, cropped and drawn as process_frame does
+
+    The app's detectors must be a RecordedDetector holding frame.hand.
+    """
+    x, y, w, h = (int(v) for v in frame.hand[1])
+    crop = frame.image[y - app.offset:y + h + app.offset, x - app.offset:x + w + app.offset]
+    if crop.size == 0:
+        return None
+    return app.create_skeleton(crop, w, h)
+
+
+def attach_recorded_detector(app):
+    """Swap the app's detectors for a RecordedDetector; returns it"""
+    recorded = RecordedDetector(app.offset)
+    app.hd = recorded.for_frame()
+    app.hd2 = recorded.for_crop()
+    return recorded
+
+
+def replay(app, frames, realtime=False, recorded=None, on_frame=None):
+    """Run frames through app.process_frame and collect timings
+
+    In realtime mode frames "arrive" at their timestamps; when processing
+    falls behind, frames that have been superseded are dropped, as the
+    live scheduler does. Sign-to-text latency is measured from the onset
+    of the labelled sign (or the processed frame's arrival when there are
+    no labels) to the moment its character reaches the transcript.
+    """
+    latencies = []
+    frame_ms = []
+    processed = dropped = total = 0
+    label_onset = None
+    last_label = None
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    iterator = iter(frames)
+    pending = next(iterator, None)
+    while pending is not None:
+        frame = pending
+        pending = next(iterator, None)
+        total += 1
+
+        if frame.label != last_label:
+            last_label = frame.label
+            label_onset = frame.timestamp
+        if realtime:
+            now = time.perf_counter() - start
+            # A newer frame has already arrived: this one is never processed
+            if pending is not None and pending.timestamp <= now:
+                dropped += 1
+                continue
+            if frame.timestamp > now:
+                time.sleep(frame.timestamp - now)
+            arrival = start + frame.timestamp
+        else:
+            arrival = time.perf_counter()
+
+        if recorded is not None:
+            recorded.hand = frame.hand
+        before = len(app.transcript)
+        app.frame_id += 1
+        app.processed_frame_id = app.frame_id
+        # Stage memory and trace spans are attributed per frame
+        metrics.frame_id = app.frame_id
+        t0 = time.perf_counter()
+        app.process_frame(frame.image)
+        done = time.perf_counter()
+        processed += 1
+        frame_ms.append((done - t0) * 1000.0)
+
+        if len(app.transcript) != before:
+            if realtime and frame.label is not None:
+                onset = start + label_onset
+            else:
+                onset = arrival
+            latencies.append((done - onset) * 1000.0)
+        if on_frame is not None:
+            on_frame(frame, done - t0)
+
+    wall = time.perf_counter() - start
+    return {
+        "frames": total,
+        "processed": processed,
+        "dropped": dropped,
+        "wall_s": wall,
+        "cpu_s": time.process_time() - cpu_start,
+        "fps": processed / wall if wall else 0.0,
+        "frame_ms": frame_ms,
+        "latency_ms": latencies,
+        "transcript": app.transcript.text,
+    }
+
+
+def synthetic_session(seconds=20, fps=30, letters="HELLO WORLD", seed=0, frame_size=(640, 480)):
+    """Labelled landmark session built from synthetic hands, for harness testing"""
+    from headless import synthetic_hand
+
+    rng = np.random.default_rng(seed)
+    n = int(seconds * fps)
+    per_letter = max(1, n // len(letters))
+    shapes = {}
+    landmarks = np.zeros((n, 21, 3), np.int32)
+    bbox = np.zeros((n, 4), np.int32)
+    labels = []
+    for i in range(n):
+        letter = letters[min(i // per_letter, len(letters) - 1)]
+        labels.append(letter)
+        if letter == " ":
+            continue
+        if letter not in shapes:
+            shapes[letter] = np.array(synthetic_hand(rng), np.int32)
+        pts = shapes[letter] + rng.integers(-2, 3, (21, 3))
+        x0, y0 = 200, 120
+        landmarks[i] = pts + [x0 - 29, y0 - 29, 0]
+        bbox[i] = (x0, y0, 180, 200)
+    timestamps = np.arange(n) / fps
+    return LandmarkRecording(landmarks, bbox, timestamps, frame_size, np.array(labels))
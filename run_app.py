@@ -7,9 +7,10 @@ Double-click this file to run the application
 import sys
 import os
 import subprocess
+import importlib.util
 
 def check_requirements():
-    """Check if required packages are installed"""
+    """Check if required packages are installed (without importing them)"""
     required_packages = [
         'cv2', 'numpy', 'tensorflow', 'keras', 
         'pyttsx3', 'cvzone', 'PIL', 'enchant'
@@ -18,14 +19,9 @@ def check_requirements():
     missing_packages = []
 
     for package in required_packages:
-        try:
-            if package == 'cv2':
-                import cv2
-            elif package == 'PIL':
-                import PIL
-            else:
-                __import__(package)
-        except ImportError:
+        # find_spec only locates the package; importing TensorFlow here
+        # would add seconds to every launch
+        if importlib.util.find_spec(package) is None:
             missing_packages.append(package)
 
     return missing_packages
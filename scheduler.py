@@ -0,0 +1,110 @@
+"""
+Render Scheduler
+Runs GUI-thread tasks (camera preview, skeleton preview, inference) at
+independent rates on top of Tk's after() timer.
+"""
+
+import time
+
+
+class ScheduledTask:
+    """A periodic callback with its own interval"""
+
+    def __init__(self, name, callback, interval_ms, enabled=True,
+                 adaptive=False, min_interval_ms=None, max_interval_ms=None, headroom=1.5):
+        self.name = name
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.enabled = enabled
+        self.adaptive = adaptive
+        self.min_interval_ms = min_interval_ms if min_interval_ms is not None else interval_ms
+        self.max_interval_ms = max_interval_ms if max_interval_ms is not None else interval_ms * 10
+        self.headroom = headroom
+        self.runs = 0
+        self.last_duration_ms = 0.0
+        self.avg_duration_ms = 0.0
+        self._after_id = None
+
+    def update_interval(self):
+        """Adaptive tasks: run every headroom x their average cost
+
+        This leaves the rest of each period for the other tasks, so slow
+        inference lowers its own rate instead of starving the preview.
+        """
+        if not self.adaptive:
+            return
+        target = self.avg_duration_ms * self.headroom
+        self.interval_ms = max(self.min_interval_ms, min(self.max_interval_ms, target))
+
+
+class RenderScheduler:
+    """Drives several ScheduledTasks from the Tk event loop"""
+
+    def __init__(self, root):
+        self.root = root
+        self.tasks = {}
+        self.running = False
+
+    def add(self, name, callback, interval_ms, **kwargs):
+        """Register a task; it starts with the scheduler if enabled"""
+        task = ScheduledTask(name, callback, interval_ms, **kwargs)
+        self.tasks[name] = task
+        if self.running and task.enabled:
+            self._schedule(task, 0)
+        return task
+
+    def set_enabled(self, name, enabled):
+        """Enable or disable a task at runtime"""
+        task = self.tasks[name]
+        if task.enabled == enabled:
+            return
+        task.enabled = enabled
+        if enabled and self.running:
+            self._schedule(task, 0)
+        elif not enabled:
+            self._cancel(task)
+
+    def set_interval(self, name, interval_ms):
+        task = self.tasks[name]
+        task.interval_ms = task.min_interval_ms = interval_ms
+
+    def start(self):
+        self.running = True
+        for task in self.tasks.values():
+            if task.enabled:
+                self._schedule(task, 0)
+
+    def stop(self):
+        self.running = False
+        for task in self.tasks.values():
+            self._cancel(task)
+
+    def _schedule(self, task, delay_ms):
+        self._cancel(task)
+        task._after_id = self.root.after(int(delay_ms), lambda: self._run(task))
+
+    def _cancel(self, task):
+        if task._after_id is not None:
+            try:
+                self.root.after_cancel(task._after_id)
+            except Exception:
+                pass
+            task._after_id = None
+
+    def _run(self, task):
+        task._after_id = None
+        if not self.running or not task.enabled:
+            return
+        start = time.perf_counter()
+        try:
+            task.callback()
+        except Exception as e:
+            print(f"{task.name} task error: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        task.runs += 1
+        task.last_duration_ms = elapsed_ms
+        # Exponential moving average smooths out single slow frames
+        task.avg_duration_ms += (elapsed_ms - task.avg_duration_ms) * (1.0 if task.runs == 1 else 0.2)
+        task.update_interval()
+        if self.running and task.enabled:
+            self._schedule(task, max(1.0, task.interval_ms - elapsed_ms))
@@ -1,4 +1,3 @@
-
 """
 Real-Time Sign Language to Speech Converter
 A comprehensive system for converting American Sign Language to text and speech
@@ -9,52 +8,311 @@ import math
 import cv2
 import os
 import traceback
-import pyttsx3
-from keras.models import load_model
-from cvzone.HandTrackingModule import HandDetector
 from string import ascii_uppercase
-import enchant
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import threading
 import time
+import collections
+from transcript_buffer import TranscriptBuffer, TextWidgetSink
+from speech_worker import SpeechWorker
+from audio_cache import AudioCache, COMMON_PHRASES
+from display import ImagePanel, LabelText
+from scheduler import RenderScheduler
+from instrumentation import metrics
+from hud import PerformanceHud
+from metrics_server import MetricsServer
+from tracing import TraceRecorder
+from memory_profile import MemoryProfiler
+from startup import ParallelStartup, StartupTask
+from model_backends import load_backend, warm_up
+from model_cache import load_cached_model, build_in_background
+from model_registry import ModelRegistry, DEFAULT_LABELS
+from cascade import Cascade, DEFAULT_MARGIN
+from landmark_classifier import warm_up as warm_up_features
+from landmark_store import LandmarkRecorder
+from skeleton import draw_bones, draw_joints, offset_points, skeleton_offset
+from landmarks import as_array, mean_motion, new_hand
+import argparse
+import json
 
 class SignLanguageConverter:
-    def __init__(self):
-        # Initialize core components
-        self.setup_model()
-        self.setup_detectors()
-        self.setup_speech_engine()
+    def __init__(self, display_ms=30, skeleton_ms=100, inference_ms=30,
+                 show_skeleton=True, inference=True, metrics_out=None, metrics_server=None,
+                 trace_path=None, trace_seconds=30, gate_px=0,
+                 launch_time=None, exit_when_ready=False, use_model_cache=True,
+                 model_registry=None, watch_models_s=0, cascade_path=None, cascade_margin=DEFAULT_MARGIN,
+                 record_path=None, jit_render=False):
+        # Refresh rates (milliseconds) and optional stages
+        self.display_ms = display_ms
+        self.skeleton_ms = skeleton_ms
+        self.inference_ms = inference_ms
+        self.show_skeleton = show_skeleton
+        self.inference_enabled = inference
+
+        # Stage timings are written here on exit when profiling is enabled
+        self.metrics_out = metrics_out
+        self.metrics_server = metrics_server
+        self.trace_path = trace_path
+        self.trace_seconds = trace_seconds
+        # Motion gating: skip recognition while the hand moves less than
+        # gate_px on average since the last recognized frame (0 = off)
+        self.gate_px = gate_px
+
+        # Startup timing (the startup benchmark exits as soon as all is loaded)
+        self.launch_time = launch_time if launch_time is not None else time.perf_counter()
+        self.exit_when_ready = exit_when_ready
+        self.window_shown_at = None
+        self.use_model_cache = use_model_cache
+        self.model_cache_build = None
+        self.model_source = None
+
+        # Optional versioned models that can be swapped in while running
+        self.registry = ModelRegistry(model_registry) if model_registry else None
+        self.watch_models_s = watch_models_s
+        self.model_version = None
+        self.model_swap = None
+        self.model_swap_version = None
+        # Versions that failed to load; the watcher skips them (F5 retries)
+        self.failed_model_versions = set()
+
+        # Cheap landmark classifier tried before the CNN (None = CNN only)
+        self.cascade_path = cascade_path
+        self.cascade_margin = cascade_margin
+
+        # Landmark recording (.lmk), opened on the first processed frame
+        self.record_path = record_path
+        self.recorder = None
+
+        # Draw skeletons with the compiled rasterizer instead of cv2
+        self.jit_render = jit_render
+        self.skeleton_rasterizer = None
+
+        # Filled in by the background startup tasks
+        self.model = None
+        self.hd = None
+        self.hd2 = None
+        self.offset = 29
+        self.vs = None
+
+        # Show the window first, then load everything heavy in parallel
         self.setup_variables()
-        self.create_white_background()
         self.setup_gui()
+        self.setup_speech_engine()
+        self.start_background_init()
+
+    def start_background_init(self):
+        """Load model, detectors, dictionary and camera on background threads"""
+        self.startup = ParallelStartup()
+        self.startup.add("model", self.setup_model)
+        self.startup.add("detectors", self.setup_detectors)
+        self.startup.add("dictionary", self.setup_dictionary)
+        self.startup.add("camera", self.open_camera)
+
+        self.startup_progress = ttk.Progressbar(
+            self.root, mode='determinate', maximum=len(self.startup.tasks)
+        )
+        self.startup_progress.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_var.set("Loading model, hand detector, dictionary and camera...")
+
+        self.startup.start()
+        self.root.after(20, self.poll_startup)
+
+    def poll_startup(self):
+        """Collect finished startup tasks on the GUI thread"""
+        if self.window_shown_at is None:
+            self.window_shown_at = time.perf_counter()
+
+        # Read before poll(): a task finishing in between is then reported
+        # on the next round instead of being skipped by the teardown below
+        all_done = self.startup.all_done
+        for task in self.startup.poll():
+            if task.error is not None:
+                print(f"Startup error ({task.name}): {task.error}")
+                if task.name == "model":
+                    messagebox.showerror("Error", "Failed to load model. Please ensure 'cnn8grps_rad1_model.h5' is in the directory.")
+            else:
+                print(f"Loaded {task.name} in {task.seconds:.2f}s")
+        self.startup_progress['value'] = self.startup.completed
+
+        if not all_done:
+            self.status_var.set(f"Loading... ({self.startup.completed}/{len(self.startup.tasks)})")
+            self.root.after(50, self.poll_startup)
+            return
+
+        self.startup_progress.pack_forget()
+        ready = self.model is not None and self.hd is not None
+        self.scheduler.set_enabled("inference", ready and self.inference_enabled)
+        self.status_var.set("Ready - Position your hand in front of the camera" if ready
+                            else "Recognition unavailable - see console for errors")
+        self.report_startup()
+
+    def report_startup(self):
+        """Print startup timings; exit if running as the startup benchmark"""
+        now = time.perf_counter()
+        report = {
+            "window_ms": round((self.window_shown_at - self.launch_time) * 1000, 1),
+            "ready_ms": round((now - self.launch_time) * 1000, 1),
+            "model_source": self.model_source,
+            "tasks_ms": {name: round(seconds * 1000, 1) if seconds is not None else None
+                         for name, seconds in self.startup.timings().items()},
+        }
+        print(f"Window after {report['window_ms']:.0f} ms, ready after {report['ready_ms']:.0f} ms")
+        if self.exit_when_ready:
+            print("STARTUP " + json.dumps(report))
+            self.cleanup()
 
     def setup_model(self):
-        """Load the trained CNN model"""
+        """Load the CNN (converted copy when cached) and warm it up (background thread)"""
+        entry = self.registry.latest() if self.registry is not None else None
+        if entry is not None:
+            self.model = self.registry.load(entry)
+            self.set_model_info(entry)
+            self.load_cascade()
+            print(f"Model v{entry.version} loaded from {self.registry.root}")
+            return
+
+        model_path = 'cnn8grps_rad1_model.h5'
+        if self.use_model_cache:
+            model, source, artifact = load_cached_model(model_path)
+        else:
+            model, source, artifact = load_backend("keras", model_path), "keras", None
+        # The first predict builds the inference graph; do it before frames arrive
+        warm_up(model)
+        metrics.set_info("inference_backend", model.backend)
+        metrics.set_info("model_source", source)
+        self.load_cascade()
+        self.model_source = source
+        self.model = model
+        print(f"Model loaded successfully ({source})")
+        if source == "keras" and artifact is not None:
+            # Convert for the next launch in a separate process, from the
+            # .h5, so the live model is never shared with the converter
+            try:
+                self.model_cache_build = build_in_background(model_path, artifact)
+            except OSError as e:
+                print(f"Model cache conversion not started: {e}")
+
+    def load_cascade(self):
+        """Load the cheap first-stage classifier if one was configured"""
+        if self.cascade_path:
+            self.cascade = Cascade.load(self.cascade_path, self.cascade_margin)
+            # Compile the feature kernels here rather than on the first frame
+            warm_up_features()
+            print(f"Cascade enabled (margin {self.cascade_margin})")
+
+    def set_model_info(self, entry):
+        """Record which registry version is active"""
+        self.model_version = entry.version
+        self.model_source = f"registry v{entry.version}"
+        self.gesture_labels = entry.labels
+        metrics.set_info("inference_backend", entry.backend)
+        metrics.set_info("model_source", self.model_source)
+
+    def request_model_swap(self, version=None):
+        """Load a registry model in the background and switch to it when warm
+
+        version=None picks the newest registered model.
+        """
+        if self.registry is None:
+            self.status_var.set("No model registry configured (--models DIR)")
+            return
+        if self.model_swap is not None:
+            return
         try:
-            self.model = load_model('cnn8grps_rad1_model.h5')
-            print("Model loaded successfully")
-        except Exception as e:
-            print(f"Error loading model: {e}")
-            messagebox.showerror("Error", "Failed to load model. Please ensure 'cnn8grps_rad1_model.h5' is in the directory.")
+            entry = self.registry.latest() if version is None else self.registry.get(version)
+        except KeyError as e:
+            self.status_var.set(str(e))
+            return
+        if entry is None or entry.version == self.model_version:
+            self.status_var.set("Already running the newest model")
+            return
+
+        self.model_swap = StartupTask("model-swap", lambda: (entry, self.registry.load(entry)))
+        self.model_swap_version = entry.version
+        self.model_swap.thread.start()
+        self.status_var.set(f"Loading model v{entry.version} in the background...")
+        self.root.after(100, self.poll_model_swap)
+
+    def poll_model_swap(self):
+        """Switch models on the GUI thread once the new one is warm"""
+        task = self.model_swap
+        if not task.done:
+            self.root.after(100, self.poll_model_swap)
+            return
+        self.model_swap = None
+        if task.error is not None:
+            self.failed_model_versions.add(self.model_swap_version)
+            print(f"Model swap to v{self.model_swap_version} failed: {task.error}")
+            metrics.error("model_swap", task.error)
+            self.status_var.set(f"Model swap failed, still using the previous model: {task.error}")
+            return
+
+        entry, model = task.result
+        # predict_gesture reads self.model once per frame, so the swap
+        # takes effect between frames and never mixes two models
+        self.gesture_labels = entry.labels
+        self.model = model
+        self.set_model_info(entry)
+        metrics.count("model_swaps")
+        print(f"Switched to model v{entry.version} (loaded in {task.seconds:.2f}s)")
+        self.status_var.set(f"Now using model v{entry.version}")
+        if self.startup.all_done and self.hd is not None:
+            self.scheduler.set_enabled("inference", self.inference_enabled)
+
+    def check_for_new_model(self):
+        """Scheduler task: swap in newly registered models"""
+        latest = self.registry.latest()
+        if latest is None or latest.version in self.failed_model_versions:
+            return
+        if latest.version != self.model_version and self.model is not None:
+            self.request_model_swap(latest.version)
 
     def setup_detectors(self):
-        """Initialize hand detection modules"""
-        self.hd = HandDetector(maxHands=1)
+        """Initialize hand detection modules (background thread)"""
+        from cvzone.HandTrackingModule import HandDetector
+        self.create_white_background()
+        hd = HandDetector(maxHands=1)
         self.hd2 = HandDetector(maxHands=1)
-        self.offset = 29
+        self.hd = hd
+        if self.jit_render:
+            self.load_skeleton_rasterizer()
+
+    def load_skeleton_rasterizer(self):
+        """Bind the compiled rasterizer, compiling it before the first frame
+
+        Imported here so launches without --jit-render never load Numba.
+        """
+        import geometry_kernels
+        geometry_kernels.warm_up()
+        self.skeleton_rasterizer = geometry_kernels.rasterize_skeleton
+
+    def setup_dictionary(self):
+        """Load the spell-check dictionary (background thread)"""
+        self.dictionary = self.load_dictionary()
+
+    def load_dictionary(self):
+        """Dictionary for spell check, or None if enchant is unavailable"""
+        try:
+            import enchant
+            return enchant.Dict("en-US")
+        except Exception:
+            print("Warning: Dictionary not available for spell checking")
+            return None
+
+    def open_camera(self):
+        """Open the webcam (background thread)"""
+        self.vs = cv2.VideoCapture(0)
 
     def setup_speech_engine(self):
-        """Initialize text-to-speech engine"""
+        """Start the text-to-speech worker (it owns the pyttsx3 engine)"""
         try:
-            self.speak_engine = pyttsx3.init()
-            self.speak_engine.setProperty("rate", 120)
-            voices = self.speak_engine.getProperty("voices")
-            if voices:
-                self.speak_engine.setProperty("voice", voices[0].id)
-        except Exception as e:
-            print(f"Speech engine error: {e}")
+            audio_cache = AudioCache(rate=120, voice_index=0)
+        except OSError as e:
+            print(f"Audio cache disabled: {e}")
+            audio_cache = None
+        self.speech = SpeechWorker(rate=120, voice_index=0, maxsize=8, audio_cache=audio_cache)
+        self.speech.start()
+        self.speech.prerender_idle(COMMON_PHRASES)
 
     def setup_variables(self):
         """Initialize tracking variables"""
@@ -71,19 +329,38 @@ class SignLanguageConverter:
         self.prev_char = ""
         self.count = -1
         self.ten_prev_char = [" " for _ in range(10)]
+        # Model output index -> label; replaced by registry metadata
+        self.gesture_labels = list(DEFAULT_LABELS)
 
         # Display variables
-        self.text_sentence = ""
+        self.transcript = TranscriptBuffer()
         self.current_symbol = "Ready"
         self.word_suggestions = ["", "", "", ""]
         self.current_word = ""
 
-        # Dictionary for spell check
-        try:
-            self.dictionary = enchant.Dict("en-US")
-        except:
-            print("Warning: Dictionary not available for spell checking")
-            self.dictionary = None
+        # Motion gate: landmarks of the last recognized frame, see gate_px
+        self.gate_pts = new_hand()
+        self.gate_valid = False
+
+        # Landmarks of the current hand, reused every frame
+        self.hand_pts = new_hand()
+        self.crop_pts = new_hand()
+
+        # Inference cascade, loaded with the model when configured
+        self.cascade = None
+
+        # Last detection, decided character (None when the frame was not
+        # recognized, e.g. motion-gated) and top-1 probability, for the
+        # landmark recorder
+        self.last_hand = None
+        self.last_prediction = None
+        self.last_confidence = 0.0
+
+        # Streaming speech: word-completion-to-audio-start latencies (seconds)
+        self.stream_latencies = collections.deque(maxlen=500)
+
+        # Dictionary for spell check (loaded in the background)
+        self.dictionary = None
 
     def create_white_background(self):
         """Create white background image for skeleton drawing"""
@@ -118,20 +395,24 @@ class SignLanguageConverter:
         # Camera display
         self.camera_label = tk.Label(left_panel, text="Camera Feed", bg='white')
         self.camera_label.pack(pady=10)
+        self.camera_panel = ImagePanel(self.camera_label, (640, 480))
 
         # Right panel - Results and skeleton
         right_panel = tk.Frame(main_frame, bg='#f0f0f0')
         right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
-        # Skeleton display
-        skeleton_frame = tk.Frame(right_panel, bg='white', relief=tk.RAISED, bd=2)
-        skeleton_frame.pack(pady=(0, 10))
+        # Skeleton display (left out entirely in kiosk mode)
+        self.skeleton_panel = None
+        if self.show_skeleton:
+            skeleton_frame = tk.Frame(right_panel, bg='white', relief=tk.RAISED, bd=2)
+            skeleton_frame.pack(pady=(0, 10))
 
-        sk_title = tk.Label(skeleton_frame, text="Hand Skeleton", font=("Arial", 14, "bold"), bg='white')
-        sk_title.pack(pady=5)
+            sk_title = tk.Label(skeleton_frame, text="Hand Skeleton", font=("Arial", 14, "bold"), bg='white')
+            sk_title.pack(pady=5)
 
-        self.skeleton_label = tk.Label(skeleton_frame, text="Skeleton View", bg='white')
-        self.skeleton_label.pack(pady=10)
+            self.skeleton_label = tk.Label(skeleton_frame, text="Skeleton View", bg='white')
+            self.skeleton_label.pack(pady=10)
+            self.skeleton_panel = ImagePanel(self.skeleton_label, (300, 300))
 
         # Results frame
         results_frame = tk.Frame(right_panel, bg='#e8f4fd', relief=tk.RAISED, bd=2)
@@ -150,6 +431,7 @@ class SignLanguageConverter:
             fg='#e74c3c'
         )
         self.char_display.pack(side=tk.LEFT, padx=10)
+        self.char_text = LabelText(self.char_display)
 
         # Sentence display
         sentence_frame = tk.Frame(results_frame, bg='#e8f4fd')
@@ -165,6 +447,7 @@ class SignLanguageConverter:
             fg='#2c3e50'
         )
         self.sentence_display.pack(fill=tk.X, pady=5)
+        self.sentence_sink = TextWidgetSink(self.sentence_display)
 
         # Word suggestions
         suggestions_frame = tk.Frame(results_frame, bg='#e8f4fd')
@@ -211,6 +494,39 @@ class SignLanguageConverter:
         )
         self.clear_btn.pack(side=tk.LEFT, padx=10)
 
+        self.stop_btn = tk.Button(
+            control_frame,
+            text="⏹ Stop",
+            font=("Arial", 12, "bold"),
+            bg='#7f8c8d',
+            fg='white',
+            command=self.stop_speech,
+            width=10
+        )
+        self.stop_btn.pack(side=tk.LEFT, padx=10)
+
+        self.stream_speech = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            results_frame,
+            text="Speak each word as it is completed",
+            variable=self.stream_speech,
+            font=("Arial", 10),
+            bg='#e8f4fd'
+        ).pack()
+
+        self.show_hud = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            results_frame,
+            text="Performance overlay (F2)",
+            variable=self.show_hud,
+            command=self.toggle_hud,
+            font=("Arial", 10),
+            bg='#e8f4fd'
+        ).pack()
+        self.root.bind('<F2>', lambda event: (self.show_hud.set(not self.show_hud.get()), self.toggle_hud()))
+        # Swap in the newest registered model without restarting
+        self.root.bind('<F5>', lambda event: self.request_model_swap())
+
         # Status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready - Position your hand in front of the camera")
@@ -226,64 +542,246 @@ class SignLanguageConverter:
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
         # Initialize camera
-        self.vs = cv2.VideoCapture(0)
         self.current_image = None
-
-        # Start video processing
-        self.video_loop()
+        self.frame_id = 0
+        self.processed_frame_id = 0
+        self.processed_frames = 0
+        self.dropped_frames = 0
+        self.latest_skeleton = None
+        self.latest_skeleton_frame = 0
+        self.skeleton_dirty = False
+
+        # Camera preview, skeleton preview and inference run at their own rates
+        self.scheduler = RenderScheduler(self.root)
+        self.scheduler.add("display", self.capture_frame, self.display_ms)
+        self.scheduler.add("skeleton", self.refresh_skeleton, self.skeleton_ms,
+                           enabled=self.show_skeleton)
+        # Inference is enabled once the model and detectors have loaded
+        self.scheduler.add("inference", self.run_inference, self.inference_ms,
+                           enabled=False, adaptive=True, max_interval_ms=500)
+
+        # Performance HUD, refreshed slowly so it does not cost frames
+        self.hud = PerformanceHud(metrics)
+        self.hud_restore_metrics = metrics.enabled
+        self.scheduler.add("hud", self.update_hud, 500, enabled=False)
+        if self.registry is not None and self.watch_models_s > 0:
+            self.scheduler.add("model_watch", self.check_for_new_model, self.watch_models_s * 1000)
+        self.scheduler.start()
+
+        if self.metrics_server is not None:
+            self.metrics_server.add_collector(self.collect_metrics)
+
+        if self.trace_path:
+            self.start_trace()
+
+        # Deliver speech worker callbacks on the GUI thread
+        self.poll_speech_events()
 
         # Handle window close
         self.root.protocol('WM_DELETE_WINDOW', self.cleanup)
 
     def distance(self, x, y):
-        """Calculate Euclidean distance between two points"""
-        return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
+        """Euclidean distance between two landmarks
 
-    def video_loop(self):
-        """Main video processing loop"""
+        For many pairs at once use landmarks.pairwise_distances.
+        """
+        return math.hypot(x[0] - y[0], x[1] - y[1])
+
+    def capture_frame(self):
+        """Display task: grab a camera frame and show it"""
+        if self.vs is None:
+            return
         try:
-            ret, frame = self.vs.read()
+            metrics.frame_id = self.frame_id + 1
+            with metrics.stage("capture"):
+                ret, frame = self.vs.read()
+                if ret:
+                    frame = cv2.flip(frame, 1)
             if ret:
-                frame = cv2.flip(frame, 1)
-
-                # Process frame
-                self.process_frame(frame)
+                self.current_image = frame
+                self.frame_id += 1
+                metrics.count("frames_captured")
 
                 # Update camera display
                 self.update_camera_display(frame)
 
         except Exception as e:
-            print(f"Video loop error: {e}")
+            metrics.error("capture", e)
             self.status_var.set(f"Error: {str(e)}")
 
-        # Schedule next frame
-        self.root.after(30, self.video_loop)
+    def run_inference(self):
+        """Inference task: process the newest frame, if it has not been seen"""
+        if self.current_image is None or self.frame_id == self.processed_frame_id:
+            return
+        # Frames captured since the last inference were never recognized
+        dropped = self.frame_id - self.processed_frame_id - 1
+        self.dropped_frames += dropped
+        metrics.count("frames_dropped", dropped)
+        self.processed_frame_id = self.frame_id
+        self.processed_frames += 1
+        metrics.frame_id = self.frame_id
+        try:
+            with metrics.stage("process_frame"):
+                self.process_frame(self.current_image)
+            metrics.count("frames_processed")
+            if self.record_path:
+                self.record_frame()
+        except Exception as e:
+            metrics.error("process_frame", e)
+            self.status_var.set(f"Error: {str(e)}")
+
+    def record_frame(self):
+        """Append what the detector saw on the last processed frame to the recording"""
+        if self.recorder is None:
+            height, width = self.current_image.shape[:2]
+            self.recorder = LandmarkRecorder(self.record_path, (width, height))
+            self.recording_started = time.perf_counter()
+            print(f"Recording landmarks to {self.record_path}")
+        hand = self.last_hand
+        timestamp = time.perf_counter() - self.recording_started
+        # Frames that were not recognized (motion-gated, no skeleton) are
+        # stored without a prediction rather than with a leftover symbol
+        if hand is None:
+            self.recorder.write(timestamp, prediction=self.last_prediction)
+        else:
+            self.recorder.write(timestamp, self.hand_pts, hand['bbox'],
+                                prediction=self.last_prediction, confidence=self.last_confidence)
+
+    def refresh_skeleton(self):
+        """Skeleton task: show the latest skeleton if it changed"""
+        if self.skeleton_dirty:
+            self.skeleton_dirty = False
+            metrics.frame_id = self.latest_skeleton_frame
+            self.update_skeleton_display(self.latest_skeleton)
+
+    def toggle_hud(self):
+        """Show or hide the performance overlay"""
+        if self.show_hud.get():
+            # The HUD reads stage histograms, so timing must be on while it shows
+            self.hud_restore_metrics = metrics.enabled
+            metrics.enable(True)
+            self.hud.reset()
+            self.scheduler.set_enabled("hud", True)
+        else:
+            self.scheduler.set_enabled("hud", False)
+            metrics.enable(self.hud_restore_metrics)
+            self.camera_panel.overlay = []
+            self.status_var.set("Ready")
+
+    def update_hud(self):
+        """HUD task: refresh the status bar and preview overlay"""
+        lines = self.hud.sample(
+            self.frame_id,
+            self.processed_frames,
+            self.dropped_frames,
+            {"frame": self.frame_id - self.processed_frame_id, "tts": self.speech.queue_depth()},
+        )
+        if lines:
+            self.status_var.set("   ".join(lines))
+            self.camera_panel.overlay = lines
+
+    def start_trace(self):
+        """Record per-frame stage spans for trace_seconds, then write them"""
+        metrics.enable(True)
+        metrics.tracer = TraceRecorder()
+        self.status_var.set(f"Tracing for {self.trace_seconds}s...")
+        self.trace_after_id = self.root.after(int(self.trace_seconds * 1000), self.finish_trace)
+
+    def finish_trace(self):
+        """Write the recorded spans as Chrome trace-event JSON"""
+        tracer, metrics.tracer = metrics.tracer, None
+        if tracer is None or not self.trace_path:
+            return
+        try:
+            count = tracer.write(self.trace_path)
+            message = f"Trace with {count} spans written to {self.trace_path}"
+        except OSError as e:
+            message = f"Could not write trace: {e}"
+        print(message)
+        self.status_var.set(message)
+        self.trace_path = None
+
+    def collect_metrics(self):
+        """Extra samples for the metrics endpoint (called on its thread)"""
+        families = [
+            ("dropped_frames", "gauge", "Frames captured but never processed",
+             [({}, self.dropped_frames)]),
+            ("tts_queue_depth", "gauge", "Speech requests waiting",
+             [({}, self.speech.queue_depth())]),
+        ]
+        cache = self.speech.audio_cache
+        if cache is not None:
+            families += [
+                ("audio_cache_lookups_total", "counter", "Audio cache lookups by result",
+                 [({"result": "hit"}, cache.hits), ({"result": "miss"}, cache.misses)]),
+                ("audio_cache_hit_ratio", "gauge", "Audio cache hit rate",
+                 [({}, cache.hit_rate)]),
+            ]
+        return families
 
     def process_frame(self, frame):
         """Process video frame for hand detection and prediction"""
-        hands = self.hd.findHands(frame, draw=False, flipType=True)
+        with metrics.stage("detect"):
+            hands = self.hd.findHands(frame, draw=False, flipType=True)
+        self.last_hand = hands[0] if hands and hands[0] else None
+        self.last_prediction = None
+        self.last_confidence = 0.0
 
         if hands and hands[0]:
+            metrics.count("hands_detected")
             hand = hands[0]
+            pts = as_array(hand['lmList'], self.hand_pts)
+            if self.hand_is_still(pts):
+                metrics.count("frames_gated")
+                return
+            if getattr(self.model, "uses_landmarks", False):
+                # Distilled landmark student: no skeleton render or CNN
+                self.predict_from_landmarks(pts)
+                return
+            if self.cascade is not None:
+                # Confident easy frames skip the skeleton render and the CNN
+                decision = self.cascade.decide(pts)
+                if decision is not None:
+                    self.last_confidence = self.cascade.last_confidence
+                    with metrics.stage("decode"):
+                        char = self.classify_gesture(*decision, None)
+                    self.update_character_tracking(char)
+                    return
             bbox = hand['bbox']
             x, y, w, h = bbox
 
             # Extract hand region
-            hand_region = frame[y - self.offset:y + h + self.offset, 
-                             x - self.offset:x + w + self.offset]
+            with metrics.stage("crop"):
+                hand_region = frame[y - self.offset:y + h + self.offset, 
+                                 x - self.offset:x + w + self.offset]
 
             if hand_region.size > 0:
                 # Create skeleton
-                skeleton = self.create_skeleton(hand_region, w, h)
+                with metrics.stage("render"):
+                    skeleton = self.create_skeleton(hand_region, w, h)
                 if skeleton is not None:
                     # Make prediction
                     self.predict_gesture(skeleton)
 
-                    # Update skeleton display
-                    self.update_skeleton_display(skeleton)
+                    # Hand the skeleton to the preview task
+                    self.latest_skeleton = skeleton
+                    self.latest_skeleton_frame = self.processed_frame_id
+                    self.skeleton_dirty = self.skeleton_panel is not None
         else:
+            self.gate_valid = False
             self.current_symbol = "No Hand Detected"
-            self.char_display.config(text=self.current_symbol)
+            self.last_prediction = self.current_symbol
+            self.char_text.set(self.current_symbol)
+
+    def hand_is_still(self, pts):
+        """Motion gate: True if the landmarks barely moved since the last recognized frame"""
+        if self.gate_px <= 0:
+            return False
+        if self.gate_valid and mean_motion(pts, self.gate_pts) < self.gate_px:
+            return True
+        self.gate_pts[...] = pts
+        self.gate_valid = True
+        return False
 
     def create_skeleton(self, hand_region, w, h):
         """Create hand skeleton from detected landmarks"""
@@ -294,109 +792,117 @@ class SignLanguageConverter:
                 white = cv2.imread("white.jpg")
 
             # Detect hands in the region
-            hands = self.hd2.findHands(hand_region, draw=False, flipType=True)
+            with metrics.stage("landmarks"):
+                hands = self.hd2.findHands(hand_region, draw=False, flipType=True)
 
             if hands and hands[0]:
                 hand = hands[0]
-                pts = hand['lmList']
-
-                # Calculate offset for centering
-                os = ((400 - w) // 2) - 15
-                os1 = ((400 - h) // 2) - 15
+                pts = as_array(hand['lmList'], self.crop_pts)
 
-                # Draw skeleton lines
-                self.draw_skeleton_lines(white, pts, os, os1)
+                # Offset every landmark onto the canvas in one step
+                os, os1 = skeleton_offset(w, h)
+                if self.skeleton_rasterizer is not None:
+                    self.skeleton_rasterizer(white, pts[:, :2] + (os, os1))
+                    return white
+                xy = offset_points(pts, os, os1)
 
-                # Draw landmarks
-                for i in range(21):
-                    cv2.circle(white, (pts[i][0] + os, pts[i][1] + os1), 
-                             3, (0, 0, 255), -1)
+                # Draw skeleton lines, then landmarks
+                draw_bones(white, xy)
+                draw_joints(white, xy)
 
                 return white
 
         except Exception as e:
-            print(f"Skeleton creation error: {e}")
+            metrics.error("render", e)
 
         return None
 
     def draw_skeleton_lines(self, image, pts, os, os1):
         """Draw skeleton lines connecting hand landmarks"""
-        # Finger connections
-        connections = [
-            (0, 4), (5, 8), (9, 12), (13, 16), (17, 20),  # Finger lines
-            (0, 5), (5, 9), (9, 13), (13, 17), (0, 17)    # Palm connections
-        ]
+        draw_bones(image, offset_points(pts, os, os1))
 
-        # Draw finger segments
-        for i in range(0, 4):
-            cv2.line(image, (pts[i][0] + os, pts[i][1] + os1),
-                    (pts[i + 1][0] + os, pts[i + 1][1] + os1), (0, 255, 0), 2)
+    def gesture_scores(self, skeleton):
+        """CNN class probabilities for a skeleton image"""
+        # One model reference per frame, see poll_model_swap
+        model = self.model
 
-        for start in range(5, 18, 4):
-            for i in range(start, start + 3):
-                cv2.line(image, (pts[i][0] + os, pts[i][1] + os1),
-                        (pts[i + 1][0] + os, pts[i + 1][1] + os1), (0, 255, 0), 2)
+        # Prepare image for prediction
+        with metrics.stage("preprocess"):
+            skeleton_rgb = cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB)
+            skeleton_input = skeleton_rgb.reshape(1, 400, 400, 3)
+            if not getattr(model, "accepts_pixels", False):
+                # int8 models from quantize.py take the uint8 pixels as-is
+                skeleton_input = skeleton_input.astype('float32') / 255.0
 
-        # Draw palm connections
-        palm_connections = [(5, 9), (9, 13), (13, 17), (0, 5), (0, 17)]
-        for start, end in palm_connections:
-            cv2.line(image, (pts[start][0] + os, pts[start][1] + os1),
-                    (pts[end][0] + os, pts[end][1] + os1), (0, 255, 0), 2)
+        with metrics.stage("infer"):
+            return model.predict(skeleton_input)[0]
+
+    def predict_from_landmarks(self, pts):
+        """Predict gesture with a landmark model (see distill.py)"""
+        try:
+            model = self.model
+            with metrics.stage("infer"):
+                prob = model.predict(pts[np.newaxis])[0]
+            with metrics.stage("decode"):
+                ch2, ch1 = np.argsort(prob)[-2:]
+                self.last_confidence = float(prob[ch1])
+                char = self.classify_gesture(ch1, ch2, None)
+            self.update_character_tracking(char)
+        except Exception as e:
+            metrics.error("predict_gesture", e)
 
     def predict_gesture(self, skeleton):
         """Predict gesture from skeleton image"""
         try:
-            # Prepare image for prediction
-            skeleton_rgb = cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB)
-            skeleton_input = skeleton_rgb.reshape(1, 400, 400, 3)
-            skeleton_input = skeleton_input.astype('float32') / 255.0
-
-            # Get predictions
-            prob = self.model.predict(skeleton_input)[0]
+            prob = self.gesture_scores(skeleton)
 
-            # Get top predictions
-            top_indices = np.argsort(prob)[-3:][::-1]
-            ch1, ch2, ch3 = top_indices[0], top_indices[1], top_indices[2]
+            with metrics.stage("decode"):
+                # Get top predictions
+                top_indices = np.argsort(prob)[-3:][::-1]
+                ch1, ch2, ch3 = top_indices[0], top_indices[1], top_indices[2]
+                self.last_confidence = float(prob[ch1])
 
-            # Apply gesture classification rules
-            predicted_char = self.classify_gesture(ch1, ch2, skeleton)
+                # Apply gesture classification rules
+                predicted_char = self.classify_gesture(ch1, ch2, skeleton)
 
-            # Update character tracking
+            # Update character tracking (timed by its own stages, not decode)
             self.update_character_tracking(predicted_char)
 
         except Exception as e:
-            print(f"Prediction error: {e}")
+            metrics.error("predict_gesture", e)
 
     def classify_gesture(self, ch1, ch2, skeleton):
         """Apply classification rules to determine final character"""
         # This is a simplified version of the original classification logic
         # You would implement the full gesture classification rules here
 
-        gesture_map = {
-            0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H'
-        }
+        # Label map comes from the model's registry metadata (A-H by default)
+        gesture_map = dict(enumerate(self.gesture_labels))
 
         return gesture_map.get(ch1, chr(65 + ch1) if ch1 < 26 else 'Unknown')
 
     def update_character_tracking(self, char):
         """Update character tracking and sentence building"""
+        self.last_prediction = char
         if char == self.prev_char:
             return
 
         self.current_symbol = char
-        self.char_display.config(text=char)
+        self.char_text.set(char)
 
         # Handle special characters
+        edit = None
         if char == 'Space':
-            if not self.text_sentence.endswith(' '):
-                self.text_sentence += ' '
+            edit = self.transcript.append_space()
+            if edit is not None:
                 self.update_word_suggestions()
+                self.stream_word(self.transcript.last_word)
         elif char not in ['Unknown', 'No Hand Detected']:
-            self.text_sentence += char
+            edit = self.transcript.append_char(char)
             self.update_word_suggestions()
 
         self.prev_char = char
-        self.update_sentence_display()
+        self.update_sentence_display(edit)
 
     def update_word_suggestions(self):
         """Update word suggestions based on current input"""
@@ -404,106 +910,116 @@ class SignLanguageConverter:
             return
 
         try:
-            # Get current word
-            words = self.text_sentence.strip().split()
-            if words:
-                current_word = words[-1].lower()
-
-                # Get suggestions
-                suggestions = []
-                if len(current_word) > 0:
-                    # Try to get suggestions from dictionary
-                    if not self.dictionary.check(current_word):
-                        suggestions = self.dictionary.suggest(current_word)[:4]
-                    else:
-                        suggestions = [current_word]
-
-                # Update suggestion buttons
-                for i, btn in enumerate(self.suggestion_buttons):
-                    if i < len(suggestions):
-                        btn.config(text=suggestions[i], state='normal')
-                    else:
-                        btn.config(text="", state='disabled')
-
-                self.word_suggestions = suggestions + [""] * (4 - len(suggestions))
-
+            with metrics.stage("suggest"):
+                self._refresh_suggestions()
         except Exception as e:
-            print(f"Suggestion error: {e}")
+            metrics.error("suggest", e)
+
+    def _refresh_suggestions(self):
+        """Look up the current word and fill the suggestion buttons"""
+        # Get current word
+        current_word = self.transcript.last_word.lower()
+        if not current_word:
+            return
+
+        # Try to get suggestions from dictionary
+        if not self.dictionary.check(current_word):
+            suggestions = self.dictionary.suggest(current_word)[:4]
+        else:
+            suggestions = [current_word]
+
+        # Update suggestion buttons
+        for i, btn in enumerate(self.suggestion_buttons):
+            if i < len(suggestions):
+                btn.config(text=suggestions[i], state='normal')
+            else:
+                btn.config(text="", state='disabled')
+
+        self.word_suggestions = suggestions + [""] * (4 - len(suggestions))
 
     def apply_suggestion(self, index):
         """Apply selected word suggestion"""
         if index < len(self.word_suggestions) and self.word_suggestions[index]:
-            words = self.text_sentence.strip().split()
-            if words:
-                words[-1] = self.word_suggestions[index].upper()
-                self.text_sentence = ' '.join(words) + ' '
-                self.update_sentence_display()
+            edit = self.transcript.replace_last_word(self.word_suggestions[index].upper())
+            self.update_sentence_display(edit)
+            if edit is not None:
+                self.stream_word(self.transcript.last_word)
 
     def update_camera_display(self, frame):
         """Update camera display in GUI"""
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_resized = cv2.resize(frame_rgb, (640, 480))
-
-            image = Image.fromarray(frame_resized)
-            photo = ImageTk.PhotoImage(image=image)
-
-            self.camera_label.config(image=photo, text="")
-            self.camera_label.image = photo
-
+            with metrics.stage("display_camera"):
+                self.camera_panel.show(frame)
         except Exception as e:
-            print(f"Camera display error: {e}")
+            metrics.error("display_camera", e)
 
     def update_skeleton_display(self, skeleton):
         """Update skeleton display in GUI"""
         try:
-            skeleton_rgb = cv2.cvtColor(skeleton, cv2.COLOR_BGR2RGB)
-            skeleton_resized = cv2.resize(skeleton_rgb, (300, 300))
-
-            image = Image.fromarray(skeleton_resized)
-            photo = ImageTk.PhotoImage(image=image)
-
-            self.skeleton_label.config(image=photo, text="")
-            self.skeleton_label.image = photo
-
+            with metrics.stage("display_skeleton"):
+                self.skeleton_panel.show(skeleton)
         except Exception as e:
-            print(f"Skeleton display error: {e}")
+            metrics.error("display_skeleton", e)
 
-    def update_sentence_display(self):
-        """Update the sentence display"""
-        self.sentence_display.delete(1.0, tk.END)
-        self.sentence_display.insert(tk.END, self.text_sentence)
+    def update_sentence_display(self, edit):
+        """Apply a transcript edit to the sentence display"""
+        self.sentence_sink.apply(edit)
 
     def speak_text(self):
         """Convert text to speech"""
-        if self.text_sentence.strip():
-            try:
-                # Run in separate thread to avoid blocking GUI
-                def speak():
-                    self.speak_engine.say(self.text_sentence)
-                    self.speak_engine.runAndWait()
-
-                thread = threading.Thread(target=speak)
-                thread.daemon = True
-                thread.start()
-
+        text = self.transcript.text
+        if text.strip():
+            request = self.speech.speak(text, on_done=self.on_speech_done)
+            if request is None:
+                self.status_var.set("Speech queue full - try again shortly")
+            else:
                 self.status_var.set("Speaking...")
-                self.root.after(3000, lambda: self.status_var.set("Ready"))
-
-            except Exception as e:
-                print(f"Speech error: {e}")
-                messagebox.showerror("Error", "Speech synthesis failed")
         else:
             messagebox.showinfo("Info", "No text to speak")
 
+    def stream_word(self, word):
+        """Streaming mode: speak a completed word right away"""
+        if word and self.stream_speech.get():
+            self.speech.speak(word, on_start=self.on_stream_word_started, coalesce=False)
+
+    def on_stream_word_started(self, request):
+        """Record word-completion-to-audio-start latency"""
+        self.stream_latencies.append(request.start_latency)
+        metrics.observe("tts_word_latency", request.start_latency * 1000.0)
+        ordered = sorted(self.stream_latencies)
+        median = ordered[len(ordered) // 2]
+        self.status_var.set(
+            f"Speaking '{request.text}' - latency {request.start_latency * 1000:.0f} ms "
+            f"(median {median * 1000:.0f} ms over {len(ordered)} words)"
+        )
+
+    def stop_speech(self):
+        """Cancel queued and in-progress speech"""
+        self.speech.cancel()
+
+    def on_speech_done(self, request, error):
+        """Speech worker finished (or dropped) a request"""
+        if error is not None:
+            print(f"Speech error: {error}")
+            self.status_var.set("Speech synthesis failed")
+        elif request.cancelled:
+            self.status_var.set("Speech stopped")
+        elif not self.speech.busy:
+            self.status_var.set("Ready")
+
+    def poll_speech_events(self):
+        """Run pending speech callbacks on the GUI thread"""
+        self.speech.dispatch_events()
+        self.root.after(50, self.poll_speech_events)
+
     def clear_text(self):
         """Clear all text"""
-        self.text_sentence = ""
+        edit = self.transcript.clear()
         self.current_symbol = "Ready"
         self.word_suggestions = ["", "", "", ""]
 
-        self.update_sentence_display()
-        self.char_display.config(text=self.current_symbol)
+        self.update_sentence_display(edit)
+        self.char_text.set(self.current_symbol)
 
         for btn in self.suggestion_buttons:
             btn.config(text="", state='disabled')
@@ -512,8 +1028,39 @@ class SignLanguageConverter:
 
     def cleanup(self):
         """Clean up resources before closing"""
+        if getattr(self, 'closed', False):
+            return
+        self.closed = True
         try:
-            if hasattr(self, 'vs') and self.vs.isOpened():
+            if hasattr(self, 'scheduler'):
+                self.scheduler.stop()
+            self.finish_trace()
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+                self.metrics_server = None
+            if metrics.enabled and self.metrics_out:
+                print(metrics.report())
+                if metrics.memory is not None:
+                    print(metrics.memory.report())
+                metrics.dump_json(self.metrics_out)
+                print(f"Stage metrics written to {self.metrics_out}")
+                self.metrics_out = None
+            if getattr(self, 'stream_latencies', None):
+                ordered = sorted(self.stream_latencies)
+                print(f"Streaming speech latency over {len(ordered)} words: "
+                      f"median {ordered[len(ordered) // 2] * 1000:.0f} ms, "
+                      f"max {ordered[-1] * 1000:.0f} ms")
+            if hasattr(self, 'speech'):
+                self.speech.stop()
+                if self.speech.audio_cache is not None:
+                    print(self.speech.audio_cache.report())
+                    self.speech.audio_cache.save_index()
+            if getattr(self, 'recorder', None) is not None:
+                self.recorder.close()
+                print(f"Recorded {self.recorder.frames} frames to {self.record_path}")
+            if self.model_cache_build is not None:
+                self.model_cache_build.reap()
+            if getattr(self, 'vs', None) is not None and self.vs.isOpened():
                 self.vs.release()
             cv2.destroyAllWindows()
         except:
@@ -533,14 +1080,84 @@ class SignLanguageConverter:
 
 def main():
     """Main function to run the application"""
+    launch_time = time.perf_counter()
     print("Starting Sign Language to Speech Converter...")
     print("Make sure you have:")
     print("1. A webcam connected")
     print("2. The model file 'cnn8grps_rad1_model.h5' in the same directory")
     print("3. All required packages installed")
 
+    parser = argparse.ArgumentParser(description="Sign Language to Speech Converter")
+    parser.add_argument("--display-ms", type=int, default=30, help="camera preview interval")
+    parser.add_argument("--skeleton-ms", type=int, default=100, help="skeleton preview interval")
+    parser.add_argument("--inference-ms", type=int, default=30, help="minimum inference interval")
+    parser.add_argument("--kiosk", action="store_true", help="hide the skeleton preview")
+    parser.add_argument("--profile", action="store_true", help="record per-stage latency histograms")
+    parser.add_argument("--metrics-out", default="stage_metrics.json",
+                        help="where --profile writes its JSON on exit")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="serve Prometheus metrics on this port (0 = off)")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                        help="address for --metrics-port (localhost by default)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="record a Chrome trace-event JSON of per-frame stages")
+    parser.add_argument("--trace-seconds", type=float, default=30,
+                        help="how long --trace records")
+    parser.add_argument("--gate-px", type=float, default=0,
+                        help="skip recognition while the hand moves less than this many pixels (0 = off)")
+    parser.add_argument("--memprofile", action="store_true",
+                        help="attribute allocations to stages with tracemalloc (slow)")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="exit as soon as startup completes and print its timings")
+    parser.add_argument("--no-model-cache", action="store_true",
+                        help="always load the .h5 model instead of the converted cache")
+    parser.add_argument("--models", metavar="DIR",
+                        help="load the newest model from this registry; F5 swaps in newer versions")
+    parser.add_argument("--cascade", metavar="CLASSIFIER",
+                        help="try this landmark classifier (from cascade.py --fit) before the CNN")
+    parser.add_argument("--cascade-margin", type=float, default=DEFAULT_MARGIN,
+                        help="top-1 margin below which the cascade falls back to the CNN")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record detected landmarks and predictions to a .lmk file")
+    parser.add_argument("--watch-models", type=float, default=0, metavar="SECONDS",
+                        help="check --models this often and swap in new versions automatically")
+    parser.add_argument("--jit-render", action="store_true",
+                        help="draw skeletons with the compiled rasterizer (geometry_kernels.py)")
+    args, _ = parser.parse_known_args()
+    metrics.enable(args.profile or args.metrics_port > 0)
+    if args.memprofile:
+        metrics.enable_memory_profiling(MemoryProfiler())
+
+    server = None
+    if args.metrics_port:
+        try:
+            server = MetricsServer(metrics, args.metrics_host, args.metrics_port).start()
+            print(f"Metrics at http://{args.metrics_host}:{server.port}/metrics")
+        except OSError as e:
+            print(f"Metrics endpoint disabled: {e}")
+            server = None
+
     try:
-        app = SignLanguageConverter()
+        app = SignLanguageConverter(
+            display_ms=args.display_ms,
+            skeleton_ms=args.skeleton_ms,
+            inference_ms=args.inference_ms,
+            show_skeleton=not args.kiosk,
+            metrics_out=args.metrics_out,
+            metrics_server=server,
+            trace_path=args.trace,
+            trace_seconds=args.trace_seconds,
+            gate_px=args.gate_px,
+            launch_time=launch_time,
+            exit_when_ready=args.startup_benchmark,
+            use_model_cache=not args.no_model_cache,
+            model_registry=args.models,
+            watch_models_s=args.watch_models,
+            cascade_path=args.cascade,
+            cascade_margin=args.cascade_margin,
+            record_path=args.record,
+            jit_render=args.jit_render,
+        )
         app.run()
     except Exception as e:
         print(f"Failed to start application: {e}")
@@ -0,0 +1,58 @@
+"""
+Skeleton Rendering
+The drawing behind SignLanguageConverter.create_skeleton, usable
+without the app or a detector (training, calibration, benchmarks).
+Everything that feeds the CNN must draw through here so the images
+match what the app produces.
+"""
+
+import cv2
+import numpy as np
+
+SIZE = 400
+
+# Consecutive landmarks joined along each finger
+FINGER_SEGMENTS = [(i, i + 1) for i in range(0, 4)] + \
+                  [(i, i + 1) for start in range(5, 18, 4) for i in range(start, start + 3)]
+PALM_SEGMENTS = [(5, 9), (9, 13), (13, 17), (0, 5), (0, 17)]
+
+
+def skeleton_offset(w, h):
+    """Shift that centres a w x h hand crop on the 400x400 canvas"""
+    return ((SIZE - w) // 2) - 15, ((SIZE - h) // 2) - 15
+
+
+def offset_points(pts, os, os1):
+    """Canvas positions of (21, ≥2) landmarks as int tuples, offset in one step"""
+    xy = np.asarray(pts)[:, :2] + (os, os1)
+    return list(map(tuple, xy.tolist()))
+
+
+def draw_bones(image, xy):
+    """Green finger and palm lines between canvas positions xy"""
+    for start, end in FINGER_SEGMENTS + PALM_SEGMENTS:
+        cv2.line(image, xy[start], xy[end], (0, 255, 0), 2)
+
+
+def draw_joints(image, xy):
+    """Red dot on every landmark"""
+    for point in xy:
+        cv2.circle(image, point, 3, (0, 0, 255), -1)
+
+
+def draw_skeleton(image, pts, os, os1):
+    """Bones then joints for crop-relative landmarks pts"""
+    xy = offset_points(pts, os, os1)
+    draw_bones(image, xy)
+    draw_joints(image, xy)
+
+
+def render_skeleton(pts, w, h, out=None):
+    """White 400x400 BGR skeleton image for crop-relative landmarks"""
+    if out is None:
+        out = np.full((SIZE, SIZE, 3), 255, np.uint8)
+    else:
+        out.fill(255)
+    os, os1 = skeleton_offset(w, h)
+    draw_skeleton(out, pts, os, os1)
+    return out
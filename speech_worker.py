@@ -0,0 +1,271 @@
+"""
+Speech Worker
+A single long-lived thread that owns the pyttsx3 engine and speaks queued text
+"""
+
+import collections
+import itertools
+import queue
+import threading
+import time
+
+from audio_cache import play_wav
+from instrumentation import metrics
+
+# Event kinds posted by the worker, see SpeechWorker.dispatch_events
+STARTED = "started"
+DONE = "done"
+ERROR = "error"
+
+
+class SpeechRequest:
+    """One queued utterance"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text, on_done=None, on_start=None):
+        self.id = next(self._ids)
+        self.text = text
+        self.on_done = on_done
+        self.on_start = on_start
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.cancelled = False
+
+    @property
+    def start_latency(self):
+        """Seconds from submission to audio start, None if never started"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+
+class SpeechWorker:
+    """Serializes all speech through one engine on one thread
+
+    pyttsx3 engines are not thread-safe, so the engine is created and used
+    only inside the worker thread. Callbacks are not run on that thread:
+    the GUI calls dispatch_events() periodically and they run there.
+    """
+
+    # Seconds without requests before idle pre-rendering starts
+    IDLE_SECONDS = 2.0
+
+    def __init__(self, rate=120, voice_index=0, maxsize=8, engine_factory=None, audio_cache=None):
+        self.rate = rate
+        self.voice_index = voice_index
+        self.maxsize = maxsize
+        self.engine_factory = engine_factory
+        self.audio_cache = audio_cache
+        self.events = queue.Queue()
+        self._prerender = []
+
+        self._pending = collections.deque()
+        self._cond = threading.Condition()
+        self._current = None
+        self._cancel = False
+        self._running = False
+        self._thread = None
+        self.engine = None
+
+    # -- GUI side ---------------------------------------------------------
+
+    def start(self):
+        """Start the worker thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="speech-worker", daemon=True)
+        self._thread.start()
+
+    def speak(self, text, on_done=None, on_start=None, coalesce=True):
+        """Queue text; returns the request, or None if dropped
+
+        With coalesce, a request whose text matches the utterance already
+        playing or the last one pending is merged into it instead of being
+        queued again.
+        """
+        text = text.strip()
+        if not text:
+            return None
+        with self._cond:
+            last = self._pending[-1] if self._pending else self._current
+            if coalesce and last is not None and last.text == text and not last.cancelled:
+                return last
+            if len(self._pending) >= self.maxsize:
+                return None
+            request = SpeechRequest(text, on_done=on_done, on_start=on_start)
+            self._pending.append(request)
+            self._cond.notify()
+        return request
+
+    def cancel(self):
+        """Drop pending requests and stop the utterance in progress"""
+        with self._cond:
+            dropped = list(self._pending)
+            self._pending.clear()
+            if self._current is not None:
+                self._current.cancelled = True
+                self._cancel = True
+        for request in dropped:
+            request.cancelled = True
+            self.events.put((DONE, request, None))
+
+    @property
+    def busy(self):
+        """True while speaking or with requests waiting"""
+        with self._cond:
+            return self._current is not None or bool(self._pending)
+
+    def prerender_idle(self, phrases):
+        """Render uncached phrases into the audio cache while idle"""
+        if self.audio_cache is None:
+            return
+        with self._cond:
+            self._prerender = list(reversed(self.audio_cache.missing(phrases)))
+            self._cond.notify()
+
+    def queue_depth(self):
+        """Number of requests waiting behind the current one"""
+        with self._cond:
+            return len(self._pending)
+
+    def dispatch_events(self):
+        """Run callbacks for events posted by the worker (call from the GUI thread)"""
+        while True:
+            try:
+                kind, request, error = self.events.get_nowait()
+            except queue.Empty:
+                return
+            callback = request.on_start if kind == STARTED else request.on_done
+            if callback is None:
+                continue
+            try:
+                if kind == STARTED:
+                    callback(request)
+                else:
+                    callback(request, error)
+            except Exception as e:
+                print(f"Speech callback error: {e}")
+
+    def stop(self, timeout=1.0):
+        """Cancel everything and stop the worker thread"""
+        self.cancel()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -- worker side ------------------------------------------------------
+
+    def _create_engine(self):
+        """Create and configure the engine (worker thread only)"""
+        if self.engine_factory is not None:
+            engine = self.engine_factory()
+        else:
+            import pyttsx3
+            engine = pyttsx3.init()
+        engine.setProperty("rate", self.rate)
+        voices = engine.getProperty("voices")
+        if voices and self.voice_index < len(voices):
+            engine.setProperty("voice", voices[self.voice_index].id)
+        engine.connect("started-utterance", self._on_engine_start)
+        engine.connect("started-word", self._on_engine_word)
+        return engine
+
+    def _on_engine_start(self, name):
+        """pyttsx3 callback: audio for the current utterance has begun"""
+        request = self._current
+        if request is not None and request.started_at is None:
+            request.started_at = time.monotonic()
+            metrics.observe("tts_start_latency", request.start_latency * 1000.0)
+            self.events.put((STARTED, request, None))
+
+    def _on_engine_word(self, name, location, length):
+        """pyttsx3 callback: checks for cancellation between words"""
+        if self._cancel:
+            self.engine.stop()
+
+    def _next_request(self):
+        """Block until a request is available or the worker is stopped
+
+        While waiting, pre-renders one cached phrase each time the queue
+        has been idle for IDLE_SECONDS.
+        """
+        while True:
+            with self._cond:
+                if not self._running:
+                    return None
+                if self._pending:
+                    self._current = self._pending.popleft()
+                    self._cancel = False
+                    return self._current
+                if not self._prerender:
+                    self._cond.wait()
+                    continue
+                if self._cond.wait(self.IDLE_SECONDS):
+                    continue
+                phrase = self._prerender.pop()
+            self._render_idle(phrase)
+
+    def _render_idle(self, phrase):
+        """Add one phrase to the audio cache (worker thread only)"""
+        if self.engine is None:
+            return
+        try:
+            self.audio_cache.render(self.engine, phrase)
+            if not self._prerender:
+                self.audio_cache.save_index()
+        except Exception as e:
+            print(f"Audio cache render error: {e}")
+
+    def _play_cached(self, request):
+        """Play a cached clip for the request; False means synthesize live"""
+        if self.audio_cache is None:
+            return False
+        path = self.audio_cache.lookup(request.text)
+        if path is None:
+            return False
+        playback = play_wav(path)
+        if playback is None:
+            return False
+        self._on_engine_start(None)
+        while playback.is_playing():
+            if self._cancel:
+                playback.stop()
+                break
+            time.sleep(0.01)
+        return True
+
+    def _run(self):
+        try:
+            self.engine = self._create_engine()
+        except Exception as e:
+            print(f"Speech engine error: {e}")
+            self.engine = None
+
+        while True:
+            request = self._next_request()
+            if request is None:
+                break
+            error = None
+            try:
+                if self._play_cached(request):
+                    source = "cache"
+                else:
+                    source = "live"
+                    if self.engine is None:
+                        raise RuntimeError("Speech engine not available")
+                    self.engine.say(request.text)
+                    self.engine.runAndWait()
+                if self.audio_cache is not None and request.start_latency is not None:
+                    self.audio_cache.record_latency(source, request.start_latency)
+            except Exception as e:
+                error = e
+            request.finished_at = time.monotonic()
+            with self._cond:
+                self._current = None
+            self.events.put((ERROR if error else DONE, request, error))
@@ -0,0 +1,81 @@
+"""
+Parallel Startup
+Runs slow initialization steps (model load, detectors, dictionary,
+camera) on background threads while the window is already visible.
+Results are collected by polling from the Tk thread, so no widget is
+ever touched off the GUI thread.
+"""
+
+import threading
+import time
+
+
+class StartupTask:
+    """One initialization step running on its own thread"""
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.reported = False
+        self.thread = threading.Thread(target=self._run, name=f"init-{name}", daemon=True)
+
+    def _run(self):
+        self.started_at = time.perf_counter()
+        try:
+            self.result = self.fn()
+        except Exception as e:
+            self.error = e
+        self.finished_at = time.perf_counter()
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    @property
+    def seconds(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class ParallelStartup:
+    """Starts all tasks at once; poll() hands back the ones that finished"""
+
+    def __init__(self):
+        self.tasks = []
+        self.started_at = None
+
+    def add(self, name, fn):
+        task = StartupTask(name, fn)
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        for task in self.tasks:
+            task.thread.start()
+
+    def poll(self):
+        """Tasks that finished since the last poll (call from the GUI thread)"""
+        finished = []
+        for task in self.tasks:
+            if task.done and not task.reported:
+                task.reported = True
+                finished.append(task)
+        return finished
+
+    @property
+    def completed(self):
+        return sum(1 for task in self.tasks if task.done)
+
+    @property
+    def all_done(self):
+        return all(task.done for task in self.tasks)
+
+    def timings(self):
+        """Seconds per task, for the startup benchmark"""
+        return {task.name: task.seconds for task in self.tasks}
@@ -0,0 +1,36 @@
+"""Registry round trips: register a model file, then load it back"""
+
+import numpy as np
+
+from landmark_classifier import FEATURE_SIZE, LandmarkClassifier
+from model_registry import DEFAULT_LABELS, ModelRegistry
+
+
+def write_student(path, classes=len(DEFAULT_LABELS), hidden=8, seed=0):
+    """Landmark-MLP student with random weights, as distill.py saves one"""
+    rng = np.random.default_rng(seed)
+    weights = [rng.standard_normal((FEATURE_SIZE, hidden)), rng.standard_normal((hidden, classes))]
+    biases = [np.zeros(hidden), np.zeros(classes)]
+    LandmarkClassifier(weights, biases, np.zeros(FEATURE_SIZE), np.ones(FEATURE_SIZE),
+                       DEFAULT_LABELS[:classes]).save(path)
+    return path
+
+
+def test_register_and_load_landmark_student(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"))
+    entry = registry.register(write_student(str(tmp_path / "student.npz")))
+
+    assert entry.backend == "landmark"
+    assert entry.input_size == (21, 3)
+    model = registry.load(registry.latest())
+    prob = model.predict(np.zeros((1, 21, 3), np.int32))
+    assert prob.shape == (1, len(DEFAULT_LABELS))
+
+
+def test_load_landmark_student_with_image_input_size(tmp_path):
+    # Entries registered before the backend-specific default recorded 400x400x3
+    registry = ModelRegistry(str(tmp_path / "models"))
+    registry.register(write_student(str(tmp_path / "student.npz")), input_size=(400, 400, 3))
+
+    model = registry.load(registry.latest())
+    assert model.uses_landmarks
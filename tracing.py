@@ -0,0 +1,88 @@
+"""
+Frame Tracing
+Records per-frame stage spans into a preallocated ring and exports them
+as Chrome trace-event JSON (open in Perfetto or chrome://tracing).
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+
+DEFAULT_CAPACITY = 262144
+
+
+class TraceRecorder:
+    """Fixed-capacity ring of spans stored in typed arrays
+
+    record() only writes numbers into arrays allocated up front, so
+    tracing adds no per-span objects in the hot path. When the ring is
+    full the oldest spans are overwritten.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.start = array("d", bytes(8 * capacity))
+        self.duration = array("d", bytes(8 * capacity))
+        self.name_id = array("l", bytes(array("l").itemsize * capacity))
+        self.frame = array("q", bytes(8 * capacity))
+        self.thread = array("Q", bytes(8 * capacity))
+        self.names = []
+        self._name_ids = {}
+        self._thread_names = {}
+        self.written = 0
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def _intern(self, name):
+        index = self._name_ids.get(name)
+        if index is None:
+            index = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def record(self, name, start, end, frame_id):
+        """Store one span (perf_counter seconds)"""
+        slot = self.written % self.capacity
+        self.start[slot] = start
+        self.duration[slot] = end - start
+        self.name_id[slot] = self._intern(name)
+        self.frame[slot] = frame_id
+        tid = threading.get_native_id()  # OS thread id, as profilers show it
+        self.thread[slot] = tid
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self.written += 1
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def events(self):
+        """Chrome trace events, oldest first"""
+        count = len(self)
+        first = self.written - count
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                   "args": {"name": "signconv"}}]
+        for tid, name in self._thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": self.pid,
+                           "tid": tid, "args": {"name": name}})
+        for i in range(first, self.written):
+            slot = i % self.capacity
+            events.append({
+                "name": self.names[self.name_id[slot]],
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": round((self.start[slot] - self.origin) * 1e6, 3),
+                "dur": round(self.duration[slot] * 1e6, 3),
+                "pid": self.pid,
+                "tid": self.thread[slot],
+                "args": {"frame": self.frame[slot]},
+            })
+        return events
+
+    def write(self, path):
+        """Write a Chrome trace-event JSON file"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        return len(self)
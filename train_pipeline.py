@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Streaming Training Pipeline
+Trains the gesture CNN straight from landmark recordings, without
+writing skeleton images to disk:
+
+  memory-mapped .lmk/.npz records
+    -> worker processes render 400x400 skeletons on the fly (skeleton.py,
+       the same drawing as the app) with augmentation: per-landmark
+       jitter, rotation and scale about the hand centre
+    -> tf.data.Dataset.from_generator, scaled to [0, 1], prefetched
+    -> model.fit
+
+Rendering runs in a process pool (cv2 drawing is CPU-bound and mostly
+holds the GIL), so throughput scales with cores rather than disk: the
+records are a few hundred bytes per frame and stay in the page cache.
+
+Usage:
+  python train_pipeline.py SESSION.lmk [...] [--epochs 5] [--workers N] [--out retrained.h5] [--register]
+  python train_pipeline.py SESSION.lmk --throughput     (samples/sec by worker count, no training)
+
+Recorded labels map to model outputs through --labels (default the
+registry's A..H); frames with other labels or no hand are skipped.
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from skeleton import SIZE, render_skeleton
+
+OFFSET = 29
+
+_stores = {}
+
+
+def _open(path):
+    """Per-process cache of opened recordings (memory-mapped for .lmk)"""
+    if path not in _stores:
+        from replay import load_recording
+        _stores[path] = load_recording(path)
+    return _stores[path]
+
+
+class SampleIndex:
+    """(recording, row, class) for every usable frame"""
+
+    def __init__(self, paths, labels):
+        self.paths = list(paths)
+        files, rows, classes = [], [], []
+        index = {name: i for i, name in enumerate(labels)}
+        for file_id, path in enumerate(self.paths):
+            recording = _open(path)
+            if recording.labels is None:
+                print(f"Skipping {path}: no labels")
+                continue
+            has_hand = np.asarray(recording.bbox)[:, 2] > 0
+            for row, label in enumerate(recording.labels):
+                if has_hand[row] and str(label) in index:
+                    files.append(file_id)
+                    rows.append(row)
+                    classes.append(index[str(label)])
+        self.files = np.array(files, np.int32)
+        self.rows = np.array(rows, np.int64)
+        self.classes = np.array(classes, np.int32)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def split(self, holdout, seed=0):
+        """Shuffled (train, validation) position arrays"""
+        order = np.random.default_rng(seed).permutation(len(self))
+        cut = int(len(order) * (1 - holdout))
+        return order[:cut], order[cut:]
+
+
+def augment_landmarks(pts, rng, jitter=2.0, rotation=15.0, scale=(0.85, 1.15)):
+    """Jitter, rotate and scale (21, 2) points about the hand centre"""
+    centre = pts.mean(axis=0)
+    angle = math.radians(rng.uniform(-rotation, rotation))
+    factor = rng.uniform(*scale)
+    c, s = math.cos(angle) * factor, math.sin(angle) * factor
+    moved = (pts - centre) @ np.array([[c, s], [-s, c]]) + centre
+    return moved + rng.normal(0.0, jitter, moved.shape)
+
+
+def render_sample(landmarks, bbox, rng=None, out=None):
+    """Skeleton for one recorded hand, optionally augmented
+
+    Landmarks are made crop-relative the way the app's second detector
+    sees them (bbox origin minus OFFSET), then drawn with skeleton.py.
+    """
+    x, y, w, h = (int(v) for v in bbox)
+    pts = np.asarray(landmarks, np.float64)[:, :2] - (x - OFFSET, y - OFFSET)
+    if rng is not None:
+        pts = augment_landmarks(pts, rng)
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        w, h = int(hi[0] - lo[0]), int(hi[1] - lo[1])
+    return render_skeleton(np.rint(pts).astype(np.int32), w, h, out)
+
+
+def render_batch(job):
+    """Worker: render a batch of (path, row) samples into uint8 RGB images"""
+    paths, files, rows, seed, augment = job
+    rng = np.random.default_rng(seed) if augment else None
+    images = np.empty((len(rows), SIZE, SIZE, 3), np.uint8)
+    for i, (file_id, row) in enumerate(zip(files, rows)):
+        recording = _open(paths[file_id])
+        render_sample(recording.landmarks[row], recording.bbox[row], rng, images[i])
+    # BGR drawing -> RGB model input, as predict_gesture does
+    return images[..., ::-1]
+
+
+def batches(index, positions, batch_size, workers, augment, seed=0, epochs=None):
+    """(images uint8, classes) batches, rendered ahead by a process pool"""
+
+    def jobs():
+        epoch = 0
+        while epochs is None or epoch < epochs:
+            order = np.random.default_rng(seed + epoch).permutation(positions) if augment else positions
+            for b in range(0, len(order), batch_size):
+                chosen = order[b:b + batch_size]
+                yield (index.paths, index.files[chosen], index.rows[chosen],
+                       seed * 100003 + epoch * 1009 + b, augment), index.classes[chosen]
+            epoch += 1
+
+    labelled = jobs()
+    pending = []
+    with multiprocessing.Pool(workers) as pool:
+        # Keep every worker busy: 2 batches in flight per worker
+        for job, classes in labelled:
+            pending.append((pool.apply_async(render_batch, (job,)), classes))
+            if len(pending) >= workers * 2:
+                result, classes = pending.pop(0)
+                yield result.get(), classes
+        for result, classes in pending:
+            yield result.get(), classes
+
+
+def make_dataset(index, positions, batch_size, workers, augment, seed=0):
+    """Endless tf.data pipeline: rendered batches, scaled to [0, 1], prefetched"""
+    import tensorflow as tf
+
+    signature = (tf.TensorSpec((None, SIZE, SIZE, 3), tf.uint8), tf.TensorSpec((None,), tf.int32))
+    dataset = tf.data.Dataset.from_generator(
+        lambda: batches(index, positions, batch_size, workers, augment, seed), output_signature=signature)
+    dataset = dataset.map(lambda images, classes: (tf.cast(images, tf.float32) / 255.0, classes),
+                          num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def measure_throughput(index, batch_size, max_workers, seconds=10.0):
+    """Rendered samples/sec for 1..max_workers workers"""
+    positions = np.arange(len(index))
+    results = {}
+    counts = sorted({min(2 ** i, max_workers) for i in range(max_workers.bit_length() + 1)})
+    for workers in counts:
+        start = time.perf_counter()
+        samples = 0
+        for images, _ in batches(index, positions, batch_size, workers, augment=True):
+            samples += len(images)
+            if time.perf_counter() - start > seconds:
+                break
+        results[workers] = samples / (time.perf_counter() - start)
+        print(f"  {workers:2d} workers: {results[workers]:8.1f} samples/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the CNN from landmark recordings")
+    parser.add_argument("sessions", nargs="*", help=".lmk/.npz labelled landmark recordings")
+    parser.add_argument("--synthetic", action="store_true", help="add a generated session")
+    parser.add_argument("--model", default="cnn8grps_rad1_model.h5", help="model to fine-tune")
+    parser.add_argument("--labels", help="comma-separated output labels (default A..H)")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--holdout", type=float, default=0.1)
+    parser.add_argument("--lr", type=float, default=1e-4)
+    parser.add_argument("--out", default="retrained.h5")
+    parser.add_argument("--register", action="store_true", help="add the trained model to the registry")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--throughput", action="store_true", help="only measure rendering throughput")
+    args = parser.parse_args()
+
+    from model_registry import DEFAULT_LABELS
+    labels = args.labels.split(",") if args.labels else DEFAULT_LABELS
+
+    paths = list(args.sessions)
+    if args.synthetic:
+        # Workers open recordings by path, so write the generated one out
+        from landmark_store import convert_recording
+        from replay import synthetic_session
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "synthetic_session.lmk")
+        convert_recording(synthetic_session(letters="ABCDEFGH"), path)
+        paths.append(path)
+    if not paths:
+        parser.error("give at least one recording or --synthetic")
+
+    index = SampleIndex(paths, labels)
+    print(f"{len(index)} labelled hand frames in {len(paths)} recordings")
+    if len(index) == 0:
+        return 1
+    if args.throughput:
+        print(f"Rendering throughput (batch {args.batch_size}, augmented):")
+        measure_throughput(index, args.batch_size, args.workers)
+        return 0
+
+    from keras.models import load_model
+    import tensorflow as tf
+
+    train, val = index.split(args.holdout)
+    model = load_model(args.model)
+    model.compile(optimizer=tf.keras.optimizers.Adam(args.lr),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    steps = max(1, math.ceil(len(train) / args.batch_size))
+    val_steps = max(1, math.ceil(len(val) / args.batch_size)) if len(val) else None
+    model.fit(make_dataset(index, train, args.batch_size, args.workers, augment=True),
+              steps_per_epoch=steps, epochs=args.epochs,
+              validation_data=make_dataset(index, val, args.batch_size, 1, augment=False) if val_steps else None,
+              validation_steps=val_steps)
+    model.save(args.out)
+    print(f"Model written to {args.out}")
+
+    if args.register:
+        from model_registry import ModelRegistry
+        entry = ModelRegistry(args.models).register(
+            args.out, backend="keras", labels=labels,
+            notes=f"fine-tuned from {os.path.basename(args.model)} on {len(train)} frames")
+        print(f"Registered as v{entry.version} in {entry.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
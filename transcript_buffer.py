@@ -0,0 +1,131 @@
+"""
+Transcript Buffer
+Incrementally tracked sentence text that reports small edits for the GUI
+"""
+
+import tkinter as tk
+
+# Edit kinds returned by TranscriptBuffer
+INSERT = "insert"                      # append text at the end
+REPLACE_CURRENT = "replace_current"    # replace the word being typed
+REPLACE_PREVIOUS = "replace_previous"  # replace the last completed word
+CLEAR = "clear"                        # remove everything
+
+
+class TranscriptBuffer:
+    """Sentence text stored as completed pieces plus the word being typed"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop all text and return the matching edit"""
+        self._pieces = []        # completed words, each with its trailing space
+        self._current = []       # characters of the word being typed
+        self._length = 0         # length of the completed pieces
+        self._last_start = None  # offset of the last completed non-empty word
+        self._ends_with_space = False
+        return (CLEAR, "")
+
+    @property
+    def text(self):
+        """Full transcript (O(n), only needed for speech and export)"""
+        return "".join(self._pieces) + "".join(self._current)
+
+    @property
+    def current_word(self):
+        """Word being typed, empty right after a space"""
+        return "".join(self._current)
+
+    @property
+    def last_word(self):
+        """Word being typed, or the last completed word after a space"""
+        if self._current:
+            return self.current_word
+        if self._last_start is not None:
+            return self._pieces[-1].rstrip(" ")
+        return ""
+
+    def __len__(self):
+        return self._length + len(self._current)
+
+    def append_char(self, char):
+        """Add a character to the current word"""
+        self._current.append(char)
+        self._ends_with_space = False
+        return (INSERT, char)
+
+    def append_space(self):
+        """Complete the current word; returns None if already at a space"""
+        if self._ends_with_space:
+            return None
+        self._commit("".join(self._current))
+        return (INSERT, " ")
+
+    def replace_last_word(self, word):
+        """Replace the current (or last completed) word and finish it"""
+        if self._current:
+            self._commit(word)
+            return (REPLACE_CURRENT, word + " ")
+        if self._last_start is None:
+            return None
+        self._length = self._last_start
+        self._pieces.pop()
+        self._commit(word)
+        return (REPLACE_PREVIOUS, word + " ")
+
+    def _commit(self, word):
+        """Move the current word into the completed pieces"""
+        piece = word + " "
+        if word:
+            self._last_start = self._length
+        self._pieces.append(piece)
+        self._length += len(piece)
+        self._current = []
+        self._ends_with_space = True
+
+
+class TextWidgetSink:
+    """Applies TranscriptBuffer edits to a tk.Text using marks"""
+
+    WORD_MARK = "transcript_word"
+    PREV_MARK = "transcript_prev"
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.reset()
+
+    def reset(self):
+        """Clear the widget and place both marks at the start"""
+        self.widget.delete("1.0", tk.END)
+        for mark in (self.WORD_MARK, self.PREV_MARK):
+            self.widget.mark_set(mark, "1.0")
+            self.widget.mark_gravity(mark, tk.LEFT)
+
+    def apply(self, edit):
+        """Apply a single edit; None is a no-op"""
+        if edit is None:
+            return
+        kind, text = edit
+        widget = self.widget
+        if kind == CLEAR:
+            self.reset()
+        elif kind == INSERT:
+            widget.insert("end-1c", text)
+            if text.endswith(" "):
+                self._finish_word()
+        elif kind == REPLACE_CURRENT:
+            widget.delete(self.WORD_MARK, "end-1c")
+            widget.insert("end-1c", text)
+            self._finish_word()
+        elif kind == REPLACE_PREVIOUS:
+            widget.delete(self.PREV_MARK, "end-1c")
+            widget.mark_set(self.WORD_MARK, self.PREV_MARK)
+            widget.insert("end-1c", text)
+            self._finish_word()
+        widget.see("end-1c")
+
+    def _finish_word(self):
+        """Word just completed: it becomes the previous word"""
+        self.widget.mark_set(self.PREV_MARK, self.WORD_MARK)
+        self.widget.mark_set(self.WORD_MARK, "end-1c")